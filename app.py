@@ -1,37 +1,179 @@
 import streamlit as st
 import os
-import tempfile
+import hashlib
+import math
+import multiprocessing
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from functools import partial
 
-from statement_parser import parse_statement_file
+from statement_parser import parse_statement_bytes
+from batch_parser import combine_results, parse_many
+from exporters import EXPORTERS, export_transactions, get_exporter_class
+from parse_cache import ParseCache
+from transaction_view import TransactionIndex
 
 st.set_page_config(page_title="💳 Multi-Bank Statement Parser", layout="wide")
 
 st.title("💳 Multi-Bank Statement Parser")
-st.write("Upload a bank statement PDF to extract summary and transactions automatically.")
+st.write("Upload one or more bank statement PDFs to extract summaries and transactions automatically.")
 st.write("**Supported Banks:** ICICI, Axis, SBI, HDFC, AMEX")
 
-uploaded = st.file_uploader("📄 Upload a Bank Statement (PDF)", type=["pdf"])
+# Rows shown in the live table while a statement is still parsing
+LIVE_PREVIEW_ROWS = 100
 
-if uploaded:
-    # Save uploaded PDF to a temporary file
-    tf = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
-    tf.write(uploaded.read())
-    tf.close()
-    pdf_path = tf.name
 
-    with st.spinner("🔍 Parsing your PDF statement..."):
+@st.cache_resource
+def get_parse_cache() -> ParseCache:
+    """Process-wide parse results shared by every session, keyed by upload SHA-256"""
+    return ParseCache(max_entries=64, ttl=3600)
+
+
+@st.cache_resource
+def get_worker_pool() -> ProcessPoolExecutor:
+    """Process pool shared by all sessions for parsing multiple uploads in parallel"""
+    # spawn avoids forking the multi-threaded Streamlit server
+    return ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=multiprocessing.get_context("spawn"))
+
+
+@st.cache_resource(max_entries=64)
+def get_transaction_index(digest: str, _transactions) -> TransactionIndex:
+    """Sorted filter indexes for a parsed upload, built once and shared across reruns"""
+    return TransactionIndex(_transactions)
+
+
+def upload_digest(uploaded) -> str:
+    """SHA-256 of an upload, hashed once per uploaded file and remembered for reruns"""
+    digests = st.session_state.setdefault("upload_digests", {})
+    if uploaded.file_id not in digests:
+        digests[uploaded.file_id] = hashlib.sha256(uploaded.getvalue()).hexdigest()
+    return digests[uploaded.file_id]
+
+
+def statement_card(name: str, result: dict, transactions: list) -> str:
+    """One-line summary shown as each upload finishes parsing"""
+    bank = result.get('bank', result.get('Bank', 'Unknown'))
+    currency = "$" if bank == 'AMEX' else "₹"
+    line = f"**{name}**  \n🏦 {bank} · {len(transactions)} transactions"
+    for key in ('Total Amount Due', 'Amount Due', 'Closing Balance'):
+        if key in result:
+            try:
+                line += f" · {key}: {currency} {float(result[key]):,.2f}"
+            except (TypeError, ValueError):
+                pass
+            break
+    return line
+
+
+def parse_uploads(uploaded_files) -> dict:
+    """
+    Parse uploads concurrently in the worker pool, filling in a summary card as each finishes
+
+    Each distinct file content is claimed in the shared parse cache: uploads already
+    cached are shown straight away, ones another session is parsing are waited for,
+    and the rest are parsed together with batch_parser.parse_many. Workers hand their
+    transactions back through shared memory rather than pickling them.
+
+    Returns:
+        Dict of upload index -> (file name, digest, result, transactions) for the files that parsed
+    """
+    cache = get_parse_cache()
+    digests = [upload_digest(f) for f in uploaded_files]
+
+    progress = st.progress(0.0, text=f"🔍 Parsing {len(uploaded_files)} statements...")
+    columns = st.columns(min(len(uploaded_files), 4))
+    cards = [columns[i % len(columns)].empty() for i in range(len(uploaded_files))]
+
+    parsed = {}
+    pending = {}    # digest -> indexes of the uploads with that content, parsed here
+    waiting = []    # (index, flight) for uploads another session is parsing
+    done = 0
+
+    def show(i: int, value=None, error=None) -> None:
+        nonlocal done
+        name = uploaded_files[i].name
+        if error is None:
+            result, transactions = value
+            parsed[i] = (name, digests[i], result, transactions)
+            cards[i].success(statement_card(name, result, transactions))
+        else:
+            cards[i].error(f"**{name}**  \n❌ Parsing failed: {error}")
+        done += 1
+        progress.progress(done / len(uploaded_files), text=f"Parsed {done} of {len(uploaded_files)} statements")
+
+    for i, (uploaded, digest) in enumerate(zip(uploaded_files, digests)):
+        if digest in pending:
+            pending[digest].append(i)
+            cards[i].info(f"**{uploaded.name}**  \n⏳ Parsing...")
+            continue
+        flight = cache.claim(digest)
+        if flight is None:
+            pending[digest] = [i]
+            cards[i].info(f"**{uploaded.name}**  \n⏳ Parsing...")
+        elif flight.done():
+            show(i, flight.value, flight.error)
+        else:
+            waiting.append((i, flight))
+            cards[i].info(f"**{uploaded.name}**  \n⏳ Parsing in another session...")
+
+    sources = {digest: uploaded_files[indexes[0]].getvalue() for digest, indexes in pending.items()}
+    unfinished = set(pending)
+    try:
+        for outcome in parse_many(sources, executor=get_worker_pool(), transport="shm"):
+            value = None
+            if outcome["error"] is None:
+                # Kept columnar: the filter index reads whole columns and a page builds only its
+                # own rows, so dicts for every transaction are made only for an export
+                value = (outcome["result"], outcome["transactions"])
+                cache.finish(outcome["name"], value)
+            else:
+                cache.finish(outcome["name"], error=Exception(outcome["error"]))
+            unfinished.discard(outcome["name"])
+            for i in pending[outcome["name"]]:
+                show(i, value, outcome["error"])
+    finally:
+        # A rerun stopped this script: release the claims so other sessions parse them
+        for digest in unfinished:
+            cache.finish(digest, error=Exception("Parsing was interrupted"))
+
+    for i, flight in waiting:
         try:
-            result, transactions = parse_statement_file(pdf_path, export_csv=True)
-            bank = result.get('bank', result.get('Bank', 'Unknown'))
-            st.success(f"✅ Parsed successfully! Bank detected: **{bank}**")
+            show(i, flight.result())
         except Exception as e:
-            st.error(f"❌ Parsing failed: {e}")
-            import traceback
+            show(i, error=e)
+
+    progress.empty()
+    return parsed
+
+
+def render_combined(parsed: dict) -> None:
+    """Totals across all parsed statements, grouped by currency and bank"""
+    combined = combine_results([(result, transactions) for _, _, result, transactions in parsed.values()])
+
+    st.markdown("---")
+    st.subheader("🧮 Combined View")
+
+    for currency, total in combined['totals'].items():
+        col1, col2, col3, col4, col5 = st.columns(5)
+        with col1:
+            st.metric(f"Statements ({currency})", total['Statements'])
+            st.metric("Transactions", total['Transactions'])
+        with col2:
+            st.metric("Total Amount Due", f"{currency} {total['Total Amount Due']:,.2f}")
+        with col3:
+            st.metric("Minimum Amount Due", f"{currency} {total['Minimum Amount Due']:,.2f}")
+        with col4:
+            st.metric("Total Debits", f"{currency} {total['Total Debits']:,.2f}")
+            st.metric("Total Credits", f"{currency} {total['Total Credits']:,.2f}")
+        with col5:
+            st.metric("Closing Balance", f"{currency} {total['Closing Balance']:,.2f}")
+
+    st.dataframe(pd.DataFrame(combined['banks']), use_container_width=True, hide_index=True)
 
-            st.code(traceback.format_exc())
-            st.stop()
 
+def render_statement(result: dict, transactions: list, digest: str, file_name: str) -> None:
+    """Summary, transactions and download for a single parsed statement"""
     # DEBUG: Show raw extracted data
     with st.expander("🔧 DEBUG - Raw Extracted Data"):
         st.json(result)
@@ -207,19 +349,67 @@ if uploaded:
     st.subheader(f"📊 Transactions ({result.get('transactions_count', 0)})")
 
     if transactions:
-        df = pd.DataFrame(transactions)
-        st.dataframe(df, use_container_width=True)
+        index = get_transaction_index(digest, transactions)
+
+        # Filters are answered from the precomputed indexes; only the visible page is sent to the browser
+        with st.expander("🔎 Filter transactions"):
+            col1, col2, col3 = st.columns(3)
+
+            start = end = None
+            with col1:
+                bounds = index.date_bounds
+                if bounds:
+                    first, last = date.fromordinal(bounds[0]), date.fromordinal(bounds[1])
+                    picked = st.date_input("Date range", value=(first, last), min_value=first, max_value=last)
+                    if isinstance(picked, (tuple, list)) and len(picked) == 2:
+                        if picked[0] != first:
+                            start = picked[0].toordinal()
+                        if picked[1] != last:
+                            end = picked[1].toordinal()
+                text = st.text_input("Description contains").strip()
+
+            with col2:
+                type_values = index.type_values
+                picked_types = st.multiselect("Type", type_values, default=type_values)
+                types = picked_types if len(picked_types) != len(type_values) else None
 
-        # Allow download as CSV
-        csv_path = result.get('transactions_csv')
-        if csv_path and os.path.exists(csv_path):
-            with open(csv_path, "rb") as f:
-                st.download_button(
-                    label="📥 Download Transactions CSV",
-                    data=f,
-                    file_name=os.path.basename(csv_path),
-                    mime="text/csv"
-                )
+            with col3:
+                low, high = index.amount_bounds
+                min_amount = st.number_input("Min amount", value=float(low), min_value=float(low), max_value=float(high))
+                max_amount = st.number_input("Max amount", value=float(high), min_value=float(low), max_value=float(high))
+
+        rows = index.filter(
+            start=start,
+            end=end,
+            types=types,
+            min_amount=min_amount if min_amount > low else None,
+            max_amount=max_amount if max_amount < high else None,
+            text=text or None
+        )
+
+        col1, col2 = st.columns([1, 1])
+        with col1:
+            page_size = st.selectbox("Rows per page", [25, 50, 100, 250, 500], index=1)
+        total_pages = max(math.ceil(len(rows) / page_size), 1)
+        with col2:
+            page = st.number_input("Page", min_value=1, max_value=total_pages, value=1, step=1)
+
+        df = pd.DataFrame(index.page(rows, page, page_size))
+        st.dataframe(df, use_container_width=True)
+        first_row = (page - 1) * page_size + 1 if rows else 0
+        st.caption(f"Showing {first_row}-{min(page * page_size, len(rows))} of {len(rows)} matching "
+                   f"transactions ({len(transactions)} total) · page {page} of {total_pages}")
+
+        # Allow download - the export is built in memory only when the button is clicked
+        export_format = st.selectbox("Export format", list(EXPORTERS), format_func=str.upper)
+        exporter_cls = get_exporter_class(export_format)
+        base_name = os.path.splitext(file_name)[0]
+        st.download_button(
+            label=f"📥 Download Transactions {export_format.upper()}",
+            data=partial(export_transactions, transactions, bank, export_format),
+            file_name=f"{base_name}_transactions{exporter_cls.extension}",
+            mime=exporter_cls.mime
+        )
 
         # Optional: Show statistics for credit card statements
         if bank in ['ICICI', 'Axis', 'HDFC']:
@@ -254,5 +444,60 @@ if uploaded:
     else:
         st.info("No transactions detected.")
 
+
+uploaded_files = st.file_uploader("📄 Upload Bank Statements (PDF)", type=["pdf"], accept_multiple_files=True)
+
+if uploaded_files and len(uploaded_files) == 1:
+    uploaded = uploaded_files[0]
+    digest = upload_digest(uploaded)
+    cache = get_parse_cache()
+
+    # Progress and partial transactions are streamed from the parser while pages are extracted
+    progress = st.progress(0.0, text="🔍 Parsing your PDF statement...")
+    live_table = st.empty()
+    streamed = []
+
+    def on_parse_event(event: str, data: dict) -> None:
+        if event == "page_extracted":
+            progress.progress(data['page'] / data['pages'],
+                              text=f"🔍 Extracting page {data['page']} of {data['pages']}...")
+        elif event == "bank_detected":
+            streamed.clear()
+            live_table.empty()
+        elif event == "transactions":
+            streamed.extend(data['transactions'])
+            live_table.dataframe(pd.DataFrame(streamed[-LIVE_PREVIEW_ROWS:]), use_container_width=True)
+
+    # Reruns and other sessions uploading the same file reuse the cached parse;
+    # concurrent uploads of the same file wait for a single parse
+    try:
+        result, transactions = cache.get_or_compute(
+            digest, lambda: parse_statement_bytes(uploaded.getvalue(), on_event=on_parse_event))
+        bank = result.get('bank', result.get('Bank', 'Unknown'))
+        st.success(f"✅ Parsed successfully! Bank detected: **{bank}**")
+    except Exception as e:
+        st.error(f"❌ Parsing failed: {e}")
+        import traceback
+
+        st.code(traceback.format_exc())
+        st.stop()
+    finally:
+        progress.empty()
+        live_table.empty()
+
+    render_statement(result, transactions, digest, uploaded.name)
+
+elif uploaded_files:
+    parsed = parse_uploads(uploaded_files)
+    if not parsed:
+        st.stop()
+
+    render_combined(parsed)
+
+    st.markdown("---")
+    selected = st.selectbox("📄 Statement details", list(parsed), format_func=lambda i: parsed[i][0])
+    file_name, digest, result, transactions = parsed[selected]
+    render_statement(result, transactions, digest, file_name)
+
 else:
-    st.info("👆 Please upload a PDF to begin parsing.")
\ No newline at end of file
+    st.info("👆 Please upload one or more PDFs to begin parsing.")
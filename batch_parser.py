@@ -0,0 +1,186 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from result_transport import TRANSPORTS, column_values, discard_shared, receive_shared, run_shared
+from statement_parser import parse_statement_bytes, parse_statement_file
+from transaction_utils import type_code, TYPE_CREDIT, TYPE_DEBIT
+
+# Currency symbol per bank code; everything else is reported in rupees
+CURRENCY = {
+    "AMEX": "$",
+}
+DEFAULT_CURRENCY = "₹"
+
+# Summary keys each parser uses for the amount owed on a card statement
+DUE_KEYS = ("Total Amount Due", "Amount Due")
+
+
+def _to_float(value) -> float:
+    """Summary amounts are floats for most parsers but strings for HDFC"""
+    if value is None or value == "":
+        return 0.0
+    try:
+        return float(str(value).replace(",", ""))
+    except ValueError:
+        return 0.0
+
+
+def parse_source(source: Union[str, bytes], **parse_kwargs) -> Tuple[Dict, List[Dict], float]:
+    """Parse a PDF path or PDF bytes, returning (result, transactions, seconds)"""
+    start = time.perf_counter()
+    parse_kwargs.setdefault("export_csv", False)
+    if isinstance(source, (bytes, bytearray)):
+        result, transactions = parse_statement_bytes(bytes(source), **parse_kwargs)
+    else:
+        result, transactions = parse_statement_file(source, **parse_kwargs)
+    return result, transactions, time.perf_counter() - start
+
+
+def parse_many(sources: Dict[str, Union[str, bytes]], max_workers: Optional[int] = None,
+               executor=None, transport: str = "pickle", **parse_kwargs) -> Iterator[Dict]:
+    """
+    Parse many statements concurrently in a process pool
+
+    Outcomes are yielded as each file finishes, so callers can show results while
+    slower files are still parsing.
+
+    Args:
+        sources: Mapping of display name -> PDF path or PDF bytes
+        max_workers: Pool size when no executor is given (defaults to CPU count)
+        executor: Optional existing concurrent.futures executor to submit to
+        transport: How workers return transactions: "pickle" (a list of dicts) or
+            "shm" (columns in shared memory, see result_transport; transactions are
+            yielded as a ColumnarTransactions sequence)
+        **parse_kwargs: Passed to parse_statement_file
+
+    Yields:
+        Dicts with name, result, transactions, seconds and error (None on success)
+    """
+    if transport not in TRANSPORTS:
+        raise ValueError(f"Unknown transport: {transport}. Available: {', '.join(TRANSPORTS)}")
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=max_workers or os.cpu_count())
+
+    futures = {}
+    received = set()
+    try:
+        if transport == "shm":
+            futures = {executor.submit(run_shared, parse_source, source, **parse_kwargs): name
+                       for name, source in sources.items()}
+        else:
+            futures = {executor.submit(parse_source, source, **parse_kwargs): name
+                       for name, source in sources.items()}
+        for future in as_completed(futures):
+            name = futures[future]
+            received.add(future)
+            try:
+                value = future.result()
+                if transport == "shm":
+                    value = receive_shared(value, materialize=False)
+                result, transactions, seconds = value
+            except Exception as e:
+                yield {"name": name, "result": None, "transactions": [], "seconds": None, "error": str(e)}
+                continue
+            yield {"name": name, "result": result, "transactions": transactions,
+                   "seconds": seconds, "error": None}
+    finally:
+        if transport == "shm":
+            # The caller stopped early (closed the generator or raised): nobody will attach
+            # the remaining segments, so unlink each one as its worker finishes
+            for future in futures:
+                if future not in received and not future.cancel():
+                    future.add_done_callback(discard_shared)
+        if own_executor:
+            executor.shutdown()
+
+
+def combine_results(results: List[Tuple[Dict, List[Dict]]]) -> Dict:
+    """
+    Aggregate totals across statements from different banks and cards
+
+    Uses each parser's summary keys ('Total Amount Due' / 'Amount Due', 'Minimum Amount Due',
+    'Closing Balance', 'Total Debits', 'Total Credits') and falls back to summing the
+    transactions when a parser does not report debit/credit totals.
+
+    Returns:
+        Dict with per-bank rows under 'banks' and per-currency totals under 'totals'
+    """
+    banks = {}
+    totals = {}
+
+    for result, transactions in results:
+        bank = result.get("bank", result.get("Bank", "UNKNOWN"))
+        currency = CURRENCY.get(bank, DEFAULT_CURRENCY)
+
+        due = next((_to_float(result[k]) for k in DUE_KEYS if k in result), 0.0)
+        if "Total Debits" in result or "Total Credits" in result:
+            debits = _to_float(result.get("Total Debits"))
+            credits = _to_float(result.get("Total Credits"))
+        else:
+            rows = list(zip(column_values(transactions, "Amount"), column_values(transactions, "Type")))
+            debits = sum(_to_float(amount) for amount, kind in rows if type_code(kind) == TYPE_DEBIT)
+            credits = sum(_to_float(amount) for amount, kind in rows if type_code(kind) == TYPE_CREDIT)
+
+        row = banks.setdefault(bank, {
+            "Bank": bank,
+            "Currency": currency,
+            "Statements": 0,
+            "Transactions": 0,
+            "Total Amount Due": 0.0,
+            "Minimum Amount Due": 0.0,
+            "Closing Balance": 0.0,
+            "Total Debits": 0.0,
+            "Total Credits": 0.0,
+        })
+        row["Statements"] += 1
+        row["Transactions"] += len(transactions)
+        row["Total Amount Due"] += due
+        row["Minimum Amount Due"] += _to_float(result.get("Minimum Amount Due"))
+        row["Closing Balance"] += _to_float(result.get("Closing Balance"))
+        row["Total Debits"] += debits
+        row["Total Credits"] += credits
+
+    for row in banks.values():
+        total = totals.setdefault(row["Currency"], {
+            "Statements": 0, "Transactions": 0, "Total Amount Due": 0.0, "Minimum Amount Due": 0.0,
+            "Closing Balance": 0.0, "Total Debits": 0.0, "Total Credits": 0.0,
+        })
+        for key in total:
+            total[key] += row[key]
+
+    for row in list(banks.values()) + list(totals.values()):
+        for key, value in row.items():
+            if isinstance(value, float):
+                row[key] = round(value, 2)
+
+    return {"banks": list(banks.values()), "totals": totals}
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Parse many bank statements in parallel")
+    parser.add_argument("pdfs", nargs="+", help="statement pdfs")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--transport", choices=TRANSPORTS, default="pickle",
+                        help="how workers return transactions (default: pickle)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    parsed = []
+    for outcome in parse_many({p: p for p in args.pdfs}, max_workers=args.workers,
+                              transport=args.transport):
+        if outcome["error"]:
+            print(f"FAILED {outcome['name']}: {outcome['error']}")
+            continue
+        print(f"{outcome['name']}: {outcome['result'].get('bank')} "
+              f"{len(outcome['transactions'])} transactions in {outcome['seconds']:.2f}s")
+        parsed.append((outcome["result"], outcome["transactions"]))
+
+    print(f"\nWall time: {time.perf_counter() - start:.2f}s")
+    print(json.dumps(combine_results(parsed), indent=4, ensure_ascii=False))
@@ -0,0 +1,141 @@
+"""
+Scaling benchmark for extract_text_from_pdf, detect_bank and each parser's parse
+
+Renders synthetic statements for every layout at increasing page counts and reports
+wall time, throughput, peak traced memory and the log-log scaling exponent between
+sizes (1.0 = linear; noticeably above 1 means super-linear behaviour).
+
+Usage:
+    python benchmarks/bench_parsing.py --sizes 1 10 100 1000 5000 --json bench.json
+"""
+import argparse
+import gc
+import json
+import math
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from generate_statements import LAYOUTS, generate_pages, render_pdf  # noqa: E402
+from statement_parser import ENGINES, detect_bank, extract_text_from_pdf, get_parser  # noqa: E402
+
+SUPERLINEAR_EXPONENT = 1.2
+
+
+def measure(fn, *args, memory: bool = True):
+    """Run fn once for wall time, then again under tracemalloc for peak memory"""
+    gc.collect()
+    start = time.perf_counter()
+    value = fn(*args)
+    seconds = time.perf_counter() - start
+
+    peak = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        fn(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return value, seconds, peak
+
+
+def exponent(prev, cur) -> float:
+    """Log-log slope of time against pages between two measurements"""
+    if not prev or prev["seconds"] <= 0 or cur["seconds"] <= 0 or cur["pages"] == prev["pages"]:
+        return float("nan")
+    return math.log(cur["seconds"] / prev["seconds"]) / math.log(cur["pages"] / prev["pages"])
+
+
+def run(layouts, sizes, tx_per_page: int, workdir: str, memory: bool, skip_pdf: bool, engine=None):
+    rows = []
+    for bank in layouts:
+        previous = {}
+        for pages in sizes:
+            generated = generate_pages(bank, pages, tx_per_page)
+
+            if skip_pdf:
+                text = "".join("\n".join(lines) + "\n" for lines in generated)
+                stages = []
+            else:
+                path = os.path.join(workdir, f"synthetic_{bank.lower()}_{pages}p.pdf")
+                if not os.path.exists(path):
+                    render_pdf(generated, path)
+                text, seconds, peak = measure(extract_text_from_pdf, path, memory=memory)
+                stages = [("extract_text_from_pdf", seconds, peak)]
+
+            detected, seconds, peak = measure(detect_bank, text, engine, memory=memory)
+            stages.append(("detect_bank", seconds, peak))
+
+            parser = get_parser(detected, engine)
+            (summary, transactions), seconds, peak = measure(parser.parse, text, memory=memory)
+            stages.append((f"{type(parser).__name__}.parse", seconds, peak))
+            if not transactions:
+                raise Exception(f"{bank} layout: {type(parser).__name__} found no transactions in "
+                                f"{pages} generated pages")
+
+            for stage, seconds, peak in stages:
+                row = {
+                    "layout": bank,
+                    "stage": stage,
+                    "pages": pages,
+                    "bytes": len(text),
+                    "transactions": len(transactions),
+                    "seconds": seconds,
+                    "pages_per_s": pages / seconds if seconds else float("inf"),
+                    "mb_per_s": len(text) / 1e6 / seconds if seconds else float("inf"),
+                    "peak_mb": peak / 1e6 if peak is not None else None,
+                }
+                row["exponent"] = exponent(previous.get(stage), row)
+                previous[stage] = row
+                rows.append(row)
+                print_row(row)
+    return rows
+
+
+def print_header():
+    print(f"{'layout':6} {'stage':28} {'pages':>6} {'txns':>7} {'seconds':>9} {'pages/s':>10} "
+          f"{'MB/s':>8} {'peak MB':>8} {'exp':>6}")
+
+
+def print_row(row):
+    peak = f"{row['peak_mb']:8.1f}" if row["peak_mb"] is not None else f"{'-':>8}"
+    exp = row["exponent"]
+    flag = " !" if not math.isnan(exp) and exp > SUPERLINEAR_EXPONENT else ""
+    exp_str = f"{exp:6.2f}" if not math.isnan(exp) else f"{'-':>6}"
+    print(f"{row['layout']:6} {row['stage']:28} {row['pages']:6} {row['transactions']:7} "
+          f"{row['seconds']:9.4f} {row['pages_per_s']:10.1f} {row['mb_per_s']:8.2f} {peak} {exp_str}{flag}",
+          flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parsing scaling benchmark on synthetic statements")
+    parser.add_argument("--layouts", nargs="+", default=LAYOUTS, choices=LAYOUTS, help="layouts to run")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[1, 10, 100, 1000, 5000], help="page counts")
+    parser.add_argument("--tx-per-page", type=int, default=40, help="transactions per page")
+    parser.add_argument("--workdir", default="bench_pdfs", help="directory for generated PDFs (reused)")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--text-only", action="store_true", help="skip PDF rendering/extraction")
+    parser.add_argument("--engine", choices=ENGINES, default=None, help="parser engine (default: classic)")
+    parser.add_argument("--json", default=None, help="write results to this JSON file")
+    args = parser.parse_args()
+
+    os.makedirs(args.workdir, exist_ok=True)
+    print_header()
+    rows = run(args.layouts, sorted(args.sizes), args.tx_per_page, args.workdir,
+               memory=not args.no_memory, skip_pdf=args.text_only, engine=args.engine)
+
+    superlinear = [r for r in rows if not math.isnan(r["exponent"]) and r["exponent"] > SUPERLINEAR_EXPONENT]
+    if superlinear:
+        print(f"\n{len(superlinear)} measurements scale worse than pages^{SUPERLINEAR_EXPONENT} (marked !)")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rows, f, indent=2, default=str)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark recurring-charge detection over growing histories and check what it finds
+
+Each history mixes random card spend with subscriptions whose descriptions carry a
+different reference ID on every charge, as card processors print them
+("NETFLIX.COM AB12CD34 MUMBAI"). Every level must find each subscription as one
+series with the right cadence; the script fails otherwise.
+
+Usage:
+    python benchmarks/bench_recurring.py --years 1 5 20
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from recurring import find_recurring, merchant_key  # noqa: E402
+
+MERCHANTS = ["SWIGGY BANGALORE", "ZOMATO GURGAON", "AMAZON PAY INDIA", "UBER INDIA", "PAYTM NOIDA",
+             "FLIPKART INTERNET", "BPCL FUEL STATION", "BIG BAZAAR MUMBAI", "APOLLO PHARMACY",
+             "STARBUCKS COFFEE"]
+
+# Description template, amount, days between charges, expected cadence
+SUBSCRIPTIONS = [
+    ("NETFLIX.COM {ref} MUMBAI", 649.0, 30, "monthly"),
+    ("SPOTIFY {ref} STOCKHOLM", 119.0, 30, "monthly"),
+    ("CULT FIT {ref}", 1500.0, 7, "weekly"),
+    ("AMAZON PRIME {ref}", 1499.0, 365, "yearly"),
+]
+
+
+def reference(rng: random.Random) -> str:
+    """A fresh reference ID in the AB12CD34 shape"""
+    return "".join(rng.choice(string.ascii_uppercase if i % 4 < 2 else string.digits) for i in range(8))
+
+
+def synthetic_history(rng: random.Random, years: int, per_day: int):
+    start = date(2024, 1, 1) - timedelta(days=365 * years)
+    days = 365 * years
+    transactions = []
+    for day in range(days):
+        d = start + timedelta(days=day)
+        for _ in range(per_day):
+            transactions.append({"Date": d.strftime("%d/%m/%Y"),
+                                 "Description": f"{rng.choice(MERCHANTS)} {rng.randint(1000, 9999)}",
+                                 "Amount": round(rng.uniform(10, 5000), 2), "Type": "DR"})
+        for template, amount, every, _ in SUBSCRIPTIONS:
+            if day % every == 0:
+                transactions.append({"Date": d.strftime("%d/%m/%Y"),
+                                     "Description": template.format(ref=reference(rng)),
+                                     "Amount": amount, "Type": "DR"})
+    return transactions
+
+
+def check(found, years: int) -> None:
+    for template, amount, every, cadence in SUBSCRIPTIONS:
+        if every > 365 * years // 3:
+            continue    # Fewer than 3 charges in this history
+        merchant = merchant_key(template.format(ref=""))
+        series = [s for s in found if s["Merchant"] == merchant]
+        if len(series) != 1 or series[0]["Cadence"] != cadence:
+            raise Exception(f"{template} ({cadence}) over {years} years: expected one {cadence} series, "
+                            f"found {[(s['Merchant'], s['Cadence'], s['Occurrences']) for s in series]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recurring charge detection benchmark")
+    parser.add_argument("--years", type=int, nargs="+", default=[1, 5, 20], help="history lengths")
+    parser.add_argument("--per-day", type=int, default=20, help="random transactions per day")
+    args = parser.parse_args()
+
+    for years in args.years:
+        transactions = synthetic_history(random.Random(years), years, args.per_day)
+        t0 = time.perf_counter()
+        found = find_recurring(transactions)
+        elapsed = time.perf_counter() - t0
+        check(found, years)
+        print(f"{years:3d} years, {len(transactions):>9,} transactions: {elapsed:6.2f}s "
+              f"({len(transactions) / elapsed:,.0f} tx/s), {len(found)} series")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark TransactionStore ingest throughput and query latency
+
+Usage:
+    python benchmarks/bench_store.py --rows 10000000 --db /tmp/bench_store.db
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from transaction_store import TransactionStore  # noqa: E402
+
+MERCHANTS = ["SWIGGY BANGALORE", "ZOMATO GURGAON", "AMAZON PAY INDIA", "UBER INDIA", "PAYTM NOIDA",
+             "FLIPKART INTERNET", "NETFLIX COM", "BPCL FUEL STATION", "BIG BAZAAR MUMBAI",
+             "APOLLO PHARMACY", "IRCTC TICKETS", "STARBUCKS COFFEE", "RESTAURANT", "UPI TRANSFER",
+             "NEFT SALARY CREDIT", "ATM WITHDRAWAL"]
+
+BANKS = [("HDFC", "Card Last 4"), ("ICICI", "Card Last 4"), ("AXIS", "Card Last 4"),
+         ("SBI", "Account Number"), ("AMEX", "Account Number")]
+
+
+def synthetic_statement(rng: random.Random, index: int, rows: int, accounts: int):
+    bank, id_field = BANKS[index % len(BANKS)]
+    result = {"bank": bank, id_field: f"{index % accounts:04d}"}
+    start = date(2020, 1, 1) + timedelta(days=(index * 30) % 2000)
+    transactions = []
+    for i in range(rows):
+        d = start + timedelta(days=i % 31)
+        transactions.append({
+            "Date": d.strftime("%d/%m/%Y"),
+            "Description": f"{rng.choice(MERCHANTS)} {rng.randint(1000, 9999)}",
+            "Amount": round(rng.uniform(10, 50000), 2),
+            "Type": "CR" if rng.random() < 0.1 else "DR",
+        })
+    return result, transactions
+
+
+def time_query(store: TransactionStore, repeat: int, **kwargs):
+    latencies = []
+    rows = 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        rows = len(store.search(**kwargs))
+        latencies.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(latencies), max(latencies), rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TransactionStore ingest and query benchmark")
+    parser.add_argument("--rows", type=int, default=10_000_000, help="total transactions to ingest")
+    parser.add_argument("--per-statement", type=int, default=5000, help="transactions per statement")
+    parser.add_argument("--accounts", type=int, default=50, help="distinct accounts")
+    parser.add_argument("--db", default="bench_store.db", help="database path (recreated)")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per query")
+    args = parser.parse_args()
+
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(args.db + suffix):
+            os.remove(args.db + suffix)
+
+    rng = random.Random(42)
+    store = TransactionStore(args.db)
+
+    statements = (args.rows + args.per_statement - 1) // args.per_statement
+    ingest_time = 0.0
+    ingested = 0
+    for i in range(statements):
+        rows = min(args.per_statement, args.rows - ingested)
+        result, transactions = synthetic_statement(rng, i, rows, args.accounts)
+        t0 = time.perf_counter()
+        store.ingest(result, transactions, statement_hash=f"bench-{i}")
+        ingest_time += time.perf_counter() - t0
+        ingested += rows
+        if (i + 1) % 200 == 0:
+            print(f"  {ingested:,} rows, {ingested / ingest_time:,.0f} rows/s", flush=True)
+
+    print(f"\nIngest: {ingested:,} rows in {ingest_time:.1f}s -> {ingested / ingest_time:,.0f} rows/s")
+
+    # Idempotent re-ingest of one statement
+    result, transactions = synthetic_statement(random.Random(0), 0, args.per_statement, args.accounts)
+    t0 = time.perf_counter()
+    store.ingest(result, transactions, statement_hash="bench-0")
+    print(f"Upsert of one {args.per_statement}-row statement: {(time.perf_counter() - t0) * 1000:.1f} ms")
+
+    queries = [
+        ("FTS 'swiggy' in 2021, limit 1000", dict(text="swiggy", start=date(2021, 1, 1), end=date(2021, 12, 31))),
+        ("account + 1 year", dict(account="HDFC:0005", start=date(2021, 1, 1), end=date(2021, 12, 31), limit=None)),
+        ("amount 49990-50000", dict(min_amount=49990, max_amount=50000, limit=None)),
+        ("single day, debits", dict(start=date(2022, 6, 15), end=date(2022, 6, 15), txn_type="DEBIT", limit=None)),
+    ]
+    print(f"\n{'query':40} {'median ms':>10} {'max ms':>10} {'rows':>8}")
+    for name, kwargs in queries:
+        median, worst, rows = time_query(store, args.repeat, **kwargs)
+        print(f"{name:40} {median:10.2f} {worst:10.2f} {rows:8}")
+
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
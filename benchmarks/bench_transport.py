@@ -0,0 +1,172 @@
+"""
+Benchmark returning transactions from pool workers: pickle vs shared-memory columns
+
+Measures the serialisation cost on each side in one process, then the round trip
+through a process pool whose workers return synthetic parse results, alone and
+followed by what the app does with them (a TransactionIndex and one page), and optionally
+parse_many over real PDFs with both transports. Finally parse_many is closed after its
+first outcome, which must leave no segments behind, and batch_parser runs with the shm
+transport in a fresh interpreter, which must exit with nothing on stderr (leaked or
+doubly unlinked segments are reported there by multiprocessing's resource tracker).
+
+Usage:
+    python benchmarks/bench_transport.py --rows 1000000
+    python benchmarks/bench_transport.py --rows 200000 --statements 8 --pdfs samples/*.pdf
+"""
+import argparse
+import glob
+import os
+import pickle
+import random
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from batch_parser import parse_many  # noqa: E402
+from result_transport import attach_transactions, receive_shared, run_shared, share_transactions  # noqa: E402
+from transaction_view import TransactionIndex  # noqa: E402
+
+MERCHANTS = ["SWIGGY BANGALORE", "ZOMATO GURGAON", "AMAZON PAY INDIA", "UBER INDIA", "PAYTM NOIDA",
+             "FLIPKART INTERNET", "NETFLIX COM", "BPCL FUEL STATION", "APOLLO PHARMACY", "UPI TRANSFER"]
+
+
+def synthetic_transactions(rows: int, seed: int = 0):
+    rng = random.Random(seed)
+    balance = 100000.0
+    transactions = []
+    for i in range(rows):
+        amount = round(rng.uniform(10, 5000), 2)
+        credit = rng.random() < 0.1
+        balance += amount if credit else -amount
+        transactions.append({
+            "Date": f"{1 + i % 28:02d}/{1 + i // 28 % 12:02d}/2024",
+            "Description": f"{rng.choice(MERCHANTS)} {rng.randint(1000, 9999)}",
+            "Type": "CR" if credit else "DR",
+            "Amount": amount,
+            "Balance": round(balance, 2),
+        })
+    return transactions
+
+
+_worker_transactions = []
+
+
+def _prepare_worker(rows: int) -> None:
+    # Generated once per worker so the timed round trips measure transport, not generation
+    _worker_transactions[:] = synthetic_transactions(rows)
+
+
+def synthetic_parse(rows: int):
+    """Stands in for batch_parser.parse_source: (result, transactions, seconds)"""
+    return {"bank": "SBI", "transactions_count": rows}, _worker_transactions[:rows], 0.0
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    value = fn(*args)
+    return value, time.perf_counter() - start
+
+
+def bench_serialisation(rows: int) -> None:
+    transactions = synthetic_transactions(rows)
+
+    data, dump_s = timed(pickle.dumps, transactions, pickle.HIGHEST_PROTOCOL)
+    loaded, load_s = timed(pickle.loads, data)
+    assert loaded == transactions
+    print(f"pickle   worker {dump_s:7.3f}s  parent {load_s:7.3f}s  {len(data) / 1e6:7.1f}MB")
+
+    descriptor, pack_s = timed(share_transactions, transactions)
+    view, attach_s = timed(attach_transactions, descriptor)
+    amounts, column_s = timed(view.column, "Amount")
+    rows_, materialize_s = timed(view.to_list)
+    assert rows_ == transactions
+    print(f"shm      worker {pack_s:7.3f}s  parent {attach_s:7.3f}s attach, "
+          f"+{column_s:.3f}s one column, +{materialize_s:.3f}s all dicts  {descriptor['size'] / 1e6:7.1f}MB")
+
+
+def bench_pool(rows: int, statements: int, workers: int) -> None:
+    with ProcessPoolExecutor(max_workers=workers, initializer=_prepare_worker, initargs=(rows,)) as pool:
+        # Start every worker so start-up is not charged to the first transport
+        list(pool.map(synthetic_parse, [1] * workers * 4))
+
+        for transport in ("pickle", "shm", "shm+dicts", "pickle+index", "shm+index"):
+            start = time.perf_counter()
+            cpu = time.process_time()
+            if transport.startswith("pickle"):
+                futures = [pool.submit(synthetic_parse, rows) for _ in range(statements)]
+                received = [f.result() for f in futures]
+            else:
+                futures = [pool.submit(run_shared, synthetic_parse, rows) for _ in range(statements)]
+                received = [receive_shared(f.result(), materialize=transport == "shm+dicts")
+                            for f in futures]
+            if transport.endswith("+index"):
+                # As app.render_statement: filter indexes, then the first page of 50 rows
+                for value in received:
+                    index = TransactionIndex(value[1])
+                    index.page(index.filter(text="swiggy"), 1, 50)
+            total = sum(len(value[1]) for value in received)
+            # Parent CPU time is what the transport costs the process collecting results
+            print(f"pool {transport:12} {statements} x {rows} rows: wall {time.perf_counter() - start:7.3f}s, "
+                  f"parent CPU {time.process_time() - cpu:7.3f}s ({total} transactions)")
+            del received
+
+
+def bench_pdfs(pdfs, workers: int) -> None:
+    for transport in ("pickle", "shm"):
+        start = time.perf_counter()
+        total = sum(len(o["transactions"]) for o in parse_many({p: p for p in pdfs}, max_workers=workers,
+                                                               transport=transport))
+        print(f"parse_many {transport:6} {len(pdfs)} pdfs: {time.perf_counter() - start:7.3f}s "
+              f"({total} transactions)")
+
+
+def check_early_close(pdfs, workers: int) -> None:
+    """Stop reading parse_many after one outcome and fail if any segment is left in /dev/shm"""
+    if not os.path.isdir("/dev/shm"):
+        return
+    before = set(os.listdir("/dev/shm"))
+    outcomes = parse_many({p: p for p in pdfs}, max_workers=workers, transport="shm")
+    next(outcomes)
+    outcomes.close()
+    leaked = sorted(set(os.listdir("/dev/shm")) - before)
+    if leaked:
+        raise Exception(f"parse_many left {len(leaked)} shared memory segments after an early close: {leaked}")
+    print(f"parse_many --transport shm closed after 1 of {len(pdfs)} pdfs: no segments left")
+
+
+def check_clean_exit(pdfs, workers: int) -> None:
+    """Run batch_parser --transport shm in a new process and fail on any stderr output"""
+    proc = subprocess.run([sys.executable, os.path.join(ROOT, "batch_parser.py"), *pdfs,
+                           "--workers", str(workers), "--transport", "shm"],
+                          capture_output=True, text=True)
+    if proc.returncode or proc.stderr.strip():
+        raise Exception(f"batch_parser --transport shm exited with {proc.returncode}, stderr:\n{proc.stderr}")
+    print(f"batch_parser --transport shm {len(pdfs)} pdfs: clean exit, empty stderr")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare pickle and shared-memory result transport")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="transactions per statement")
+    parser.add_argument("--statements", type=int, default=4, help="statements returned through the pool")
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1), help="pool size")
+    parser.add_argument("--pdfs", nargs="*", default=[], help="also run parse_many over these PDFs")
+    args = parser.parse_args()
+
+    bench_serialisation(args.rows)
+    print()
+    bench_pool(args.rows, args.statements, args.workers)
+    if args.pdfs:
+        print()
+        bench_pdfs(args.pdfs, args.workers)
+    print()
+    pdfs = args.pdfs or sorted(glob.glob(os.path.join(ROOT, "samples", "*.pdf")))
+    check_early_close(pdfs, args.workers)
+    check_clean_exit(pdfs, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Render synthetic statements in each supported layout
+
+Usage:
+    python benchmarks/generate_statements.py HDFC --pages 100 --tx-per-page 40 -o hdfc_100.pdf
+"""
+import argparse
+import random
+from datetime import date, timedelta
+from typing import List
+
+LAYOUTS = ["HDFC", "SBI", "ICICI", "AXIS", "AMEX"]
+
+MERCHANTS = ["SWIGGY BANGALORE", "ZOMATO GURGAON", "AMAZON PAY INDIA", "UBER INDIA", "PAYTM NOIDA",
+             "FLIPKART INTERNET", "NETFLIX COM", "BPCL FUEL STATION", "BIG BAZAAR MUMBAI",
+             "APOLLO PHARMACY", "IRCTC TICKETS", "STARBUCKS COFFEE", "RESTAURANT", "MAKEMYTRIP"]
+
+LINES_PER_PAGE = 62
+
+
+def _header(bank: str, start: date, end: date) -> List[str]:
+    if bank == "HDFC":
+        return [
+            "HDFC Bank Credit Card Statement",
+            "Name : RAHUL SHARMA",
+            "Card No: 4567 12XX XXXX 3458",
+            f"Statement Date: {end:%d/%m/%Y}",
+            # Labels and values on one line, so the amounts are not read as a transaction row
+            f"Payment Due Date Total Dues Minimum Amount Due {end + timedelta(days=20):%d/%m/%Y} 22,935.00 1,150.00",
+            "Credit Limit 2,00,000",
+            "Domestic Transactions",
+            "Date Transaction Description Amount (in Rs.)",
+        ]
+    if bank == "SBI":
+        return [
+            "State Bank of India",
+            "Account Name : Mr. Ravi Kumar",
+            "Account Number : 00000012345678901",
+            "Branch : KORAMANGALA Drawing Power : 0.00",
+            f"Statement Period : {start:%-d %b %Y} to {end:%-d %b %Y}",
+            f"Balance as on {start:%-d %b %Y} : 50,000.00",
+            "Txn Date Description Ref No Withdrawal Deposit Balance",
+        ]
+    if bank in ("ICICI", "AXIS"):
+        name = "ICICI Bank" if bank == "ICICI" else "Axis Bank"
+        card = "ICICI Coral" if bank == "ICICI" else "Axis Ace"
+        return [
+            f"{name} Credit Card Statement",
+            f"Card {card} (XXXX-XXXX-XXXX-2345)",
+            f"Statement Date {end:%d %b %Y}",
+            f"Statement Period {start:%d %b %Y} - {end:%d %b %Y}",
+            f"Payment Due Date {end + timedelta(days=20):%d %b %Y}",
+            "Total Amount Due INR 89,999.50",
+            "Minimum Amount Due INR 4,500.00",
+            "Previous Balance INR 12,000.00",
+            "New Charges INR 77,999.50",
+            "Statement Balance INR 89,999.50",
+            "Detailed Transactions",
+            "Date Type Description Debit(INR) Credit(INR)",
+        ]
+    if bank == "AMEX":
+        return [
+            "American Express Card Statement",
+            "Member Name : John Doe",
+            "Account number ending in 7777",
+            f"Period : {start:%b %d, %Y} - {end:%b %d, %Y}",
+            f"Due Date : {end + timedelta(days=20):%B %d, %Y}",
+            "Amount Due : $345.67",
+            "Previous Balance : $100.00",
+            "Payments : $50.00",
+            "New Charges : $295.67",
+            "Transactions",
+            "Date Description Amount",
+        ]
+    raise ValueError(f"Unknown layout: {bank}. Available: {', '.join(LAYOUTS)}")
+
+
+def _transaction_line(bank: str, rng: random.Random, day: date, balance: List[float]) -> str:
+    merchant = rng.choice(MERCHANTS)
+    amount = round(rng.uniform(20, 20000), 2)
+    credit = rng.random() < 0.1
+
+    if bank == "HDFC":
+        return f"{day:%d/%m/%Y} {merchant} {amount:,.2f}{' Cr' if credit else ''}"
+    if bank == "SBI":
+        # Keep the running balance positive so every row has a parseable balance column
+        credit = credit or balance[0] - amount < 1000
+        balance[0] += amount if credit else -amount
+        ref = rng.randint(100000, 999999)
+        desc = f"BY TRANSFER NEFT {merchant}" if credit else f"TO TRANSFER UPI/{ref}/{merchant}"
+        return f"{day:%-d %b %Y} {desc} {amount:.2f} {balance[0]:.2f}"
+    if bank in ("ICICI", "AXIS"):
+        return f"{day:%d-%b-%Y} {'CREDIT' if credit else 'DEBIT'} {merchant} {amount:,.2f}"
+    if bank == "AMEX":
+        return f"{day:%d-%b-%Y} {merchant} {amount:.2f}"
+    raise ValueError(f"Unknown layout: {bank}")
+
+
+def generate_pages(bank: str, pages: int = 1, tx_per_page: int = 40, seed: int = 0,
+                   start: date = date(2024, 1, 1)) -> List[List[str]]:
+    """
+    Build the text lines of a synthetic statement, one list of lines per page
+
+    Every page repeats the bank letterhead and a "Page N of M" footer like real statements.
+    """
+    bank = bank.upper()
+    rng = random.Random(seed)
+    end = start + timedelta(days=max(pages * tx_per_page // 20, 30))
+    header = _header(bank, start, end)
+    balance = [1_000_000.0]
+    span = (end - start).days
+
+    result = []
+    index = 0
+    total = pages * tx_per_page
+    for page in range(1, pages + 1):
+        lines = list(header) if page == 1 else [header[0], header[-1]]
+        room = max(LINES_PER_PAGE - len(lines) - 1, 1)
+        for _ in range(min(tx_per_page, room)):
+            day = start + timedelta(days=index * span // max(total, 1))
+            lines.append(_transaction_line(bank, rng, day, balance))
+            index += 1
+        lines.append(f"Page {page} of {pages}")
+        result.append(lines)
+    return result
+
+
+def pages_to_text(pages: List[List[str]]) -> str:
+    """Join generated pages the way extract_text_from_pdf joins extracted pages"""
+    return "".join("\n".join(lines) + "\n" for lines in pages)
+
+
+def render_pdf(pages: List[List[str]], path: str) -> str:
+    """Render generated pages to a PDF with reportlab"""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+
+    c = canvas.Canvas(path, pagesize=A4)
+    width, height = A4
+    for lines in pages:
+        c.setFont("Helvetica", 9)
+        y = height - 40
+        for line in lines:
+            c.drawString(40, y, line)
+            y -= 12.5
+        c.showPage()
+    c.save()
+    return path
+
+
+def generate_statement(bank: str, path: str, pages: int = 1, tx_per_page: int = 40, seed: int = 0) -> str:
+    """Generate and render a synthetic statement PDF"""
+    return render_pdf(generate_pages(bank, pages, tx_per_page, seed), path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render a synthetic bank statement PDF")
+    parser.add_argument("bank", choices=LAYOUTS, help="statement layout")
+    parser.add_argument("--pages", type=int, default=1, help="number of pages")
+    parser.add_argument("--tx-per-page", type=int, default=40, help="transactions per page")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("-o", "--output", default=None, help="output pdf path")
+    args = parser.parse_args()
+
+    output = args.output or f"synthetic_{args.bank.lower()}_{args.pages}p.pdf"
+    generate_statement(args.bank, output, args.pages, args.tx_per_page, args.seed)
+    print(output)
@@ -0,0 +1,249 @@
+"""
+Golden-output regression check with time and memory budgets
+
+Runs every PDF in samples/ plus synthetic statements for each layout through
+parse_statement_file, compares the summary and transactions with the stored golden
+JSON, and compares parse time and peak traced memory with the recorded budgets.
+
+Usage:
+    python benchmarks/golden_check.py              # check, exit 1 on any difference
+    python benchmarks/golden_check.py --update     # rewrite goldens and budgets
+    python benchmarks/golden_check.py --tolerance 50 --memory-tolerance 20
+    python benchmarks/golden_check.py --strip-boilerplate   # same goldens with header/footer stripping on,
+                                                            # plus a behavioural check of the stripper
+
+Time budgets are specific to the machine that recorded them; re-run --update when
+moving the check to a different machine.
+"""
+import argparse
+import difflib
+import glob
+import json
+import os
+import sys
+import tempfile
+from typing import List
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, HERE)
+
+from bench_parsing import measure  # noqa: E402
+from boilerplate import MIN_PAGES, BoilerplateStripper, transaction_line_check  # noqa: E402
+from generate_statements import LAYOUTS, generate_statement  # noqa: E402
+from statement_parser import get_parser, parse_statement_file  # noqa: E402
+
+GOLDEN_DIR = os.path.join(HERE, "goldens")
+BUDGETS_FILE = os.path.join(GOLDEN_DIR, "budgets.json")
+
+# Timings below this many seconds are treated as noise rather than regressions
+MIN_SECONDS_SLACK = 0.05
+MIN_MEMORY_SLACK_MB = 1.0
+
+
+def collect_inputs(generated_pages: int, workdir: str):
+    """Return {name: pdf path} for the samples and the generated statements"""
+    inputs = {}
+    for path in sorted(glob.glob(os.path.join(ROOT, "samples", "*.pdf"))):
+        inputs[os.path.basename(path)] = path
+    if generated_pages:
+        for bank in LAYOUTS:
+            name = f"synthetic_{bank.lower()}_{generated_pages}p.pdf"
+            path = os.path.join(workdir, name)
+            generate_statement(bank, path, pages=generated_pages)
+            inputs[name] = path
+    return inputs
+
+
+def golden_output(result, transactions):
+    """Comparable output: drop export paths, timings and stripping stats, normalise through JSON"""
+    result = {k: v for k, v in result.items()
+              if k not in ("timings", "boilerplate") and not (k.startswith("transactions_") and k != "transactions_count")}
+    return json.loads(json.dumps({"result": result, "transactions": transactions}, default=str))
+
+
+def golden_path(name: str) -> str:
+    return os.path.join(GOLDEN_DIR, os.path.splitext(name)[0] + ".json")
+
+
+def diff_outputs(expected, actual, limit: int = 40) -> str:
+    a = json.dumps(expected, indent=1, sort_keys=True, ensure_ascii=False).splitlines()
+    b = json.dumps(actual, indent=1, sort_keys=True, ensure_ascii=False).splitlines()
+    lines = list(difflib.unified_diff(a, b, "golden", "current", lineterm=""))
+    if len(lines) > limit:
+        lines = lines[:limit] + [f"... {len(lines) - limit} more diff lines"]
+    return "\n".join(lines)
+
+
+def over_budget(value: float, budget: float, tolerance_pct: float, slack: float) -> bool:
+    return value > budget * (1 + tolerance_pct / 100.0) and value - budget > slack
+
+
+def check_boilerplate_stripping() -> List[str]:
+    """
+    Behavioural check of BoilerplateStripper on a statement with a short last page
+
+    The letterhead and footer repeat on every page and must go from the third page on.
+    A transaction row printed again on the short last page (entirely inside the edge
+    zone) must survive, even without a keep() callback that recognises it.
+    """
+    row = "05/01/2024 SWIGGY BANGALORE 250.00"
+    rows = [[f"0{d}/01/2024 UBER INDIA {d}10.00", f"0{d}/01/2024 ZOMATO GURGAON {d}20.00"] for d in (1, 2, 3)]
+    rows[1].insert(1, row)
+    pages = [["ACME BANK CREDIT CARD STATEMENT", "Date Description Amount"] + page_rows + [f"Page {n} of 4"]
+             for n, page_rows in enumerate(rows + [[row]], start=1)]
+
+    stripper = BoilerplateStripper()
+    stripped = [stripper.strip("\n".join(lines)).split("\n") for lines in pages]
+    problems = []
+    if row not in stripped[3]:
+        problems.append(f"transaction row repeated on a short page was dropped: {stripped[3]}")
+    if "ACME BANK CREDIT CARD STATEMENT" not in stripped[0]:
+        problems.append("letterhead dropped from the first page")
+    for n in (2, 3):
+        leftover = [line for line in ("ACME BANK CREDIT CARD STATEMENT", f"Page {n + 1} of 4") if line in stripped[n]]
+        if leftover:
+            problems.append(f"page {n + 1} still has boilerplate: {leftover}")
+    return problems
+
+
+def check_boilerplate_thresholds() -> List[str]:
+    """
+    Direct checks of BoilerplateStripper's keep rules
+
+    A line repeated on only two pages, or on fewer than MIN_SHARE of the pages read,
+    is kept. A transaction row repeated at the top of every page is kept when keep()
+    recognises it (here with the HDFC parser, as parse_statement_file does) and
+    dropped without it, so the scenario really reaches the rule.
+    """
+    letterhead = ["ACME BANK CREDIT CARD STATEMENT", "Date Description Amount"]
+    body = [f"0{d}/02/2024 UBER INDIA {d}10.00" for d in range(1, 6)]
+    problems = []
+
+    # Printed on pages 1 and 2 only
+    notice = "YOUR CREDIT LIMIT HAS BEEN REVISED"
+    stripper = BoilerplateStripper()
+    for n in range(1, 5):
+        page = stripper.strip("\n".join(letterhead + ([notice] if n <= 2 else []) + body))
+        if n == 2 and notice not in page:
+            problems.append("line repeated on only two pages was dropped")
+
+    # Printed on every fourth page: the MIN_PAGES-th copy still falls short of the share
+    sparse = "EMI CONVERSION OFFER INSIDE"
+    stripper = BoilerplateStripper()
+    for n in range(1, 4 * MIN_PAGES - 2):
+        page = stripper.strip("\n".join(letterhead + ([sparse] if n % 4 == 1 else []) + body))
+        if n % 4 == 1 and sparse not in page:
+            problems.append(f"line on {n // 4 + 1} of {n} pages was dropped on page {n}")
+
+    # The same transaction row at the top of every page
+    row = "01/02/2024 NETFLIX COM 649.00"
+    pages = ["\n".join([row] + letterhead + body) for _ in range(6)]
+    protected = BoilerplateStripper(keep=transaction_line_check(get_parser("HDFC")))
+    kept = [row in protected.strip(page) for page in pages]
+    if not all(kept):
+        problems.append(f"transaction row dropped despite keep() on pages {[n + 1 for n, k in enumerate(kept) if not k]}")
+    unprotected = BoilerplateStripper()
+    if all(row in unprotected.strip(page) for page in pages):
+        problems.append("repeated row survived without keep(): the keep() case does not exercise the rule")
+    return problems
+
+
+def run(args) -> int:
+    os.makedirs(GOLDEN_DIR, exist_ok=True)
+    budgets = {}
+    if os.path.exists(BUDGETS_FILE):
+        with open(BUDGETS_FILE) as f:
+            budgets = json.load(f)
+
+    failures = 0
+    if args.strip_boilerplate:
+        problems = check_boilerplate_stripping()
+        print(f"{'FAIL' if problems else 'ok':7} boilerplate stripping: short page repeating a transaction row")
+        for problem in problems:
+            print("        " + problem)
+        failures += bool(problems)
+        problems = check_boilerplate_thresholds()
+        print(f"{'FAIL' if problems else 'ok':7} boilerplate stripping: two-page and sparse repeats, protected rows")
+        for problem in problems:
+            print("        " + problem)
+        failures += bool(problems)
+
+    new_budgets = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        inputs = collect_inputs(args.generated_pages, workdir)
+        for name, path in inputs.items():
+            parse = lambda p: parse_statement_file(  # noqa: E731
+                p, export_csv=False, strip_boilerplate=args.strip_boilerplate)
+            (result, transactions), seconds, peak = measure(parse, path, memory=not args.no_memory)
+            # Best of --repeat runs keeps scheduler noise out of the time budget
+            for _ in range(args.repeat - 1):
+                seconds = min(seconds, measure(parse, path, memory=False)[1])
+            peak_mb = peak / 1e6 if peak is not None else None
+            output = golden_output(result, transactions)
+            new_budgets[name] = {"seconds": round(seconds, 4),
+                                 "peak_mb": round(peak_mb, 2) if peak_mb is not None else None}
+
+            problems = []
+            gpath = golden_path(name)
+            if args.update:
+                with open(gpath, "w") as f:
+                    json.dump(output, f, indent=1, ensure_ascii=False)
+                    f.write("\n")
+            elif not os.path.exists(gpath):
+                problems.append("no golden output (run with --update)")
+            else:
+                with open(gpath) as f:
+                    expected = json.load(f)
+                if expected != output:
+                    problems.append("output changed:\n" + diff_outputs(expected, output))
+
+            budget = budgets.get(name)
+            if budget and not args.update:
+                if over_budget(seconds, budget["seconds"], args.tolerance, MIN_SECONDS_SLACK):
+                    problems.append(f"time {seconds:.3f}s over budget {budget['seconds']:.3f}s "
+                                    f"(+{args.tolerance:g}%)")
+                if peak_mb is not None and budget.get("peak_mb") is not None and over_budget(
+                        peak_mb, budget["peak_mb"], args.memory_tolerance, MIN_MEMORY_SLACK_MB):
+                    problems.append(f"peak memory {peak_mb:.1f}MB over budget {budget['peak_mb']:.1f}MB "
+                                    f"(+{args.memory_tolerance:g}%)")
+
+            peak_str = f"{peak_mb:7.1f}MB" if peak_mb is not None else f"{'-':>9}"
+            status = "FAIL" if problems else ("UPDATED" if args.update else "ok")
+            print(f"{status:7} {name:45} {len(transactions):6} txns {seconds:8.3f}s {peak_str}")
+            for problem in problems:
+                print("        " + problem.replace("\n", "\n        "))
+            failures += bool(problems)
+
+    if args.update:
+        with open(BUDGETS_FILE, "w") as f:
+            json.dump(new_budgets, f, indent=1, sort_keys=True)
+            f.write("\n")
+        print(f"\nWrote {len(new_budgets)} goldens and budgets to {GOLDEN_DIR}")
+        return 0
+
+    print(f"\n{failures} of {len(new_budgets) + args.strip_boilerplate} checks failed" if failures
+          else f"\nAll {len(new_budgets)} files passed")
+    return 1 if failures else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check parser output and performance against goldens")
+    parser.add_argument("--update", action="store_true", help="rewrite golden outputs and budgets")
+    parser.add_argument("--tolerance", type=float, default=50.0,
+                        help="allowed parse time regression in percent (default: 50)")
+    parser.add_argument("--memory-tolerance", type=float, default=25.0,
+                        help="allowed peak memory regression in percent (default: 25)")
+    parser.add_argument("--generated-pages", type=int, default=5,
+                        help="pages per synthetic statement, 0 to check samples only (default: 5)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per file, best is kept (default: 3)")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--strip-boilerplate", action="store_true",
+                        help="parse with repeated header/footer stripping; output must still match the goldens")
+    args = parser.parse_args()
+    sys.exit(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,444 @@
+"""
+Concurrent-session load test for app.py and the parsing core
+
+Simulates N users at once. Each session uploads statements (samples/*.pdf by default)
+and then interacts with the result: a description filter, a different page size and,
+for the core target, a CSV export. Every concurrency level reports throughput,
+latency percentiles per operation, CPU per session and memory per session, so an
+instance can be sized and concurrency changes compared run to run.
+
+Targets:
+    core  The work one app session does per upload without Streamlit:
+          parse_statement_bytes, TransactionIndex filter/page and export_transactions.
+          Sessions are threads (like Streamlit script threads) or, with --processes,
+          separate processes.
+    app   app.py itself through streamlit.testing's AppTest. Each session is its own
+          AppTest with its own session state; cache_resource objects (ParseCache,
+          worker pool) are shared process-wide as between sessions of one server.
+
+Uploads get a unique trailing PDF comment per session and iteration so the upload
+digest, and with it ParseCache, misses like it would for different users' files;
+--cached uploads the same bytes every time instead.
+
+Usage:
+    python benchmarks/load_test.py --target core --sessions 1 2 4 8 --iterations 5
+    python benchmarks/load_test.py --target app --sessions 1 4 --files 2 --json load.json
+"""
+import argparse
+import glob
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+PERCENTILES = (50, 90, 95, 99)
+
+# Streamlit versions (major.minor) whose internals _prepare_app has been checked against
+STREAMLIT_TESTED = ("1.66",)
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+def _child_pids() -> List[int]:
+    import multiprocessing
+    return [p.pid for p in multiprocessing.active_children()]
+
+
+def rss_bytes(pid="self") -> int:
+    """Resident set size of a process from /proc (0 where /proc is unavailable)"""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return 0
+
+
+def cpu_seconds(pid) -> float:
+    """User + system CPU time of another process from /proc (0 where unavailable)"""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / _CLOCK_TICKS
+    except (OSError, IndexError, ValueError):
+        return 0.0
+
+
+class ResourceSampler(threading.Thread):
+    """
+    Samples RSS of this process plus its child processes (parse pool workers) and
+    reports CPU time used by both between start() and stop()
+    """
+
+    def __init__(self, interval: float = 0.05):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self.baseline = self.total_rss()
+        self.peak = self.baseline
+        self._cpu = time.process_time()
+        self._children_cpu = {pid: cpu_seconds(pid) for pid in _child_pids()}
+
+    @staticmethod
+    def total_rss() -> int:
+        return rss_bytes() + sum(rss_bytes(pid) for pid in _child_pids())
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            self.peak = max(self.peak, self.total_rss())
+
+    def stop(self) -> Dict:
+        self._stop_event.set()
+        self.join()
+        self.peak = max(self.peak, self.total_rss())
+        children = sum(cpu_seconds(pid) - self._children_cpu.get(pid, 0.0) for pid in _child_pids())
+        return {"cpu": time.process_time() - self._cpu, "children_cpu": children,
+                "rss_baseline": self.baseline, "rss_peak": self.peak}
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * q / 100
+    low = int(k)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (k - low)
+
+
+def load_pdfs(patterns: List[str]) -> List[Tuple[str, bytes]]:
+    paths = sorted({p for pattern in patterns for p in glob.glob(pattern)})
+    if not paths:
+        raise Exception(f"No PDFs match {' '.join(patterns)}")
+    pdfs = []
+    for path in paths:
+        with open(path, "rb") as f:
+            pdfs.append((os.path.basename(path), f.read()))
+    return pdfs
+
+
+def upload_set(pdfs: List[Tuple[str, bytes]], session: int, iteration: int, files: int,
+               cached: bool) -> List[Tuple[str, bytes]]:
+    """Files one session uploads in one iteration, rotating through the PDFs"""
+    chosen = []
+    for i in range(files):
+        name, data = pdfs[(session + iteration * files + i) % len(pdfs)]
+        if not cached:
+            # Bytes after %%EOF are ignored by PDF readers but change the upload digest
+            data = data + f"\n%load-test {session}-{iteration}-{i}\n".encode()
+        chosen.append((f"{session}-{iteration}-{i}-{name}", data))
+    return chosen
+
+
+def _filter_word(descriptions: List[str], rng: random.Random) -> Optional[str]:
+    words = [w for d in descriptions for w in str(d).split() if w.isalpha() and len(w) > 3]
+    return rng.choice(words) if words else None
+
+
+class CoreSession:
+    """One simulated user against the parsing core"""
+
+    def __init__(self, session: int, think: float):
+        self.session = session
+        self.think = think
+        self.rng = random.Random(session)
+        self.ops = []
+
+    def timed(self, kind: str, fn, *args):
+        start = time.perf_counter()
+        try:
+            value = fn(*args)
+            error = None
+        except Exception as e:
+            value, error = None, f"{type(e).__name__}: {e}"
+        self.ops.append({"op": kind, "seconds": time.perf_counter() - start, "error": error})
+        if self.think:
+            time.sleep(self.think)
+        return value
+
+    def run(self, uploads: List[List[Tuple[str, bytes]]]) -> List[Dict]:
+        from exporters import export_transactions
+        from statement_parser import parse_statement_bytes
+        from transaction_view import TransactionIndex
+
+        def upload(files):
+            parsed = []
+            for _, data in files:
+                result, transactions = parse_statement_bytes(data)
+                index = TransactionIndex(transactions)
+                index.page(index.filter(), 1, 50)
+                parsed.append((result, transactions, index))
+            return parsed
+
+        def interact(parsed, text, page_size):
+            for _, _, index in parsed:
+                index.page(index.filter(text=text), 1, page_size)
+
+        def export(parsed):
+            for result, transactions, _ in parsed:
+                export_transactions(transactions, result.get("bank", "UNKNOWN"), "csv")
+
+        for files in uploads:
+            parsed = self.timed("upload", upload, files)
+            if not parsed:
+                continue
+            word = _filter_word([tx.get("Description") for _, txs, _ in parsed for tx in txs], self.rng)
+            self.timed("filter", interact, parsed, word, 50)
+            self.timed("page_size", interact, parsed, None, 100)
+            self.timed("export", export, parsed)
+        return self.ops
+
+
+def _widget(elements, label: str):
+    return next((w for w in elements if w.label == label), None)
+
+
+class AppSession(CoreSession):
+    """One simulated user driving app.py through AppTest"""
+
+    timeout = 600
+
+    def rerun(self, at, action=None) -> None:
+        if action is not None:
+            action()
+        at.run(timeout=self.timeout)
+        failures = [e.value for e in at.exception] + [e.value for e in at.error]
+        if failures:
+            raise Exception(str(failures[0]).splitlines()[0])
+
+    def run(self, uploads: List[List[Tuple[str, bytes]]]) -> List[Dict]:
+        from streamlit.testing.v1 import AppTest
+
+        at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=self.timeout)
+        self.timed("page_load", self.rerun, at)
+        for files in uploads:
+            uploader = at.file_uploader[0]
+            self.timed("upload", self.rerun, at, lambda: uploader.set_value(
+                [(name, data, "application/pdf") for name, data in files]))
+            if self.ops[-1]["error"] is not None:
+                continue
+            descriptions = []
+            for frame in at.dataframe:
+                if "Description" in frame.value:
+                    descriptions.extend(frame.value["Description"].tolist())
+            word = _filter_word(descriptions, self.rng)
+            text_input = _widget(at.text_input, "Description contains")
+            if text_input is not None and word:
+                self.timed("filter", self.rerun, at, lambda: text_input.input(word))
+            page_size = _widget(at.selectbox, "Rows per page")
+            if page_size is not None:
+                self.timed("page_size", self.rerun, at, lambda: page_size.set_value(100))
+        return self.ops
+
+
+def _prepare_app() -> None:
+    """
+    Let AppTest instances run concurrently, as sessions of one server
+
+    AppTest assumes one test at a time: every run installs its own mock Runtime and
+    switches the global.appTest option on, then resets both when it returns, under
+    any other session whose script is still running. Here one runtime and the option
+    are installed for the whole load test instead, and the runs' own copies are
+    discarded.
+
+    This is a shim over Streamlit internals, not public API: it replaces
+    testing.v1.app_test.Runtime and app_test.patch_config_options, builds the mock
+    Runtime from the managers AppTest itself uses, and wraps ScriptCache.get_bytecode.
+    It refuses to run on Streamlit versions outside STREAMLIT_TESTED; on a new version,
+    compare those with AppTest._run and add the version once they still match.
+    """
+    import streamlit
+
+    version = ".".join(streamlit.__version__.split(".")[:2])
+    if version not in STREAMLIT_TESTED:
+        raise Exception(f"--target app patches Streamlit internals checked only against Streamlit "
+                        f"{', '.join(STREAMLIT_TESTED)}, found {streamlit.__version__}. Check _prepare_app "
+                        f"against this version and add it to STREAMLIT_TESTED, or use --target core.")
+
+    import contextlib
+    import logging
+    from unittest.mock import MagicMock
+
+    from streamlit import config
+    from streamlit.components.v2.component_manager import BidiComponentManager
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+    from streamlit.runtime.dataframe_source_manager import DataframeSourceManager
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+    from streamlit.runtime.scriptrunner import script_cache
+    from streamlit.testing.v1 import app_test
+
+    runtime = MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.dataframe_source_mgr = DataframeSourceManager()
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    runtime.bidi_component_registry = BidiComponentManager()
+    Runtime._instance = runtime
+    config.set_option("global.appTest", True)
+    app_test.Runtime = type("Runtime", (), {"_instance": None})
+    app_test.patch_config_options = lambda options: contextlib.nullcontext()
+
+    # A server compiles the script once into the runtime's script cache; AppTest gives
+    # each instance its own, and concurrent ast.parse calls can crash CPython 3.11
+    lock = threading.Lock()
+    compiled = {}
+    get_bytecode = script_cache.ScriptCache.get_bytecode
+
+    def locked_get_bytecode(self, script_path):
+        with lock:
+            if script_path not in compiled:
+                compiled[script_path] = get_bytecode(self, script_path)
+            return compiled[script_path]
+
+    script_cache.ScriptCache.get_bytecode = locked_get_bytecode
+
+    # The app's deprecation warnings would be logged on every rerun of every session, and
+    # creating an AppTest off the main thread warns about a missing context it does not need
+    for name in ("streamlit.deprecation_util", "streamlit.runtime.scriptrunner_utils.script_run_context"):
+        logging.getLogger(name).disabled = True
+
+
+def _process_session(session: int, uploads, think: float) -> Tuple[List[Dict], float, int]:
+    """
+    Core session in a worker process: (ops, CPU seconds, RSS growth)
+
+    RSS growth is the worker's sampled peak minus its RSS when the session started,
+    the same measure threads mode reports, so interpreter start-up is not counted.
+    """
+    sampler = ResourceSampler()
+    sampler.start()
+    cpu = time.process_time()
+    ops = CoreSession(session, think).run(uploads)
+    cpu = time.process_time() - cpu
+    usage = sampler.stop()
+    return ops, cpu, usage["rss_peak"] - usage["rss_baseline"]
+
+
+def run_level(target: str, sessions: int, pdfs, iterations: int, files: int, cached: bool,
+              think: float, processes: bool) -> Dict:
+    """Run one concurrency level and summarise it"""
+    plans = [[upload_set(pdfs, s, i, files, cached) for i in range(iterations)] for s in range(sessions)]
+    session_class = AppSession if target == "app" else CoreSession
+    results = [None] * sessions
+
+    sampler = ResourceSampler()
+    sampler.start()
+    start = time.perf_counter()
+    if processes:
+        with ProcessPoolExecutor(max_workers=sessions) as pool:
+            futures = [pool.submit(_process_session, s, plans[s], think) for s in range(sessions)]
+            outcomes = [f.result() for f in futures]
+        results = [ops for ops, _, _ in outcomes]
+    else:
+        def worker(s: int) -> None:
+            results[s] = session_class(s, think).run(plans[s])
+
+        threads = [threading.Thread(target=worker, args=(s,)) for s in range(sessions)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    wall = time.perf_counter() - start
+    usage = sampler.stop()
+
+    ops = [op for session_ops in results for op in (session_ops or [])]
+    if processes:
+        cpu = sum(c for _, c, _ in outcomes)
+        rss_per_session = sum(r for _, _, r in outcomes) / sessions
+    else:
+        cpu = usage["cpu"] + usage["children_cpu"]
+        rss_per_session = (usage["rss_peak"] - usage["rss_baseline"]) / sessions
+
+    uploads = [op for op in ops if op["op"] == "upload" and op["error"] is None]
+    latency = {}
+    for kind in dict.fromkeys(op["op"] for op in ops):
+        seconds = [op["seconds"] for op in ops if op["op"] == kind and op["error"] is None]
+        latency[kind] = {f"p{q}": percentile(seconds, q) for q in PERCENTILES}
+        latency[kind]["max"] = max(seconds) if seconds else None
+        latency[kind]["count"] = len(seconds)
+
+    return {
+        "target": target,
+        "sessions": sessions,
+        "mode": "processes" if processes else "threads",
+        "wall_seconds": wall,
+        "operations": len(ops),
+        "errors": sum(1 for op in ops if op["error"] is not None),
+        "first_error": next((op["error"] for op in ops if op["error"] is not None), None),
+        "uploads_per_second": len(uploads) * files / wall if wall else None,
+        "operations_per_second": len(ops) / wall if wall else None,
+        "latency": latency,
+        "cpu_seconds": cpu,
+        "cpu_per_session": cpu / sessions,
+        "cpu_utilisation": cpu / wall / (os.cpu_count() or 1) if wall else None,
+        "rss_baseline_mb": usage["rss_baseline"] / 1e6,
+        "rss_peak_mb": usage["rss_peak"] / 1e6,
+        "rss_per_session_mb": rss_per_session / 1e6,
+    }
+
+
+def format_level(report: Dict) -> str:
+    lines = [
+        f"{report['target']} x {report['sessions']} sessions ({report['mode']}): "
+        f"{report['wall_seconds']:.2f}s wall, {report['uploads_per_second']:.2f} PDFs/s, "
+        f"{report['operations_per_second']:.2f} ops/s, {report['errors']} errors",
+        f"  CPU {report['cpu_per_session']:.3f}s/session ({report['cpu_utilisation'] * 100:.0f}% of "
+        f"{os.cpu_count()} cores), RSS {report['rss_baseline_mb']:.0f} -> {report['rss_peak_mb']:.0f}MB, "
+        f"{report['rss_per_session_mb']:.1f}MB/session",
+    ]
+    for kind, stats in report["latency"].items():
+        if not stats["count"]:
+            continue
+        cells = "  ".join(f"p{q} {stats[f'p{q}'] * 1000:9.2f}" for q in PERCENTILES)
+        lines.append(f"  {kind:10} n={stats['count']:<4} {cells}  max {stats['max'] * 1000:9.2f} ms")
+    if report["first_error"]:
+        lines.append(f"  first error: {report['first_error']}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate concurrent sessions against app.py or the parsing core")
+    parser.add_argument("--target", choices=["core", "app"], default="core", help="what to load (default: core)")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4], help="concurrency levels to run")
+    parser.add_argument("--iterations", type=int, default=3, help="uploads per session")
+    parser.add_argument("--files", type=int, default=1, help="PDFs per upload (app: >1 uses the worker pool)")
+    parser.add_argument("--pdfs", nargs="+", default=[os.path.join(ROOT, "samples", "*.pdf")],
+                        help="PDFs or glob patterns to upload (default: samples/*.pdf)")
+    parser.add_argument("--think", type=float, default=0.0, help="seconds a session waits between operations")
+    parser.add_argument("--cached", action="store_true", help="upload identical bytes so parse caches can hit")
+    parser.add_argument("--processes", action="store_true", help="core: run each session in its own process")
+    parser.add_argument("--json", default=None, help="write the reports to this file")
+    args = parser.parse_args()
+
+    if args.processes and args.target != "core":
+        raise ValueError("--processes applies to --target core only")
+    pdfs = load_pdfs(args.pdfs)
+    if args.target == "app":
+        _prepare_app()
+
+    # Warm-up: imports, script compilation, and the app's worker pool are paid once, not by the first level
+    run_level(args.target, 1, pdfs, 1, args.files, args.cached, 0.0, False)
+
+    reports = []
+    for sessions in args.sessions:
+        report = run_level(args.target, sessions, pdfs, args.iterations, args.files, args.cached,
+                           args.think, args.processes)
+        print(format_level(report))
+        print()
+        reports.append(report)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(reports, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
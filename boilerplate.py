@@ -0,0 +1,106 @@
+from typing import Callable, Dict, Optional
+
+# Lines within this many non-blank lines of the top or bottom of a page are header/footer candidates
+EDGE_LINES = 12
+
+# Edge lines with at most this many digits are compared with digits masked, so
+# "Page 3 of 50" and "Page 4 of 50" share a fingerprint. Lines with more digits
+# (dates, amounts) must repeat exactly.
+MAX_MASKED_DIGITS = 4
+
+# An edge line is boilerplate once it has appeared in the same zone on at least MIN_PAGES
+# pages and on at least MIN_SHARE of the pages read so far. A line seen on only two
+# pages (a transaction row repeated on a short page) is never dropped.
+MIN_PAGES = 3
+MIN_SHARE = 0.5
+
+MASK_DIGITS = str.maketrans("0123456789", "##########")
+DROP_DIGITS = str.maketrans("", "", "0123456789")
+
+
+def line_fingerprint(zone: str, line: str) -> str:
+    """Set key for a line: its page zone ("top" or "bottom") and whitespace-normalised text"""
+    text = " ".join(line.split())
+    if len(text) - len(text.translate(DROP_DIGITS)) <= MAX_MASKED_DIGITS:
+        text = text.translate(MASK_DIGITS)
+    return zone + "\x00" + text
+
+
+class BoilerplateStripper:
+    """
+    Removes letterheads, column headers, disclaimers and page footers repeated across pages
+
+    Pages are processed in order, so it works on streamed pages. Each line near the top
+    or bottom of a page is fingerprinted by text and zone, and the pages each
+    fingerprint appeared on are counted. A line is dropped once its fingerprint has
+    repeated on most of the pages read so far (see MIN_PAGES and MIN_SHARE); earlier
+    occurrences are kept, so summary fields printed in the letterhead remain.
+    Lines for which keep(line) is true (e.g. lines the parser reads as a transaction)
+    are never dropped, so identical transactions on different pages survive.
+    """
+
+    def __init__(self, keep: Optional[Callable[[str], bool]] = None, edge_lines: int = EDGE_LINES,
+                 min_pages: int = MIN_PAGES, min_share: float = MIN_SHARE):
+        self.keep = keep
+        self.edge_lines = edge_lines
+        self.min_pages = min_pages
+        self.min_share = min_share
+        self.counts = {}    # fingerprint -> pages it appeared on
+        self.pages = 0
+        self.lines_total = 0
+        self.lines_dropped = 0
+        self.bytes_total = 0
+        self.bytes_dropped = 0
+
+    def strip(self, page_text: str) -> str:
+        """Return the page without edge lines that repeat on most earlier pages"""
+        self.pages += 1
+        lines = page_text.split("\n")
+        self.lines_total += len(lines)
+        self.bytes_total += len(page_text.encode("utf-8"))
+
+        content = [i for i, line in enumerate(lines) if line and not line.isspace()]
+        zones = {}
+        for i in content[-self.edge_lines:]:
+            zones[i] = "bottom"
+        for i in content[:self.edge_lines]:
+            zones[i] = "top"
+
+        fingerprints = {i: line_fingerprint(zone, lines[i]) for i, zone in zones.items()}
+        # Count each fingerprint once per page, before deciding, so repeats within a page agree
+        for fingerprint in set(fingerprints.values()):
+            self.counts[fingerprint] = self.counts.get(fingerprint, 0) + 1
+        threshold = max(self.min_pages, self.min_share * self.pages)
+
+        kept = []
+        for i, line in enumerate(lines):
+            fingerprint = fingerprints.get(i)
+            if (fingerprint is not None and self.counts[fingerprint] >= threshold
+                    and not (self.keep and self.keep(line))):
+                self.lines_dropped += 1
+                self.bytes_dropped += len(line.encode("utf-8")) + 1
+                continue
+            kept.append(line)
+        return "\n".join(kept)
+
+    def stats(self) -> Dict:
+        return {
+            "pages": self.pages,
+            "lines_total": self.lines_total,
+            "lines_dropped": self.lines_dropped,
+            "bytes_total": self.bytes_total,
+            "bytes_dropped": self.bytes_dropped,
+        }
+
+
+def transaction_line_check(parser) -> Callable[[str], bool]:
+    """keep() callback that protects every line the given parser reads as a transaction"""
+    # Repeated boilerplate lines are checked on every page, so remember the answer per line
+    checked = {}
+
+    def is_transaction(line: str) -> bool:
+        result = checked.get(line)
+        if result is None:
+            result = checked[line] = next(iter(parser.iter_transactions(parser.clean_text(line))), None) is not None
+        return result
+    return is_transaction
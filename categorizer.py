@@ -0,0 +1,220 @@
+"""
+Merchant categorisation for transaction descriptions
+
+Keywords from a merchant -> category rule set are compiled into an Aho-Corasick
+automaton over words, so one pass over a description finds every keyword in it,
+single or multi-word ("AMAZON PAY"). Descriptions are normalised (upper case,
+punctuation and bare numbers dropped) before matching and the result is memoised on
+the normalised text, so "SWIGGY BANGALORE 1234" and "SWIGGY BANGALORE 5678" are
+classified once.
+
+    categorizer = Categorizer()
+    categorizer.categorize("SWIGGY BANGALORE")            # "Food & Dining"
+    categorizer.categorize_many(descriptions)             # one category per description
+    categorizer.categorize_transactions(transactions)     # sets tx["Category"]
+"""
+import hashlib
+import json
+import re
+from typing import Dict, Iterable, List, Optional
+
+CATEGORY_FIELD = "Category"
+UNCATEGORIZED = "Uncategorized"
+
+# Category -> merchant keywords. Keywords are matched as whole words after normalisation.
+DEFAULT_RULES = {
+    "Food & Dining": ["SWIGGY", "ZOMATO", "RESTAURANT", "CAFE", "STARBUCKS", "DOMINOS", "MCDONALDS",
+                      "KFC", "PIZZA HUT", "DUNZO", "EATSURE", "FOOD"],
+    "Groceries": ["BIG BAZAAR", "BIGBASKET", "DMART", "GROFERS", "BLINKIT", "ZEPTO", "RELIANCE FRESH",
+                  "MORE RETAIL", "SUPERMARKET", "GROCERY"],
+    "Shopping": ["AMAZON", "FLIPKART", "MYNTRA", "AJIO", "NYKAA", "MEESHO", "TATA CLIQ", "SHOPPERS STOP",
+                 "LIFESTYLE", "WESTSIDE", "DECATHLON", "CROMA", "RELIANCE DIGITAL", "IKEA"],
+    "Travel": ["UBER", "OLA", "RAPIDO", "IRCTC", "MAKEMYTRIP", "GOIBIBO", "CLEARTRIP", "YATRA", "INDIGO",
+               "AIR INDIA", "VISTARA", "SPICEJET", "AIRLINES", "AIRWAYS", "METRO", "FASTAG", "HOTEL"],
+    "Fuel": ["BPCL", "HPCL", "IOCL", "INDIAN OIL", "BHARAT PETROLEUM", "HINDUSTAN PETROLEUM", "SHELL",
+             "PETROL", "FUEL"],
+    "Entertainment": ["NETFLIX", "SPOTIFY", "HOTSTAR", "PRIME VIDEO", "BOOKMYSHOW", "PVR", "INOX",
+                      "YOUTUBE", "APPLE COM BILL"],
+    "Health": ["APOLLO PHARMACY", "PHARMACY", "PHARMEASY", "NETMEDS", "1MG", "HOSPITAL", "CLINIC",
+               "MEDICAL", "DIAGNOSTICS"],
+    "Utilities & Bills": ["ELECTRICITY", "BESCOM", "TATA POWER", "AIRTEL", "JIO", "VODAFONE", "BSNL",
+                          "BROADBAND", "GAS", "WATER BILL", "BILLDESK", "RECHARGE"],
+    "Insurance": ["INSURANCE", "LIC", "POLICY", "PREMIUM"],
+    "Cash": ["ATM", "CASH WITHDRAWAL", "ATM WITHDRAWAL"],
+    "Transfers": ["UPI", "NEFT", "IMPS", "RTGS", "TRANSFER", "PAYTM", "PHONEPE", "GPAY", "GOOGLE PAY",
+                  "MOBIKWIK", "MOBIKWIKUPI"],
+    "Income": ["SALARY", "INTEREST CREDIT", "INT PD", "DIVIDEND", "REFUND", "CASHBACK"],
+    "Fees & Charges": ["FEE", "CHARGES", "GST", "IGST", "CGST", "SGST", "LATE PAYMENT", "FINANCE CHARGE", "ANNUAL FEE"],
+    "Payments": ["PAYMENT RECEIVED", "PAYMENT THANK YOU", "AUTOPAY", "BILL PAYMENT"],
+}
+
+# Category -> priority (default 0). A keyword of a higher priority category wins over any
+# keyword of a lower one, whatever their lengths: payment channels name how money moved,
+# not who was paid, so "UPI/.../SWIGGY" is Food & Dining.
+DEFAULT_PRIORITIES = {
+    "Transfers": -1,
+}
+
+# Words are runs of letters and digits with at least one letter: punctuation is a word
+# break and bare numbers are dropped, so reference numbers do not split the memo cache
+# while "1MG" stays one word. Keywords are normalised the same way.
+_WORD = re.compile(r"[^\W_]*[^\W\d_][^\W_]*")
+
+
+def normalize_merchant(description: str) -> str:
+    """Upper-case words of a description without punctuation or bare numbers"""
+    return " ".join(_WORD.findall(str(description).upper()))
+
+
+class Categorizer:
+    """
+    Word-level Aho-Corasick matcher from merchant keywords to categories
+
+    When several keywords occur in one description the one whose category has the
+    highest priority wins, then the one with the most words (then the longest, then the
+    earliest rule), so "APOLLO PHARMACY" beats "PHARMACY", "AMAZON PAY" can be mapped
+    apart from "AMAZON" and "UPI SWIGGY" is Food & Dining rather than Transfers.
+    """
+
+    def __init__(self, rules: Optional[Dict[str, List[str]]] = None, default: str = UNCATEGORIZED,
+                 max_cache: int = 1_000_000, priorities: Optional[Dict[str, int]] = None):
+        """
+        Args:
+            rules: Category -> list of merchant keywords (defaults to DEFAULT_RULES)
+            default: Category for descriptions that match no keyword
+            max_cache: Memoised descriptions kept (raw and normalised, each) before
+                the caches are reset
+            priorities: Category -> priority, 0 when missing (defaults to
+                DEFAULT_PRIORITIES)
+        """
+        self.rules = DEFAULT_RULES if rules is None else rules
+        self.priorities = DEFAULT_PRIORITIES if priorities is None else priorities
+        self.default = default
+        self.max_cache = max_cache
+        self._cache = {}    # normalised text -> category
+        self._raw = {}      # description as given -> category
+        # Identifies the rule set, e.g. in result cache keys
+        rule_set = json.dumps([self.rules, default, self.priorities], sort_keys=True)
+        self.fingerprint = hashlib.sha256(rule_set.encode("utf-8")).hexdigest()[:16]
+        self._compile()
+
+    def _compile(self) -> None:
+        # goto[state] maps a word to the next state; out[state] is the best match
+        # (rank, category) ending at that state, including matches via fail links
+        goto = [{}]
+        out = [None]
+        order = 0
+        for category, keywords in self.rules.items():
+            priority = self.priorities.get(category, 0)
+            for keyword in keywords:
+                words = normalize_merchant(keyword).split()
+                if not words:
+                    continue
+                state = 0
+                for word in words:
+                    nxt = goto[state].get(word)
+                    if nxt is None:
+                        nxt = goto[state][word] = len(goto)
+                        goto.append({})
+                        out.append(None)
+                    state = nxt
+                rank = (priority, len(words), sum(map(len, words)), -order)
+                if out[state] is None or rank > out[state][0]:
+                    out[state] = (rank, category)
+                order += 1
+
+        # Breadth-first, so fail links of shallower states are set first; depth-1
+        # states fail to the root
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for state in queue:
+            for word, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and word not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(word, 0)
+                if out[fail[nxt]] is not None and (out[nxt] is None or out[fail[nxt]][0] > out[nxt][0]):
+                    out[nxt] = out[fail[nxt]]
+
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+
+    def _match(self, text: str) -> str:
+        goto, fail, out = self._goto, self._fail, self._out
+        best = None
+        state = 0
+        for word in text.split():
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            found = out[state]
+            if found is not None and (best is None or found[0] > best[0]):
+                best = found
+        return best[1] if best is not None else self.default
+
+    def _categorize_new(self, description: str) -> str:
+        key = normalize_merchant(description)
+        category = self._cache.get(key)
+        if category is None:
+            if len(self._cache) >= self.max_cache:
+                self._cache.clear()
+            category = self._cache[key] = self._match(key)
+        if len(self._raw) >= self.max_cache:
+            self._raw.clear()
+        self._raw[description] = category
+        return category
+
+    def categorize(self, description: str) -> str:
+        """Category for one description"""
+        category = self._raw.get(description)
+        if category is None:
+            category = self._categorize_new(description)
+        return category
+
+    def categorize_many(self, descriptions: Iterable[str]) -> List[str]:
+        """
+        Categories for a whole column of descriptions
+
+        Each distinct description is normalised and matched at most once, then the
+        results are mapped back over the column.
+        """
+        descriptions = list(descriptions)
+        raw = self._raw
+        found = {}
+        for description in dict.fromkeys(descriptions):
+            category = raw.get(description)
+            found[description] = category if category is not None else self._categorize_new(description)
+        return list(map(found.__getitem__, descriptions))
+
+    def categorize_transactions(self, transactions: List[Dict], field: str = CATEGORY_FIELD) -> List[Dict]:
+        """Set field on every transaction from its Description; returns the same list"""
+        categories = self.categorize_many([tx.get("Description") or "" for tx in transactions])
+        for tx, category in zip(transactions, categories):
+            tx[field] = category
+        return transactions
+
+    def cache_info(self) -> Dict:
+        return {"entries": len(self._cache), "raw_entries": len(self._raw), "max_entries": self.max_cache,
+                "states": len(self._goto)}
+
+
+def load_rules(path: str) -> Dict[str, List[str]]:
+    """Load a category -> keywords rule set from a JSON file"""
+    with open(path) as f:
+        rules = json.load(f)
+    if not isinstance(rules, dict) or not all(isinstance(v, list) for v in rules.values()):
+        raise Exception(f"Invalid category rules in {path}: expected {{category: [keywords]}}")
+    return rules
+
+
+_default_categorizer = None
+
+
+def get_categorizer() -> Categorizer:
+    """Shared Categorizer for DEFAULT_RULES, compiled on first use"""
+    global _default_categorizer
+    if _default_categorizer is None:
+        _default_categorizer = Categorizer()
+    return _default_categorizer
@@ -0,0 +1,241 @@
+import csv
+import io
+from typing import Dict, Iterable, List, Optional
+
+from transaction_utils import amount_to_minor, normalize_date, type_code
+
+# Stable CSV column order for each bank, matching the keys its parser emits
+TRANSACTION_FIELDS = {
+    "HDFC": ["Date", "Description", "Amount", "Type"],
+    "SBI": ["Date", "Description", "Type", "Amount", "Balance"],
+    "ICICI": ["Date", "Type", "Description", "Amount"],
+    "AXIS": ["Date", "Type", "Description", "Amount"],
+    "AMEX": ["Date", "Description", "Amount", "Type"],
+}
+
+DEFAULT_FIELDS = ["Date", "Description", "Type", "Amount"]
+
+
+def get_fieldnames(bank: str, extra_fields: Optional[List[str]] = None) -> List[str]:
+    """Return the export column order for a bank, followed by any extra fields"""
+    fields = list(TRANSACTION_FIELDS.get(str(bank).upper(), DEFAULT_FIELDS))
+    for field in extra_fields or []:
+        if field not in fields:
+            fields.append(field)
+    return fields
+
+
+class TransactionExporter:
+    """Base class for exporters that receive transactions one at a time"""
+
+    extension = ""
+    mime = "application/octet-stream"
+
+    def __init__(self, target, bank: str, extra_fields: Optional[List[str]] = None):
+        """
+        Args:
+            target: Output file path or an open binary file object
+            bank: Bank code from detect_bank, used to pick the schema
+            extra_fields: Additional transaction keys to export after the bank schema
+        """
+        self.target = target
+        self.bank = bank
+        self.fieldnames = get_fieldnames(bank, extra_fields)
+        self.rows_written = 0
+
+    def write(self, tx: Dict) -> None:
+        """Write a single transaction"""
+        raise NotImplementedError
+
+    def write_many(self, transactions: Iterable[Dict]) -> None:
+        """Write a sequence of transactions"""
+        for tx in transactions:
+            self.write(tx)
+
+    def close(self) -> None:
+        """Flush buffered rows and release the output"""
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class CSVExporter(TransactionExporter):
+    """Streams transactions to CSV as they are parsed"""
+
+    extension = ".csv"
+    mime = "text/csv"
+
+    def __init__(self, target, bank: str, extra_fields: Optional[List[str]] = None):
+        super().__init__(target, bank, extra_fields)
+
+        self._owns_file = isinstance(target, str)
+        self._wrapped = False
+        if self._owns_file:
+            self._file = open(target, "w", newline="", encoding="utf-8")
+        elif isinstance(target, io.TextIOBase):
+            self._file = target
+        else:
+            self._file = io.TextIOWrapper(target, encoding="utf-8", newline="", write_through=True)
+            self._wrapped = True
+
+        self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames, extrasaction="ignore")
+        self._writer.writeheader()
+
+    def write(self, tx: Dict) -> None:
+        self._writer.writerow(tx)
+        self.rows_written += 1
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+        if self._owns_file:
+            self._file.close()
+        elif self._wrapped:
+            # Leave the caller's binary stream open
+            self._file.flush()
+            self._file.detach()
+        else:
+            self._file.flush()
+        self._file = None
+
+
+class ColumnarExporter(TransactionExporter):
+    """
+    Buffers transactions into typed Arrow columns and writes them in row groups
+
+    Columns:
+        date (date32), description (string), type_code (int8: 0 debit, 1 credit),
+        amount_minor (int64 paise/cents), balance_minor (int64, SBI only),
+        plus any extra fields as strings
+    """
+
+    def __init__(self, target, bank: str, extra_fields: Optional[List[str]] = None,
+                 row_group_size: int = 65536):
+        super().__init__(target, bank, extra_fields)
+
+        import pyarrow as pa
+
+        self._pa = pa
+        self.row_group_size = row_group_size
+        self.has_balance = "Balance" in self.fieldnames
+        self.extra_fields = [f for f in self.fieldnames
+                             if f not in ("Date", "Description", "Type", "Amount", "Balance")]
+
+        fields = [
+            pa.field("date", pa.date32()),
+            pa.field("description", pa.string()),
+            pa.field("type_code", pa.int8()),
+            pa.field("amount_minor", pa.int64()),
+        ]
+        if self.has_balance:
+            fields.append(pa.field("balance_minor", pa.int64()))
+        for name in self.extra_fields:
+            fields.append(pa.field(name, pa.string()))
+
+        self.schema = pa.schema(fields, metadata={"bank": str(bank)})
+        self._columns = {f.name: [] for f in fields}
+        self._writer = self._open_writer()
+
+    def _open_writer(self):
+        raise NotImplementedError
+
+    def _write_batch(self, batch) -> None:
+        raise NotImplementedError
+
+    def write(self, tx: Dict) -> None:
+        cols = self._columns
+        cols["date"].append(normalize_date(tx.get("Date")))
+        cols["description"].append(tx.get("Description"))
+        cols["type_code"].append(type_code(tx.get("Type")))
+        cols["amount_minor"].append(amount_to_minor(tx.get("Amount")))
+        if self.has_balance:
+            cols["balance_minor"].append(amount_to_minor(tx.get("Balance")))
+        for name in self.extra_fields:
+            value = tx.get(name)
+            cols[name].append(None if value is None else str(value))
+
+        self.rows_written += 1
+        if len(cols["date"]) >= self.row_group_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._columns["date"]:
+            return
+        batch = self._pa.RecordBatch.from_pydict(self._columns, schema=self.schema)
+        self._write_batch(batch)
+        for values in self._columns.values():
+            values.clear()
+
+    def close(self) -> None:
+        if self._writer is None:
+            return
+        self._flush()
+        self._writer.close()
+        self._writer = None
+
+
+class ParquetExporter(ColumnarExporter):
+    """Writes typed transaction columns to Parquet, one row group per batch"""
+
+    extension = ".parquet"
+    mime = "application/vnd.apache.parquet"
+
+    def _open_writer(self):
+        import pyarrow.parquet as pq
+        return pq.ParquetWriter(self.target, self.schema, compression="zstd")
+
+    def _write_batch(self, batch) -> None:
+        self._writer.write_table(self._pa.Table.from_batches([batch]),
+                                 row_group_size=self.row_group_size)
+
+
+class ArrowExporter(ColumnarExporter):
+    """Writes typed transaction columns to an Arrow IPC file, one record batch per batch"""
+
+    extension = ".arrow"
+    mime = "application/vnd.apache.arrow.file"
+
+    def _open_writer(self):
+        return self._pa.ipc.new_file(self.target, self.schema)
+
+    def _write_batch(self, batch) -> None:
+        self._writer.write_batch(batch)
+
+
+# Registered export formats
+EXPORTERS = {
+    "csv": CSVExporter,
+    "parquet": ParquetExporter,
+    "arrow": ArrowExporter,
+}
+
+
+def register_exporter(fmt: str, exporter_cls) -> None:
+    """Register an exporter class for a format name"""
+    EXPORTERS[fmt.lower()] = exporter_cls
+
+
+def get_exporter_class(fmt: str):
+    """Look up the exporter class registered for a format name"""
+    exporter_cls = EXPORTERS.get(str(fmt).lower())
+    if exporter_cls is None:
+        raise ValueError(f"Unsupported export format: {fmt}. Available: {', '.join(sorted(EXPORTERS))}")
+    return exporter_cls
+
+
+def get_exporter(fmt: str, target, bank: str, **kwargs) -> TransactionExporter:
+    """Create an exporter for the given format"""
+    return get_exporter_class(fmt)(target, bank, **kwargs)
+
+
+def export_transactions(transactions: Iterable[Dict], bank: str, fmt: str = "csv", **kwargs) -> bytes:
+    """Export transactions into an in-memory buffer and return its contents"""
+    buffer = io.BytesIO()
+    with get_exporter(fmt, buffer, bank, **kwargs) as exporter:
+        exporter.write_many(transactions)
+    return buffer.getvalue()
@@ -0,0 +1,164 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Iterator, List
+
+# Callbacks receiving (path, timings) after every instrumented parse
+_timing_hooks: List[Callable[[str, Dict], None]] = []
+
+
+def add_timing_hook(hook: Callable[[str, Dict], None]) -> Callable[[str, Dict], None]:
+    """
+    Register a callback for stage timings, e.g. to write them to a log or metrics backend
+
+    While any hook is registered every parse_statement_file call is instrumented.
+    Returns the hook so it can be used as a decorator.
+    """
+    if hook not in _timing_hooks:
+        _timing_hooks.append(hook)
+    return hook
+
+
+def remove_timing_hook(hook: Callable[[str, Dict], None]) -> None:
+    if hook in _timing_hooks:
+        _timing_hooks.remove(hook)
+
+
+def timing_hooks() -> List[Callable[[str, Dict], None]]:
+    return list(_timing_hooks)
+
+
+def emit_timings(path: str, timings: Dict) -> None:
+    """Send timings to every registered hook; a failing hook never breaks a parse"""
+    for hook in list(_timing_hooks):
+        try:
+            hook(path, timings)
+        except Exception:
+            pass
+
+
+class _Stage:
+    """Context manager adding one timed call to a stage"""
+
+    __slots__ = ("timer", "name", "wall", "cpu")
+
+    def __init__(self, timer: "StageTimer", name: str):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.timer._enter(self.name)
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+        return self
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter() - self.wall
+        cpu = time.process_time() - self.cpu
+        self.timer._exit(self.name, wall, cpu)
+        return False
+
+
+class StageTimer:
+    """
+    Accumulates wall time, CPU time, call counts and item counts per named stage
+
+    Stages may run many times (once per page) and are summed. Use as:
+
+        with timer.stage("clean_text"):
+            cleaned = parser.clean_text(page)
+        timer.count("clean_text", lines=cleaned.count("\\n") + 1)
+    """
+
+    enabled = True
+
+    def __init__(self):
+        self.stages = OrderedDict()
+        self._started = time.perf_counter()
+        self._started_cpu = time.process_time()
+
+    def _record(self, name: str) -> Dict:
+        record = self.stages.get(name)
+        if record is None:
+            record = self.stages[name] = {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0}
+        return record
+
+    def _enter(self, name: str) -> None:
+        pass
+
+    def _exit(self, name: str, wall: float, cpu: float) -> None:
+        record = self._record(name)
+        record["calls"] += 1
+        record["wall_s"] += wall
+        record["cpu_s"] += cpu
+
+    def stage(self, name: str) -> _Stage:
+        return _Stage(self, name)
+
+    def timed_iter(self, name: str, iterable: Iterable) -> Iterator:
+        """Yield from iterable, charging the time spent producing each item to a stage"""
+        iterator = iter(iterable)
+        while True:
+            with self.stage(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def count(self, name: str, **counts: int) -> None:
+        record = self._record(name)
+        for key, value in counts.items():
+            record[key] = record.get(key, 0) + value
+
+    def report(self) -> Dict:
+        """Timings block: total wall/CPU time and per-stage records, rounded for display"""
+        stages = OrderedDict()
+        for name, record in self.stages.items():
+            stages[name] = {k: round(v, 6) if isinstance(v, float) else v for k, v in record.items()}
+        return {
+            "wall_s": round(time.perf_counter() - self._started, 6),
+            "cpu_s": round(time.process_time() - self._started_cpu, 6),
+            "stages": stages,
+        }
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class NullTimer:
+    """Timer used when instrumentation is off; every method is a no-op"""
+
+    enabled = False
+    _stage = _NullStage()
+
+    def stage(self, name: str) -> _NullStage:
+        return self._stage
+
+    def timed_iter(self, name: str, iterable: Iterable) -> Iterable:
+        return iterable
+
+    def count(self, name: str, **counts: int) -> None:
+        pass
+
+    def report(self) -> Dict:
+        return {}
+
+
+NULL_TIMER = NullTimer()
+
+
+def format_timings(timings: Dict) -> str:
+    """Render a timings block as a small table"""
+    lines = [f"{'stage':22} {'calls':>6} {'wall s':>9} {'cpu s':>9}  counts"]
+    for name, record in timings.get("stages", {}).items():
+        counts = ", ".join(f"{k}={v}" for k, v in record.items() if k not in ("calls", "wall_s", "cpu_s"))
+        lines.append(f"{name:22} {record['calls']:6} {record['wall_s']:9.4f} {record['cpu_s']:9.4f}  {counts}")
+    lines.append(f"{'total':22} {'':6} {timings.get('wall_s', 0):9.4f} {timings.get('cpu_s', 0):9.4f}")
+    return "\n".join(lines)
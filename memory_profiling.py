@@ -0,0 +1,185 @@
+"""
+Per-stage memory profiling for parse_statement_file
+
+Runs a parse under tracemalloc with a StageTimer that also records, for every stage:
+the peak traced memory above what was allocated when the stage started, and the
+memory the stage left allocated (retained). The top allocation sites still alive
+at the end of the parse, and at the end of the stage that set the overall peak, are
+reported too (tracemalloc cannot snapshot the peak itself, and a stage may free
+memory before it returns).
+
+Usage:
+    python memory_profiling.py statement.pdf --top 15
+"""
+import gc
+import resource
+import sys
+import tracemalloc
+from typing import Dict, List, Tuple
+
+from instrumentation import StageTimer
+
+# A new peak snapshot is taken only when the peak exceeds the last snapshot's by this factor
+SNAPSHOT_GROWTH = 1.25
+
+
+class MemoryStageTimer(StageTimer):
+    """
+    StageTimer that also tracks tracemalloc peak and retained memory per stage
+
+    Stages may nest (export runs inside extract_transactions), so the peak seen by
+    an inner stage is folded into every enclosing stage before the peak counter
+    is reset.
+    """
+
+    def __init__(self, peak_sites: int = 0):
+        super().__init__()
+        self._open: List[List] = []     # [name, current at entry, peak since entry]
+        self.peak = 0
+        self.peak_stage = None
+        self.peak_snapshot = None
+        self._peak_sites = peak_sites
+        self._snapshot_peak = 0
+
+    def _fold_peak(self) -> int:
+        current, peak = tracemalloc.get_traced_memory()
+        for frame in self._open:
+            frame[2] = max(frame[2], peak)
+        return current
+
+    def _enter(self, name: str) -> None:
+        current = self._fold_peak()
+        tracemalloc.reset_peak()
+        self._open.append([name, current, current])
+
+    def _exit(self, name: str, wall: float, cpu: float) -> None:
+        super()._exit(name, wall, cpu)
+        current = self._fold_peak()
+        _, start, peak = self._open.pop()
+        tracemalloc.reset_peak()
+
+        record = self.stages[name]
+        record["peak_mb"] = max(record.get("peak_mb", 0.0), (peak - start) / 1e6)
+        record["retained_mb"] = record.get("retained_mb", 0.0) + (current - start) / 1e6
+
+        if peak > self.peak:
+            self.peak = peak
+            self.peak_stage = name
+            if self._peak_sites and peak > self._snapshot_peak * SNAPSHOT_GROWTH:
+                # Allocations still alive when the stage that set the peak finished.
+                # Snapshots are expensive, so only re-take one when the peak has grown.
+                self.peak_snapshot = tracemalloc.take_snapshot()
+                self._snapshot_peak = peak
+
+
+def top_sites(snapshot, limit: int, key: str = "lineno") -> List[Tuple[str, float, int]]:
+    """(location, size MB, allocation count) for the largest allocation sites"""
+    snapshot = snapshot.filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    ])
+    sites = []
+    for stat in snapshot.statistics(key)[:limit]:
+        frame = stat.traceback[0]
+        sites.append((f"{frame.filename}:{frame.lineno}", stat.size / 1e6, stat.count))
+    return sites
+
+
+def profile_parse(path: str, top: int = 10, frames: int = 1, **parse_kwargs) -> Dict:
+    """
+    Parse a statement under tracemalloc and report memory per stage
+
+    Args:
+        path: Path to PDF file
+        top: Number of allocation sites to report
+        frames: Traceback depth tracemalloc stores per allocation
+        **parse_kwargs: Passed to parse_statement_file (export_csv defaults to False)
+
+    Returns:
+        Dict with peak_mb, peak_stage, retained_mb, stages (timings plus peak_mb and
+        retained_mb per stage), retained_sites, peak_stage_sites (live when the peak
+        stage ended) and max_rss_mb
+    """
+    from statement_parser import parse_statement_file
+
+    parse_kwargs.setdefault("export_csv", False)
+
+    # Import the PDF libraries up front so their module-level allocations are not
+    # charged to the first extract_text call
+    for module in ("pdfplumber", "PyPDF2"):
+        try:
+            __import__(module)
+        except ImportError:
+            pass
+
+    gc.collect()
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start(frames)
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        timer = MemoryStageTimer(peak_sites=top)
+        result, transactions = parse_statement_file(path, timer=timer, **parse_kwargs)
+        final_peak = max(timer.peak, tracemalloc.get_traced_memory()[1])
+        retained = tracemalloc.get_traced_memory()[0] - baseline
+        retained_sites = top_sites(tracemalloc.take_snapshot(), top)
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    timings = result.get("timings", {})
+    return {
+        "file": path,
+        "bank": result.get("bank"),
+        "transactions": len(transactions),
+        "peak_mb": round((final_peak - baseline) / 1e6, 3),
+        "peak_stage": timer.peak_stage,
+        "retained_mb": round(retained / 1e6, 3),
+        "stages": timings.get("stages", {}),
+        "retained_sites": retained_sites,
+        "peak_stage_sites": top_sites(timer.peak_snapshot, top) if timer.peak_snapshot else [],
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1e6 if sys.platform == "darwin" else 1e3),
+    }
+
+
+def format_profile(profile: Dict) -> str:
+    lines = [
+        f"{profile['file']}: {profile['bank']}, {profile['transactions']} transactions",
+        f"peak traced {profile['peak_mb']:.2f}MB (during {profile['peak_stage']}), "
+        f"retained {profile['retained_mb']:.2f}MB, process max RSS {profile['max_rss_mb']:.1f}MB",
+        "",
+        f"{'stage':22} {'calls':>6} {'wall s':>9} {'peak MB':>9} {'retained MB':>12}",
+    ]
+    for name, record in profile["stages"].items():
+        lines.append(f"{name:22} {record['calls']:6} {record['wall_s']:9.4f} "
+                     f"{record.get('peak_mb', 0):9.3f} {record.get('retained_mb', 0):12.3f}")
+    for title, key in (("Top sites at peak stage end", "peak_stage_sites"), ("Top retained sites", "retained_sites")):
+        if profile[key]:
+            lines += ["", f"{title}:"]
+            lines += [f"  {size:9.3f}MB {count:8} allocs  {site}" for site, size, count in profile[key]]
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Report per-stage memory use while parsing a statement")
+    parser.add_argument("pdfs", nargs="+", help="statement pdfs")
+    parser.add_argument("--top", type=int, default=10, help="allocation sites to show (default: 10)")
+    parser.add_argument("--frames", type=int, default=1, help="traceback frames per allocation (default: 1)")
+    parser.add_argument("--json", default=None, help="write the profiles to this JSON file")
+    args = parser.parse_args()
+
+    profiles = []
+    for pdf in args.pdfs:
+        profile = profile_parse(pdf, top=args.top, frames=args.frames)
+        profiles.append(profile)
+        print(format_profile(profile))
+        print()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(profiles, f, indent=2)
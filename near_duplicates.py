@@ -0,0 +1,274 @@
+"""
+Near-duplicate statement detection with MinHash and LSH
+
+A statement re-downloaded or re-exported differs from the original in its bytes
+(timestamps, metadata), so the content hash used by TransactionStore and the result
+cache misses it. Here each statement is reduced to a MinHash signature of its
+first page: word 3-grams of the lines that carry digits (dates, amounts, account
+numbers, transaction rows). Lines without digits are the bank's boilerplate, shared
+by every statement of that bank, and are left out so that two months of the same
+account do not look alike. Documents are also scoped by bank, since two banks'
+statements can share every line that carries a digit.
+
+Signatures are split into bands and each band is hashed to a bucket (locality
+sensitive hashing); a query looks up one bucket per band and compares the signatures
+of at most max_candidates documents, so its cost does not grow with the index.
+
+    with DuplicateIndex("duplicates.db") as index:
+        match, signature, bank = index.check("statement.pdf", pdf_hash)
+        if match is None:                          # else {"key", "ref", "similarity"} of the original
+            ...                                     # parse
+            index.add(pdf_hash, signature, ref="statement.pdf", bank=bank)
+
+Usage:
+    python near_duplicates.py duplicates.db statement1.pdf statement2.pdf ...
+"""
+import hashlib
+import random
+import re
+import sqlite3
+import zlib
+from array import array
+from typing import Dict, List, Optional, Set, Tuple
+
+NUM_PERM = 128
+BANDS = 16                      # 16 bands of 8 rows: pairs above ~0.7 similarity share a bucket
+SHINGLE_WORDS = 3
+SIGNATURE_MASK = 0xFFFF         # 16-bit minhashes keep a signature at 256 bytes
+
+# Products of a coefficient and a shingle hash reduced mod 2**31 - 1 stay below 2**62,
+# so numpy can compute every permutation at once in int64 with the same results
+_PRIME = (1 << 31) - 1
+_rng = random.Random(20240601)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+_DIGIT = re.compile(r"\d")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    ref TEXT,
+    bank TEXT,
+    signature BLOB,
+    duplicate_of INTEGER REFERENCES documents(id),
+    similarity REAL
+);
+
+CREATE TABLE IF NOT EXISTS lsh_buckets (
+    bucket INTEGER NOT NULL,
+    doc_id INTEGER NOT NULL,
+    PRIMARY KEY (bucket, doc_id)
+) WITHOUT ROWID;
+"""
+
+
+def statement_shingles(text: str) -> Set[int]:
+    """Hashed word 3-grams of the lines of a page that contain digits"""
+    shingles = set()
+    for line in text.upper().splitlines():
+        if not _DIGIT.search(line):
+            continue
+        words = line.split()
+        if len(words) <= SHINGLE_WORDS:
+            shingles.add(zlib.crc32(" ".join(words).encode("utf-8")))
+            continue
+        for i in range(len(words) - SHINGLE_WORDS + 1):
+            shingles.add(zlib.crc32(" ".join(words[i:i + SHINGLE_WORDS]).encode("utf-8")))
+    return shingles
+
+
+def minhash(shingles: Set[int]) -> Optional[array]:
+    """NUM_PERM 16-bit minhashes of a shingle set, or None when it is empty"""
+    if not shingles:
+        return None
+    try:
+        import numpy as np
+    except ImportError:
+        values = [x % _PRIME for x in shingles]
+        return array("H", [min([(a * x + b) % _PRIME for x in values]) & SIGNATURE_MASK
+                           for a, b in _PERMUTATIONS])
+    values = np.fromiter(shingles, dtype=np.int64, count=len(shingles)) % _PRIME
+    coefficients = np.array(_PERMUTATIONS, dtype=np.int64)
+    hashed = (np.outer(coefficients[:, 0], values) + coefficients[:, 1:]) % _PRIME
+    return array("H", (hashed.min(axis=1) & SIGNATURE_MASK).astype(np.uint16).tobytes())
+
+
+def similarity(a: array, b: array) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures"""
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+def _buckets(signature: array, bank: Optional[str]) -> List[int]:
+    rows = NUM_PERM // BANDS
+    salt = (bank or "").encode("utf-8")[:16]
+    buckets = []
+    for band in range(BANDS):
+        digest = hashlib.blake2b(signature[band * rows:(band + 1) * rows].tobytes(), digest_size=8,
+                                 salt=salt, person=band.to_bytes(2, "little")).digest()
+        buckets.append(int.from_bytes(digest, "little", signed=True))
+    return buckets
+
+
+def first_page(path: str) -> Tuple[str, str]:
+    """(text, detected bank) of the first page with text, without extracting the rest of the PDF"""
+    from statement_parser import detect_bank, iter_pdf_pages
+
+    text = ""
+    pages = iter_pdf_pages(path)
+    try:
+        for _, _, page_text in pages:
+            if page_text:
+                text = page_text
+                break
+    finally:
+        pages.close()
+    return text, detect_bank(text + "\n") if text else "UNKNOWN"
+
+
+class DuplicateIndex:
+    """
+    SQLite-backed MinHash/LSH index of processed statements
+
+    Documents are keyed by the PDF content hash (the key TransactionStore and the
+    result cache use), with an optional ref such as the source path. Near-duplicates
+    are recorded with link() against the original instead of being indexed
+    themselves, so the index only grows with distinct statements.
+    """
+
+    def __init__(self, path: str = "duplicates.db", threshold: float = 0.8, max_candidates: int = 32):
+        """
+        Args:
+            path: SQLite database file (may be the TransactionStore database)
+            threshold: Estimated similarity at or above which a statement is a near-duplicate
+            max_candidates: Indexed documents compared per query
+        """
+        self.path = path
+        self.threshold = threshold
+        self.max_candidates = max_candidates
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @staticmethod
+    def signature(text: str) -> Optional[array]:
+        """Signature of a statement's first-page text (None when it has no digit lines)"""
+        return minhash(statement_shingles(text))
+
+    def lookup(self, key: str) -> Optional[Dict]:
+        """Original document for a key already seen: itself, or what it was linked to"""
+        row = self.conn.execute(
+            "SELECT COALESCE(o.key, d.key), COALESCE(o.ref, d.ref), d.similarity FROM documents d "
+            "LEFT JOIN documents o ON o.id = d.duplicate_of WHERE d.key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return {"key": row[0], "ref": row[1], "similarity": row[2] if row[2] is not None else 1.0}
+
+    def query(self, signature: Optional[array], bank: Optional[str] = None) -> Optional[Dict]:
+        """Most similar indexed document of the same bank at or above the threshold, as {"key", "ref", "similarity"}"""
+        if signature is None:
+            return None
+        buckets = _buckets(signature, bank)
+        rows = self.conn.execute(
+            "SELECT d.key, d.ref, d.signature FROM documents d WHERE d.bank IS ? AND d.id IN "
+            f"(SELECT DISTINCT doc_id FROM lsh_buckets WHERE bucket IN ({', '.join('?' * len(buckets))}) LIMIT ?)",
+            [bank] + buckets + [self.max_candidates])
+        best = None
+        for key, ref, blob in rows:
+            score = similarity(signature, array("H", blob))
+            if score >= self.threshold and (best is None or score > best["similarity"]):
+                best = {"key": key, "ref": ref, "similarity": score}
+        return best
+
+    def add(self, key: str, signature: Optional[array], ref: Optional[str] = None,
+            bank: Optional[str] = None) -> None:
+        """Index a processed statement; re-adding a key replaces its signature"""
+        with self.conn:
+            row = self.conn.execute("SELECT id FROM documents WHERE key = ?", (key,)).fetchone()
+            blob = signature.tobytes() if signature is not None else None
+            if row:
+                doc_id = row[0]
+                self.conn.execute("DELETE FROM lsh_buckets WHERE doc_id = ?", (doc_id,))
+                self.conn.execute("UPDATE documents SET ref = ?, bank = ?, signature = ?, duplicate_of = NULL, "
+                                  "similarity = NULL WHERE id = ?", (ref, bank, blob, doc_id))
+            else:
+                doc_id = self.conn.execute("INSERT INTO documents (key, ref, bank, signature) VALUES (?, ?, ?, ?)",
+                                           (key, ref, bank, blob)).lastrowid
+            if signature is not None:
+                self.conn.executemany("INSERT OR IGNORE INTO lsh_buckets (bucket, doc_id) VALUES (?, ?)",
+                                      [(bucket, doc_id) for bucket in _buckets(signature, bank)])
+
+    def link(self, key: str, original_key: str, score: float, ref: Optional[str] = None) -> None:
+        """Record key as a near-duplicate of an indexed document"""
+        with self.conn:
+            row = self.conn.execute("SELECT id FROM documents WHERE key = ?", (original_key,)).fetchone()
+            if row is None:
+                raise KeyError(original_key)
+            self.conn.execute(
+                "INSERT INTO documents (key, ref, duplicate_of, similarity) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET ref = excluded.ref, signature = NULL, "
+                "duplicate_of = excluded.duplicate_of, similarity = excluded.similarity",
+                (key, ref, row[0], score))
+
+    def check(self, path: str, key: Optional[str] = None) -> Tuple[Optional[Dict], Optional[array], str]:
+        """
+        Look a PDF up in the index, reading only its first page
+
+        Args:
+            path: PDF path
+            key: The PDF's content hash, so a statement never matches itself
+
+        Returns:
+            (match, signature, bank): match is {"key", "ref", "similarity"} of the
+            original or None; signature and bank are what add() needs once the
+            statement has been processed
+        """
+        text, bank = first_page(path)
+        signature = self.signature(text)
+        match = self.query(signature, bank)
+        if match is not None and match["key"] == key:
+            match = None
+        return match, signature, bank
+
+    def stats(self) -> Dict:
+        documents, duplicates = self.conn.execute(
+            "SELECT COUNT(*), COUNT(duplicate_of) FROM documents").fetchone()
+        return {"documents": documents, "duplicates": duplicates,
+                "buckets": self.conn.execute("SELECT COUNT(*) FROM lsh_buckets").fetchone()[0]}
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    from transaction_utils import file_sha256
+
+    parser = argparse.ArgumentParser(description="Flag near-duplicate statements against an index")
+    parser.add_argument("db", help="index database")
+    parser.add_argument("pdfs", nargs="+", help="statement pdfs; new statements are added to the index")
+    parser.add_argument("--threshold", type=float, default=0.8, help="similarity threshold (default: 0.8)")
+    args = parser.parse_args()
+
+    with DuplicateIndex(args.db, threshold=args.threshold) as index:
+        for pdf in args.pdfs:
+            key = file_sha256(pdf)
+            match, signature, bank = index.check(pdf, key)
+            if match is not None:
+                index.link(key, match["key"], match["similarity"], ref=pdf)
+                print(json.dumps({"file": pdf, "duplicate_of": match["ref"] or match["key"],
+                                  "similarity": match["similarity"]}))
+            else:
+                index.add(key, signature, ref=pdf, bank=bank)
+                print(json.dumps({"file": pdf, "duplicate_of": None}))
+        print(json.dumps(index.stats()))
@@ -0,0 +1,134 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class _Flight:
+    """A computation in progress that other callers can wait on"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+    def done(self) -> bool:
+        return self.event.is_set()
+
+    def result(self) -> Any:
+        """Block until the computation finishes; return its value or raise its error"""
+        self.event.wait()
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+class ParseCache:
+    """
+    Thread-safe LRU cache with TTL expiry and single-flight computation
+
+    Concurrent get_or_compute calls for the same key run the computation once;
+    the other callers block until it finishes and share its result (or exception).
+    Failed computations are not cached. claim() and finish() split get_or_compute
+    for callers that compute several keys together (e.g. in a process pool).
+    """
+
+    def __init__(self, max_entries: int = 64, ttl: Optional[float] = 3600,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            max_entries: Maximum cached results before least-recently-used eviction
+            ttl: Seconds an entry stays valid (None for no expiry)
+            clock: Time source, injectable for testing
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = OrderedDict()   # key -> (expires_at, value)
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, key: Hashable):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and self.clock() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._lookup(key)
+        return entry[1] if entry else default
+
+    def put(self, key: Hashable, value: Any) -> None:
+        expires_at = self.clock() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def claim(self, key: Hashable) -> Optional[_Flight]:
+        """
+        Claim the computation of key unless it is cached or already being computed
+
+        Returns None when the caller must compute the value and pass it (or the
+        error) to finish(). Otherwise returns a flight whose result() is the cached
+        value, or the value another caller is computing.
+        """
+        with self._lock:
+            entry = self._lookup(key)
+            if entry:
+                self.hits += 1
+                flight = _Flight()
+                flight.value = entry[1]
+                flight.event.set()
+                return flight
+
+            self.misses += 1
+            flight = self._inflight.get(key)
+            if flight is None:
+                self._inflight[key] = _Flight()
+            return flight
+
+    def finish(self, key: Hashable, value: Any = None, error: Optional[BaseException] = None) -> None:
+        """Complete a claimed computation, caching value unless it failed, and wake its waiters"""
+        if error is None:
+            self.put(key, value)
+        with self._lock:
+            flight = self._inflight.pop(key)
+        flight.value = value
+        flight.error = error
+        flight.event.set()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for key, computing it at most once across threads"""
+        flight = self.claim(key)
+        if flight is not None:
+            return flight.result()
+
+        try:
+            value = compute()
+        except BaseException as e:
+            self.finish(key, error=e)
+            raise
+        self.finish(key, value)
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
@@ -1,5 +1,5 @@
 import re
-from typing import List, Dict, Optional, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 
 class AMEXParser:
@@ -68,9 +68,17 @@ class AMEXParser:
                 pass
         return None
 
-    def extract_transactions(self, text: str) -> List[Dict]:
-        """Extract transaction details from AMEX statement"""
+    def extract_transactions(self, text: str, sink: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+        """Extract transaction details from AMEX statement, passing each one to sink as it is found"""
         transactions = []
+        for tx in self.iter_transactions(text):
+            transactions.append(tx)
+            if sink:
+                sink(tx)
+        return transactions
+
+    def iter_transactions(self, text: str) -> Iterator[Dict]:
+        """Yield transaction details from AMEX statement one line at a time"""
         lines = text.split('\n')
 
         for line in lines:
@@ -102,17 +110,17 @@ class AMEXParser:
                     amount_str = match.group(3).replace(',', '').replace('$', '')
                     amount = float(amount_str)
 
-                    transactions.append({
+                    tx = {
                         'Date': date_str,
                         'Description': description,
                         'Amount': round(amount, 2),
                         'Type': 'DEBIT'  # AMEX typically shows all as debits
-                    })
+                    }
 
                 except (ValueError, IndexError):
                     continue
 
-        return transactions
+                yield tx
 
     def calculate_summary(self, transactions: List[Dict]) -> Dict:
         """Calculate transaction summary"""
@@ -123,21 +131,19 @@ class AMEXParser:
             'Total Amount': round(total_amount, 2)
         }
 
-    def parse(self, text: str) -> Tuple[Dict, List[Dict]]:
+    def extract_summary(self, text: str, transactions: List[Dict]) -> Dict:
         """
-        Main parsing function for AMEX statements
+        Extract summary fields from cleaned statement text
 
         Args:
-            text: Extracted text from PDF
+            text: Text already passed through clean_text
+            transactions: Transactions extracted from the same text
 
         Returns:
-            Tuple of (summary_dict, transactions_list)
+            Summary dict
         """
         data = {}
 
-        # Clean the text first
-        text = self.clean_text(text)
-
         # Detect bank
         bank = self.detect_bank(text)
         data['Bank'] = bank
@@ -177,8 +183,6 @@ class AMEXParser:
         if new_charges is not None:
             data['New Charges'] = new_charges
 
-        # Extract transactions
-        transactions = self.extract_transactions(text)
         data['Transactions Count'] = len(transactions)
 
         # Calculate summary
@@ -186,4 +190,24 @@ class AMEXParser:
             summary = self.calculate_summary(transactions)
             data.update(summary)
 
-        return data, transactions
\ No newline at end of file
+        return data
+
+    def parse(self, text: str, sink: Optional[Callable[[Dict], None]] = None) -> Tuple[Dict, List[Dict]]:
+        """
+        Main parsing function for AMEX statements
+
+        Args:
+            text: Extracted text from PDF
+            sink: Optional callable receiving each transaction as it is parsed
+
+        Returns:
+            Tuple of (summary_dict, transactions_list)
+        """
+        # Clean the text first
+        text = self.clean_text(text)
+
+        # Extract transactions, then the summary fields that depend on them
+        transactions = self.extract_transactions(text, sink)
+        data = self.extract_summary(text, transactions)
+
+        return data, transactions
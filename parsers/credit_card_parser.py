@@ -1,5 +1,5 @@
 import re
-from typing import List, Dict, Optional, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 
 class CreditCardParser:
@@ -12,7 +12,8 @@ class CreditCardParser:
                 r'(ICICI\s+Bank|Axis\s+Bank)',
             ],
             'card_name': [
-                r'Card\s+([A-Za-z\s]+?)\s*\(',
+                # Within one line: the letterhead's "Credit Card Statement" sits just above
+                r'Card\s+([A-Za-z ]+?)\s*\(',
                 r'Card\s+Name\s*:\s*([A-Za-z\s]+?)(?=\n|Card)',
             ],
             'card_last4': [
@@ -94,9 +95,17 @@ class CreditCardParser:
                 pass
         return None
 
-    def extract_transactions(self, text: str) -> List[Dict]:
-        """Extract transaction details from the statement"""
+    def extract_transactions(self, text: str, sink: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+        """Extract transaction details from the statement, passing each one to sink as it is found"""
         transactions = []
+        for tx in self.iter_transactions(text):
+            transactions.append(tx)
+            if sink:
+                sink(tx)
+        return transactions
+
+    def iter_transactions(self, text: str) -> Iterator[Dict]:
+        """Yield transaction details from the statement one line at a time"""
         lines = text.split('\n')
 
         # Transaction line pattern: Date Type Description Debit(INR) Credit(INR)
@@ -110,8 +119,9 @@ class CreditCardParser:
             if not line or len(line) < 15:
                 continue
 
-            # Skip common headers and footers
-            skip_keywords = ['Date', 'Type', 'Description', 'Debit', 'Credit',
+            # Skip common headers and footers. The column header is caught by Date/Type/Description;
+            # Debit and Credit are not skip words since every transaction line carries one
+            skip_keywords = ['Date', 'Type', 'Description',
                              'EMI', 'interest', 'page', 'statement', 'synthetic',
                              'testing', 'detailed transactions', 'account summary']
 
@@ -129,17 +139,17 @@ class CreditCardParser:
                     amount_str = match.group(4).replace(',', '')
                     amount = float(amount_str)
 
-                    transactions.append({
+                    tx = {
                         'Date': date_str,
                         'Type': txn_type,
                         'Description': description,
                         'Amount': round(amount, 2)
-                    })
+                    }
 
                 except (ValueError, IndexError):
                     continue
 
-        return transactions
+                yield tx
 
     def calculate_summary(self, transactions: List[Dict]) -> Dict:
         """Calculate transaction summary"""
@@ -152,21 +162,19 @@ class CreditCardParser:
             'Transaction Count': len(transactions)
         }
 
-    def parse(self, text: str) -> Tuple[Dict, List[Dict]]:
+    def extract_summary(self, text: str, transactions: List[Dict]) -> Dict:
         """
-        Main parsing function for credit card statements
+        Extract summary fields from cleaned statement text
 
         Args:
-            text: Extracted text from PDF
+            text: Text already passed through clean_text
+            transactions: Transactions extracted from the same text
 
         Returns:
-            Tuple of (summary_dict, transactions_list)
+            Summary dict
         """
         data = {}
 
-        # Clean the text first
-        text = self.clean_text(text)
-
         # Detect bank
         bank = self.detect_bank(text)
         data['Bank'] = bank
@@ -213,8 +221,6 @@ class CreditCardParser:
         if stmt_balance is not None:
             data['Statement Balance'] = stmt_balance
 
-        # Extract transactions
-        transactions = self.extract_transactions(text)
         data['Transactions Count'] = len(transactions)
 
         # Calculate summary
@@ -222,4 +228,24 @@ class CreditCardParser:
             summary = self.calculate_summary(transactions)
             data.update(summary)
 
-        return data, transactions
\ No newline at end of file
+        return data
+
+    def parse(self, text: str, sink: Optional[Callable[[Dict], None]] = None) -> Tuple[Dict, List[Dict]]:
+        """
+        Main parsing function for credit card statements
+
+        Args:
+            text: Extracted text from PDF
+            sink: Optional callable receiving each transaction as it is parsed
+
+        Returns:
+            Tuple of (summary_dict, transactions_list)
+        """
+        # Clean the text first
+        text = self.clean_text(text)
+
+        # Extract transactions, then the summary fields that depend on them
+        transactions = self.extract_transactions(text, sink)
+        data = self.extract_summary(text, transactions)
+
+        return data, transactions
@@ -1,5 +1,5 @@
 import re
-from typing import List, Dict, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 
 class HDFCParser:
@@ -19,20 +19,58 @@ class HDFCParser:
         except:
             return 0.0
 
-    def parse(self, text: str) -> Tuple[Dict, List[Dict]]:
+    def clean_text(self, text: str) -> str:
+        """Replace non-breaking spaces left by the PDF extractor"""
+        return text.replace('\xa0', ' ')
+
+    def extract_transactions(self, text: str, sink: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+        """Extract transaction details from the statement, passing each one to sink as it is found"""
+        transactions = []
+        for tx in self.iter_transactions(text):
+            transactions.append(tx)
+            if sink:
+                sink(tx)
+        return transactions
+
+    def iter_transactions(self, text: str) -> Iterator[Dict]:
+        """Yield transaction details from the statement one line at a time"""
+        lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
+
+        # Transaction pattern: Date Description Amount [Cr]
+        tx_pattern = re.compile(
+            r'^(\d{2}/\d{2}/\d{4})\s+(.+?)\s+([\d,]+\.[\d]{2})\s*(Cr)?$',
+            re.IGNORECASE
+        )
+
+        for ln in lines:
+            m = tx_pattern.match(ln)
+            if m:
+                date = m.group(1)
+                desc = m.group(2).strip()
+                amount_str = m.group(3)
+                is_credit = m.group(4) is not None
+
+                amt = self.parse_amount(amount_str)
+
+                yield {
+                    "Date": date,
+                    "Description": re.sub(r'\s+', ' ', desc).strip(),
+                    "Amount": amt,
+                    "Type": "CR" if is_credit else "DR"
+                }
+
+    def extract_summary(self, t: str, transactions: List[Dict]) -> Dict:
         """
-        Parse HDFC credit card statement
+        Extract summary fields from cleaned statement text
 
         Args:
-            text: Extracted text from PDF
+            t: Text already passed through clean_text
+            transactions: Transactions extracted from the same text (unused for HDFC)
 
         Returns:
-            Tuple of (summary_dict, transactions_list)
+            Summary dict
         """
         data = {}
-        transactions = []
-
-        t = text.replace('\xa0', ' ')
 
         # CARD HOLDER NAME
         m = re.search(r'(?:Name|Ca:rd|rdNIKHIL|HN DFa.*?)(NIKHIL KHANDELWAL|[A-Z][A-Z\s]{5,})', t)
@@ -93,31 +131,24 @@ class HDFCParser:
         if m:
             data['Minimum Amount Due'] = m.group(1).replace(',', '')
 
-        # TRANSACTIONS
-        lines = [ln.strip() for ln in t.splitlines() if ln.strip()]
+        return data
 
-        # Transaction pattern: Date Description Amount [Cr]
-        tx_pattern = re.compile(
-            r'^(\d{2}/\d{2}/\d{4})\s+(.+?)\s+([\d,]+\.[\d]{2})\s*(Cr)?$',
-            re.IGNORECASE
-        )
+    def parse(self, text: str, sink: Optional[Callable[[Dict], None]] = None) -> Tuple[Dict, List[Dict]]:
+        """
+        Parse HDFC credit card statement
 
-        for ln in lines:
-            m = tx_pattern.match(ln)
-            if m:
-                date = m.group(1)
-                desc = m.group(2).strip()
-                amount_str = m.group(3)
-                is_credit = m.group(4) is not None
+        Args:
+            text: Extracted text from PDF
+            sink: Optional callable receiving each transaction as it is parsed
 
-                amt = self.parse_amount(amount_str)
+        Returns:
+            Tuple of (summary_dict, transactions_list)
+        """
+        t = self.clean_text(text)
 
-                tx = {
-                    "Date": date,
-                    "Description": re.sub(r'\s+', ' ', desc).strip(),
-                    "Amount": amt,
-                    "Type": "CR" if is_credit else "DR"
-                }
-                transactions.append(tx)
+        # TRANSACTIONS
+        transactions = self.extract_transactions(t, sink)
+
+        data = self.extract_summary(t, transactions)
 
-        return data, transactions
\ No newline at end of file
+        return data, transactions
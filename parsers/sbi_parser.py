@@ -1,5 +1,5 @@
 import re
-from typing import List, Dict, Optional, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 
 class SBIParser:
@@ -100,9 +100,17 @@ class SBIParser:
                     continue
         return None
 
-    def extract_transactions(self, text: str) -> List[Dict]:
-        """Extract transaction details from the statement"""
+    def extract_transactions(self, text: str, sink: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+        """Extract transaction details from the statement, passing each one to sink as it is found"""
         transactions = []
+        for tx in self.iter_transactions(text):
+            transactions.append(tx)
+            if sink:
+                sink(tx)
+        return transactions
+
+    def iter_transactions(self, text: str) -> Iterator[Dict]:
+        """Yield transaction details from the statement one line at a time"""
         lines = text.split('\n')
 
         # Month pattern for date matching
@@ -222,20 +230,20 @@ class SBIParser:
                         # Only one amount - likely just balance, skip
                         continue
 
-                    # Add transaction
-                    transactions.append({
+                    # Build transaction
+                    tx = {
                         'Date': date_str,
                         'Description': description[:100],
                         'Type': txn_type,
                         'Amount': round(txn_amount, 2),
                         'Balance': round(balance, 2)
-                    })
+                    }
 
                 except Exception as e:
                     # Skip problematic lines
                     continue
 
-        return transactions
+                yield tx
 
     def calculate_summary(self, transactions: List[Dict], opening_balance: Optional[float]) -> Dict:
         """Calculate transaction summary"""
@@ -254,21 +262,19 @@ class SBIParser:
             'Closing Balance': round(closing_balance, 2)
         }
 
-    def parse(self, text: str) -> Tuple[Dict, List[Dict]]:
+    def extract_summary(self, text: str, transactions: List[Dict]) -> Dict:
         """
-        Main parsing function for SBI statements
+        Extract summary fields from cleaned statement text
 
         Args:
-            text: Extracted text from PDF
+            text: Text already passed through clean_text
+            transactions: Transactions extracted from the same text
 
         Returns:
-            Tuple of (summary_dict, transactions_list)
+            Summary dict
         """
         data = {}
 
-        # Clean the text first
-        text = self.clean_text(text)
-
         # Extract key data points
         account_number = self.extract_account_number(text)
         account_holder = self.extract_account_holder(text)
@@ -288,12 +294,29 @@ class SBIParser:
         if opening_balance is not None:
             data['Opening Balance'] = opening_balance
 
-        # Extract transactions
-        transactions = self.extract_transactions(text)
-
         # Calculate summary
         if transactions or opening_balance is not None:
             summary = self.calculate_summary(transactions, opening_balance)
             data.update(summary)
 
-        return data, transactions
\ No newline at end of file
+        return data
+
+    def parse(self, text: str, sink: Optional[Callable[[Dict], None]] = None) -> Tuple[Dict, List[Dict]]:
+        """
+        Main parsing function for SBI statements
+
+        Args:
+            text: Extracted text from PDF
+            sink: Optional callable receiving each transaction as it is parsed
+
+        Returns:
+            Tuple of (summary_dict, transactions_list)
+        """
+        # Clean the text first
+        text = self.clean_text(text)
+
+        # Extract transactions, then the summary fields that depend on them
+        transactions = self.extract_transactions(text, sink)
+        data = self.extract_summary(text, transactions)
+
+        return data, transactions
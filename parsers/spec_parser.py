@@ -0,0 +1,412 @@
+import json
+import re
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from parsers.specs import SPECS
+
+FLAGS = {"I": re.IGNORECASE, "S": re.DOTALL, "M": re.MULTILINE, "X": re.VERBOSE}
+
+CID_RE = re.compile(r'\(cid:\d+\)')
+SPACES_RE = re.compile(r'[ \t]+')
+WS_RE = re.compile(r'\s+')
+TITLE_RE = re.compile(r'^(Mr\.?|Mrs\.?|Ms\.?|Dr\.?)\s+', re.IGNORECASE)
+
+# String transforms available to summary and transaction fields
+TRANSFORMS = {
+    "strip": str.strip,
+    "upper": str.upper,
+    "collapse_ws": lambda s: WS_RE.sub(' ', s),
+    "remove_commas": lambda s: s.replace(',', ''),
+    "remove_cid": lambda s: CID_RE.sub('', s),
+    "strip_title": lambda s: TITLE_RE.sub('', s),
+}
+
+# Text clean-up steps run before transactions and summary are extracted
+CLEAN_STEPS = {
+    "nbsp": lambda text: text.replace('\xa0', ' '),
+    "cid": lambda text: CID_RE.sub('', text),
+    # [ \t]+ never spans a newline, so collapsing the whole text at once equals doing it per line
+    "collapse_spaces": lambda text: '\n'.join(line.strip() for line in SPACES_RE.sub(' ', text).split('\n')),
+}
+
+
+def _flags(value: str) -> int:
+    flags = 0
+    for letter in value or "":
+        flags |= FLAGS[letter]
+    return flags
+
+
+def _compile(pattern, default_flags: str = "") -> re.Pattern:
+    """Compile a spec pattern given as a string or {"regex", "flags"}"""
+    if isinstance(pattern, str):
+        return re.compile(pattern, _flags(default_flags))
+    return re.compile(pattern["regex"], _flags(pattern.get("flags", default_flags)))
+
+
+def _chain(names: List[str]) -> Callable[[str], str]:
+    funcs = [TRANSFORMS[name] for name in names or []]
+    if not funcs:
+        return lambda s: s
+    if len(funcs) == 1:
+        return funcs[0]
+
+    def apply(s: str) -> str:
+        for func in funcs:
+            s = func(s)
+        return s
+    return apply
+
+
+def _to_amount(s: str) -> float:
+    return float(s.replace(',', '').replace('₹', '').replace('$', '').strip())
+
+
+class _SummaryField:
+    """A summary entry extracted with an ordered list of patterns"""
+
+    def __init__(self, entry: Dict):
+        self.key = entry["key"]
+        self.first_match = entry.get("first_match", True)
+        self.groups = entry.get("groups", [1])
+        self.join = entry.get("join", " ")
+        self.amount = entry.get("type") == "amount"
+        self.format = entry.get("format")
+
+        flags = entry.get("flags", "")
+        self.patterns = []
+        for pattern in entry["patterns"]:
+            options = pattern if isinstance(pattern, dict) else {}
+            self.patterns.append((
+                _compile(pattern, flags),
+                _chain(options.get("transforms", entry.get("transforms"))),
+                options.get("min_length", entry.get("min_length", 0)),
+            ))
+
+    def extract(self, text: str):
+        """Value of the first pattern that matches, or None"""
+        for pattern, transform, min_length in self.patterns:
+            m = pattern.search(text)
+            if not m:
+                continue
+            value = self.join.join(transform(m.group(g)) for g in self.groups)
+            valid = bool(value) and len(value) >= min_length
+            if valid and self.amount:
+                try:
+                    value = _to_amount(value)
+                except ValueError:
+                    valid = False
+            if valid:
+                return self.format.format(value) if self.format else value
+            if self.first_match:
+                return None
+        return None
+
+
+class SpecParser:
+    """
+    Parser compiled from a declarative layout spec (see parsers/specs.py)
+
+    All patterns are compiled once. Transaction lines are checked against the anchored
+    line pattern first and only matching lines are tested against the skip keywords,
+    which are combined into a single regex run on the lower-cased line.
+    """
+
+    def __init__(self, spec: Dict):
+        self.spec = spec
+        self.bank = spec["bank"]
+        self._clean_steps = [CLEAN_STEPS[step] for step in spec.get("clean", [])]
+
+        rules = spec["transactions"]
+        self._splitlines = rules.get("split") == "splitlines"
+        self._min_length = rules.get("min_length", 0)
+        self._skip = None
+        if rules.get("skip"):
+            insensitive = rules.get("skip_case", "insensitive") == "insensitive"
+            keywords = [k.lower() if insensitive else k for k in rules["skip"]]
+            self._skip = re.compile("|".join(re.escape(k) for k in keywords)).search
+            self._skip_lower = insensitive
+
+        if rules.get("builder") == "amount_columns":
+            self._iter_lines = self._iter_amount_columns
+            self._date_patterns = [_compile(p).match for p in rules["date_patterns"]]
+            self._column_split = re.compile(rules["column_split"]).split
+            self._amount_match = re.compile(rules["amount_pattern"]).match
+            self._amount_strip = rules.get("amount_strip", [])
+            self._description_max = rules.get("description_max")
+            self._default_description = rules.get("default_description", "")
+            self._debit, self._credit = rules["debit"], rules["credit"]
+            self._debit_keywords = rules.get("debit_keywords", [])
+            self._credit_keywords = rules.get("credit_keywords", [])
+        else:
+            self._iter_lines = self._iter_pattern
+            self._line_match = _compile(rules["pattern"], rules.get("flags", "")).match
+            self._fields = [self._field_getter(f) for f in rules["fields"]]
+
+        self._summary = []
+        for entry in spec.get("summary", []):
+            if "compute" in entry:
+                self._summary.append(("compute", entry))
+            else:
+                self._summary.append(("field", _SummaryField(entry)))
+
+    @staticmethod
+    def _field_getter(field: Dict) -> Tuple[str, Callable]:
+        name = field["name"]
+        if "value" in field:
+            value = field["value"]
+            return name, lambda m: value
+        group = field["group"]
+        if "present" in field:
+            present, absent = field["present"], field.get("absent")
+            return name, lambda m: present if m.group(group) is not None else absent
+        transform = _chain(field.get("transforms"))
+        if field.get("type") == "amount":
+            digits = field.get("round")
+            if digits is None:
+                return name, lambda m: _to_amount(transform(m.group(group)))
+            return name, lambda m: round(_to_amount(transform(m.group(group))), digits)
+        return name, lambda m: transform(m.group(group))
+
+    def clean_text(self, text: str) -> str:
+        """Apply the spec's clean-up steps"""
+        for step in self._clean_steps:
+            text = step(text)
+        return text
+
+    def _lines(self, text: str) -> Iterator[str]:
+        """Stripped candidate lines: non-empty and at least min_length long"""
+        min_length = self._min_length
+        for line in (text.splitlines() if self._splitlines else text.split('\n')):
+            line = line.strip()
+            if line and len(line) >= min_length:
+                yield line
+
+    def _skipped(self, line: str) -> bool:
+        if self._skip is None:
+            return False
+        return self._skip(line.lower() if self._skip_lower else line) is not None
+
+    def _iter_pattern(self, text: str) -> Iterator[Dict]:
+        match = self._line_match
+        fields = self._fields
+        for line in self._lines(text):
+            m = match(line)
+            if m is None or self._skipped(line):
+                continue
+            try:
+                tx = {name: get(m) for name, get in fields}
+            except (ValueError, IndexError):
+                continue
+            yield tx
+
+    def _iter_amount_columns(self, text: str) -> Iterator[Dict]:
+        """Date, free-text description, then amount columns ending with the balance"""
+        for line in self._lines(text):
+            date_match = None
+            for match in self._date_patterns:
+                date_match = match(line)
+                if date_match:
+                    break
+            if date_match is None or self._skipped(line):
+                continue
+
+            try:
+                tx = self._amount_columns_row(line, date_match)
+            except Exception:
+                continue
+            if tx is not None:
+                yield tx
+
+    def _amount_columns_row(self, line: str, date_match) -> Optional[Dict]:
+        date_str = date_match.group(1).strip()
+        remaining = line[len(date_str):].strip()
+
+        parts = self._column_split(remaining)
+        if len(parts) < 2:
+            parts = remaining.split()
+
+        amounts = []
+        description_parts = []
+        found_first_amount = False
+        for part in parts:
+            cleaned = part
+            for token in self._amount_strip:
+                cleaned = cleaned.replace(token, '')
+            cleaned = cleaned.strip()
+            if self._amount_match(cleaned):
+                amount = float(cleaned)
+                if amount > 0:
+                    amounts.append(amount)
+                    found_first_amount = True
+            elif not found_first_amount:
+                description_parts.append(part)
+
+        if not amounts:
+            return None
+
+        description = ' '.join(description_parts).strip()
+        if not description:
+            description = self._default_description
+
+        if len(amounts) >= 3:
+            withdrawal, deposit, balance = amounts[0], amounts[1], amounts[2]
+            if withdrawal > 0 and deposit == 0:
+                txn_type, txn_amount = self._debit, withdrawal
+            elif deposit > 0 and withdrawal == 0:
+                txn_type, txn_amount = self._credit, deposit
+            else:
+                txn_type = self._debit if withdrawal > deposit else self._credit
+                txn_amount = withdrawal if withdrawal > deposit else deposit
+        elif len(amounts) == 2:
+            txn_amount, balance = amounts[0], amounts[1]
+            desc_upper = description.upper()
+            if any(kw in desc_upper for kw in self._debit_keywords):
+                txn_type = self._debit
+            elif any(kw in desc_upper for kw in self._credit_keywords):
+                txn_type = self._credit
+            else:
+                txn_type = self._debit
+        else:
+            return None
+
+        return {
+            'Date': date_str,
+            'Description': description[:self._description_max],
+            'Type': txn_type,
+            'Amount': round(txn_amount, 2),
+            'Balance': round(balance, 2),
+        }
+
+    def iter_transactions(self, text: str) -> Iterator[Dict]:
+        """Yield transactions from cleaned text one line at a time"""
+        return self._iter_lines(text)
+
+    def extract_transactions(self, text: str, sink: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+        """Extract transaction details from the statement, passing each one to sink as it is found"""
+        transactions = []
+        for tx in self.iter_transactions(text):
+            transactions.append(tx)
+            if sink:
+                sink(tx)
+        return transactions
+
+    def _compute(self, entry: Dict, text: str, transactions: List[Dict], data: Dict):
+        op = entry["compute"]
+        if op == "count":
+            return len(transactions)
+        if op == "sum":
+            wanted = entry.get("type")
+            return round(sum(t['Amount'] for t in transactions if wanted is None or t['Type'] == wanted), 2)
+        if op == "net":
+            credits = sum(t['Amount'] for t in transactions if t['Type'] == entry["credit"])
+            debits = sum(t['Amount'] for t in transactions if t['Type'] == entry["debit"])
+            return round(credits - debits, 2)
+        if op == "last":
+            if transactions:
+                return round(transactions[-1][entry["field"]], 2)
+            fallback = data.get(entry.get("fallback"))
+            return round(fallback if fallback is not None else entry.get("default", 0.0), 2)
+        if op == "contains":
+            for needle, value in entry["choices"]:
+                if needle in text:
+                    return value
+            return entry.get("default")
+        raise ValueError(f"Unknown summary computation: {op}")
+
+    def extract_summary(self, text: str, transactions: List[Dict]) -> Dict:
+        """
+        Extract summary fields from cleaned statement text
+
+        Args:
+            text: Text already passed through clean_text
+            transactions: Transactions extracted from the same text
+
+        Returns:
+            Summary dict
+        """
+        data = {}
+        for kind, entry in self._summary:
+            if kind == "field":
+                value = entry.extract(text)
+                if value is not None:
+                    data[entry.key] = value
+                continue
+
+            when = entry.get("when")
+            if when and not any(bool(transactions) if cond == "transactions" else cond in data for cond in when):
+                continue
+            data[entry["key"]] = self._compute(entry, text, transactions, data)
+        return data
+
+    def parse(self, text: str, sink: Optional[Callable[[Dict], None]] = None) -> Tuple[Dict, List[Dict]]:
+        """
+        Parse a statement described by this parser's spec
+
+        Args:
+            text: Extracted text from PDF
+            sink: Optional callable receiving each transaction as it is parsed
+
+        Returns:
+            Tuple of (summary_dict, transactions_list)
+        """
+        text = self.clean_text(text)
+        transactions = self.extract_transactions(text, sink)
+        data = self.extract_summary(text, transactions)
+        return data, transactions
+
+
+_compiled: Dict[str, SpecParser] = {}
+
+
+def get_spec(bank: str) -> Optional[Dict]:
+    for spec in SPECS:
+        if spec["bank"] == bank:
+            return spec
+    return None
+
+
+def get_spec_parser(bank: str) -> Optional[SpecParser]:
+    """Compiled parser for a bank code, compiled on first use and reused afterwards"""
+    parser = _compiled.get(bank)
+    if parser is None:
+        spec = get_spec(bank)
+        if spec is None:
+            return None
+        parser = _compiled[bank] = SpecParser(spec)
+    return parser
+
+
+def register_spec(spec: Dict, before: Optional[str] = None) -> None:
+    """
+    Add or replace a bank layout
+
+    Args:
+        spec: Layout spec dict (see parsers/specs.py)
+        before: Bank code the new spec should be detected ahead of (default: last)
+    """
+    SpecParser(spec)    # fail early on an invalid spec
+    SPECS[:] = [s for s in SPECS if s["bank"] != spec["bank"]]
+    index = next((i for i, s in enumerate(SPECS) if s["bank"] == before), len(SPECS))
+    SPECS.insert(index, spec)
+    _compiled.pop(spec["bank"], None)
+
+
+def load_spec(path: str) -> Dict:
+    """Read a spec from a JSON or YAML file (YAML needs PyYAML)"""
+    with open(path, encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            import yaml
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+def detect_bank_from_specs(text: str) -> str:
+    """Return the first spec whose detection clauses match, or "UNKNOWN" """
+    t = text.upper()
+    seen = {}
+    for spec in SPECS:
+        for clause in spec["detect"]:
+            if all(seen[kw] if kw in seen else seen.setdefault(kw, kw in t) for kw in clause):
+                return spec["bank"]
+    return "UNKNOWN"
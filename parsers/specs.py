@@ -0,0 +1,255 @@
+"""
+Declarative layouts for the supported banks, compiled by parsers/spec_parser.py
+
+A spec describes:
+    bank          Code returned by detection
+    detect        Keyword clauses matched against the upper-cased text; the spec
+                  matches when every keyword of any one clause is present
+    clean         Text clean-up steps ("nbsp", "cid", "collapse_spaces")
+    transactions  Line rules: strip / min_length / skip keywords, then either a
+                  "pattern" with per-field group mappings or a named "builder"
+    summary       Ordered summary entries, either extracted with regex patterns or
+                  computed from the transactions
+
+Specs are listed in SPECS in detection priority order. Every spec here reproduces
+the output of the corresponding hand-written parser class.
+"""
+
+HDFC_SPEC = {
+    "bank": "HDFC",
+    "detect": [["HDFC", "CREDIT CARD"], ["HDFC", "CARD NO"]],
+    "clean": ["nbsp"],
+    "transactions": {
+        "split": "splitlines",
+        "pattern": r'^(\d{2}/\d{2}/\d{4})\s+(.+?)\s+([\d,]+\.[\d]{2})\s*(Cr)?$',
+        "flags": "I",
+        "fields": [
+            {"name": "Date", "group": 1},
+            {"name": "Description", "group": 2, "transforms": ["strip", "collapse_ws", "strip"]},
+            {"name": "Amount", "group": 3, "type": "amount"},
+            {"name": "Type", "group": 4, "present": "CR", "absent": "DR"},
+        ],
+    },
+    "summary": [
+        {"key": "Card Holder Name", "patterns": [
+            {"regex": r'(?:Name|Ca:rd|rdNIKHIL|HN DFa.*?)(NIKHIL KHANDELWAL|[A-Z][A-Z\s]{5,})',
+             "transforms": ["strip", "collapse_ws"], "min_length": 4},
+            {"regex": r'Domestic Transactions.*?(NIKHIL KHANDELWAL|[A-Z]{2,}\s+[A-Z]{2,})',
+             "flags": "S", "transforms": ["strip"]},
+        ]},
+        {"key": "Card Last 4", "patterns": [
+            {"regex": r'Card\s*(?:No|Number|No\.)\s*[:\-]?\s*\d{4}\s+\d{2}[Xx]{2}\s+[Xx]{4}\s+(\d{4})',
+             "flags": "I"},
+            r'(\d{4})\s*THE OUTSTANDING',
+        ]},
+        {"key": "Statement Date", "patterns": [r'Statement Date\s*[:\-]?\s*(\d{2}/\d{2}/\d{4})']},
+        {"key": "Payment Due Date", "patterns": [
+            {"regex": r'Payment Due Date\s*(?:Total Dues.*?)?\s*(\d{2}/\d{2}/\d{4})', "flags": "S"},
+        ]},
+        {"key": "Credit Limit", "patterns": [r'Credit Limit\s+([\d,]+)']},
+        {"key": "Total Amount Due", "transforms": ["remove_commas"], "patterns": [
+            r'Payment Due Date\s+Total Dues\s+Minimum Amount Due\s+\d{2}/\d{2}/\d{4}\s+([\d,]+\.\d{2})',
+            r'Total Dues\s+([\d,]+\.\d{2})',
+            r'\d{2}/\d{2}/\d{4}\s+([\d,]+\.\d{2})\s+[\d,]+\.\d{2}',
+        ]},
+        {"key": "Minimum Amount Due", "transforms": ["remove_commas"], "patterns": [
+            {"regex": r'Minimum\s+Amount\s+Due\s+([\d,\.]+)', "flags": "I"},
+        ]},
+    ],
+}
+
+SBI_SPEC = {
+    "bank": "SBI",
+    "detect": [["STATE BANK OF INDIA"], ["SBI", "ACCOUNT"]],
+    "clean": ["cid", "collapse_spaces"],
+    "transactions": {
+        "min_length": 15,
+        "skip": ['txn date', 'value date', 'particulars', 'description',
+                 'withdrawal', 'deposit', 'balance', 'debit', 'credit',
+                 'computer generated', 'page ', 'statement', 'branch',
+                 'account', 'opening', 'closing', 'total'],
+        "skip_case": "insensitive",
+        "builder": "amount_columns",
+        "date_patterns": [
+            {"regex": r'^(\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{4})', "flags": "I"},
+            r'^(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})',
+        ],
+        "column_split": r'\s{2,}',
+        "amount_pattern": r'^\d+\.?\d*$',
+        "amount_strip": [',', '₹', 'Rs.'],
+        "description_max": 100,
+        "default_description": "Transaction",
+        "debit": "Debit",
+        "credit": "Credit",
+        "debit_keywords": ['TO TRANSFER', 'TO', 'WITHDRAWAL', 'WDL', 'CHARGES', 'PAYMENT',
+                           'DEBIT', 'ATM', 'POS', 'CHEQUE'],
+        "credit_keywords": ['BY TRANSFER', 'BY', 'DEPOSIT', 'CREDIT', 'IMPS', 'NEFT',
+                            'RTGS', 'UPI', 'SALARY'],
+    },
+    "summary": [
+        {"key": "Account Number", "flags": "I", "transforms": ["strip"], "patterns": [
+            r'Account Number\s*:\s*(\d+)',
+            r'A/c\s*No\s*[:\.]?\s*(\d+)',
+            r'Account\s*No\s*[:\.]?\s*(\d+)',
+        ]},
+        {"key": "Account Holder", "flags": "I", "first_match": False, "min_length": 4,
+         "transforms": ["strip", "strip_title", "collapse_ws"], "patterns": [
+            r'Account Holder\s*:\s*(.+?)(?=\n|Account)',
+            r'Account Name\s*:\s*(.+?)(?=\n|Address)',
+            r'(?:Mr\.|Mrs\.|Ms\.)\s*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)',
+        ]},
+        {"key": "Branch", "flags": "I", "first_match": False, "min_length": 3,
+         "transforms": ["strip", "remove_cid", "collapse_ws", "strip"], "patterns": [
+            r'Branch\s*:\s*([A-Z][A-Z\s]+?)(?=\s+Drawing|\s+Power|\s+Interest|\s+MOD|\s+Balance)',
+            r'Branch\s*:\s*([^:\n]+?)(?=\s+Drawing|\s+Power)',
+            r'Branch\s*[:\-]\s*(.+?)(?=\n)',
+        ]},
+        {"key": "Statement Period", "flags": "I", "groups": [1, 2], "join": " to ",
+         "transforms": ["strip"], "patterns": [
+            r'Statement Period\s*:\s*(\d+\s+\w+\s+\d+)\s+to\s+(\d+\s+\w+\s+\d+)',
+            r'(\d+\s+\w+\s+\d+)\s+to\s+(\d+\s+\w+\s+\d+)',
+            r'from\s+(\d{2}\s+\w{3}\s+\d{4})\s+to\s+(\d{2}\s+\w{3}\s+\d{4})',
+        ]},
+        {"key": "Opening Balance", "flags": "I", "first_match": False, "type": "amount", "patterns": [
+            r'Opening Balance\s*:\s*₹?\s*([\d,]+\.?\d*)',
+            r'Balance as on\s+\d+\s+\w+\s+\d+\s*:\s*₹?\s*([\d,]+\.?\d*)',
+            r'Balance\s+as\s+on\s+\d+\s+\w+\s+\d+\s*:\s*([\d,]+\.?\d*)',
+        ]},
+        {"key": "Total Credits", "compute": "sum", "type": "Credit", "when": ["transactions", "Opening Balance"]},
+        {"key": "Total Debits", "compute": "sum", "type": "Debit", "when": ["transactions", "Opening Balance"]},
+        {"key": "Net Change", "compute": "net", "credit": "Credit", "debit": "Debit",
+         "when": ["transactions", "Opening Balance"]},
+        {"key": "Closing Balance", "compute": "last", "field": "Balance", "fallback": "Opening Balance",
+         "default": 0.0, "when": ["transactions", "Opening Balance"]},
+    ],
+}
+
+# ICICI and Axis share one layout and differ only in detection
+CREDIT_CARD_LAYOUT = {
+    "clean": ["cid", "collapse_spaces"],
+    "transactions": {
+        "min_length": 15,
+        "skip": ['Date', 'Type', 'Description',
+                 'EMI', 'interest', 'page', 'statement', 'synthetic',
+                 'testing', 'detailed transactions', 'account summary'],
+        "skip_case": "insensitive",
+        "pattern": r'^(\d{2}-\w+-\d{4})\s+(DEBIT|CREDIT)\s+([A-Z\s]+?)\s+([\d,]+\.?\d*)\s*$',
+        "flags": "I",
+        "fields": [
+            {"name": "Date", "group": 1},
+            {"name": "Type", "group": 2, "transforms": ["upper"]},
+            {"name": "Description", "group": 3, "transforms": ["strip"]},
+            {"name": "Amount", "group": 4, "type": "amount", "round": 2},
+        ],
+    },
+    "summary": [
+        {"key": "Bank", "compute": "contains", "choices": [["ICICI Bank", "ICICI"], ["Axis Bank", "Axis"]],
+         "default": "Unknown"},
+        {"key": "Card Name", "flags": "I", "transforms": ["strip"], "patterns": [
+            r'Card\s+([A-Za-z ]+?)\s*\(',
+            r'Card\s+Name\s*:\s*([A-Za-z\s]+?)(?=\n|Card)',
+        ]},
+        {"key": "Card Last 4", "flags": "I", "transforms": ["strip"], "patterns": [
+            r'XXXX-XXXX-XXXX-(\d{4})',
+            r'Card.*?(\d{4})',
+        ]},
+        {"key": "Statement Date", "flags": "I", "transforms": ["strip"], "patterns": [
+            r'Statement Date\s+(\d{2}\s+\w+\s+\d{4})',
+            r'Statement\s+Date\s*:\s*(\d{1,2}\s+\w+\s+\d{4})',
+        ]},
+        {"key": "Statement Period", "flags": "I", "transforms": ["strip"], "patterns": [
+            r'Statement Period\s+(\d{2}\s+\w+\s+\d{4})\s*-\s*(\d{2}\s+\w+\s+\d{4})',
+            r'(\d{1,2}\s+\w+\s+\d{4})\s+to\s+(\d{1,2}\s+\w+\s+\d{4})',
+        ]},
+        {"key": "Payment Due Date", "flags": "I", "transforms": ["strip"], "patterns": [
+            r'Payment Due Date\s+(\d{2}\s+\w+\s+\d{4})',
+            r'Due Date\s*:\s*(\d{1,2}\s+\w+\s+\d{4})',
+        ]},
+        {"key": "Total Amount Due", "flags": "I", "transforms": ["strip"], "type": "amount", "patterns": [
+            r'Total Amount Due\s+INR\s+([\d,]+\.?\d*)',
+            r'Total\s+Amount\s+Due\s*:\s*₹?\s*([\d,]+\.?\d*)',
+        ]},
+        {"key": "Minimum Amount Due", "flags": "I", "transforms": ["strip"], "type": "amount", "patterns": [
+            r'Minimum Amount Due\s+INR\s+([\d,]+\.?\d*)',
+            r'Minimum\s+Amount\s+Due\s*:\s*₹?\s*([\d,]+\.?\d*)',
+        ]},
+        {"key": "Previous Balance", "flags": "I", "transforms": ["strip"], "type": "amount", "patterns": [
+            r'Previous Balance\s+INR\s+([-\d,]+\.?\d*)',
+            r'Previous\s+Balance\s*:\s*₹?\s*([-\d,]+\.?\d*)',
+        ]},
+        {"key": "New Charges", "flags": "I", "transforms": ["strip"], "type": "amount", "patterns": [
+            r'New Charges\s+INR\s+([\d,]+\.?\d*)',
+            r'New\s+Charges\s*:\s*₹?\s*([\d,]+\.?\d*)',
+        ]},
+        {"key": "Statement Balance", "flags": "I", "transforms": ["strip"], "type": "amount", "patterns": [
+            r'Statement Balance\s+INR\s+([\d,]+\.?\d*)',
+            r'Statement\s+Balance\s*:\s*₹?\s*([\d,]+\.?\d*)',
+        ]},
+        {"key": "Transactions Count", "compute": "count"},
+        {"key": "Total Debits", "compute": "sum", "type": "DEBIT", "when": ["transactions"]},
+        {"key": "Total Credits", "compute": "sum", "type": "CREDIT", "when": ["transactions"]},
+        {"key": "Transaction Count", "compute": "count", "when": ["transactions"]},
+    ],
+}
+
+ICICI_SPEC = dict(CREDIT_CARD_LAYOUT, bank="ICICI", detect=[["ICICI BANK", "CREDIT CARD"]])
+
+AXIS_SPEC = dict(CREDIT_CARD_LAYOUT, bank="AXIS", detect=[["AXIS BANK", "CREDIT CARD"]])
+
+AMEX_SPEC = {
+    "bank": "AMEX",
+    "detect": [["AMERICAN EXPRESS"], ["AMEX"]],
+    "clean": ["cid", "collapse_spaces"],
+    "transactions": {
+        "min_length": 15,
+        "skip": ['Transactions', 'Date', 'Description', 'Amount',
+                 'Member Name', 'Account number', 'Period', 'Due Date',
+                 'Amount Due', 'Previous Balance', 'Payments', 'New Charges',
+                 'American Express', 'AMEX', 'Summary', 'Page'],
+        "skip_case": "sensitive",
+        "pattern": r'^(\d{1,2}[-/]\w{3}[-/]\d{4})\s+(.+?)\s+(\$?[\d,]+\.?\d+)\s*$',
+        "flags": "I",
+        "fields": [
+            {"name": "Date", "group": 1},
+            {"name": "Description", "group": 2, "transforms": ["strip"]},
+            {"name": "Amount", "group": 3, "type": "amount", "round": 2},
+            {"name": "Type", "value": "DEBIT"},
+        ],
+    },
+    "summary": [
+        {"key": "Bank", "compute": "contains", "choices": [["American Express", "AMEX"], ["AMEX", "AMEX"]],
+         "default": "Unknown"},
+        {"key": "Member Name", "flags": "I", "transforms": ["strip"], "patterns": [
+            r'Member Name\s*:\s*(.+?)(?=\n|Account)',
+        ]},
+        {"key": "Account Number", "flags": "I", "transforms": ["strip"], "format": "****{}", "patterns": [
+            r'Account number ending in\s+(\d{4})',
+            r'Account\s*:\s*\*+(\d{4})',
+        ]},
+        {"key": "Statement Period", "flags": "I", "transforms": ["strip"], "patterns": [
+            r'Period\s*:\s*(\w+\s+\d{1,2},?\s+\d{4})\s*-\s*(\w+\s+\d{1,2},?\s+\d{4})',
+        ]},
+        {"key": "Due Date", "flags": "I", "transforms": ["strip"], "patterns": [
+            r'Due Date\s*:\s*(\w+\s+\d{1,2},?\s+\d{4})',
+        ]},
+        {"key": "Amount Due", "flags": "I", "transforms": ["strip"], "type": "amount", "patterns": [
+            r'Amount Due\s*:\s*\$?([\d,]+\.?\d*)',
+            r'Amount Due\s*:\s*([\d,]+\.?\d*)',
+        ]},
+        {"key": "Previous Balance", "flags": "I", "transforms": ["strip"], "type": "amount", "patterns": [
+            r'Previous Balance\s*:\s*\$?([-\d,]+\.?\d*)',
+        ]},
+        {"key": "Payments", "flags": "I", "transforms": ["strip"], "type": "amount", "patterns": [
+            r'Payments\s*:\s*\$?([-\d,]+\.?\d*)',
+        ]},
+        {"key": "New Charges", "flags": "I", "transforms": ["strip"], "type": "amount", "patterns": [
+            r'New Charges\s*:\s*\$?([\d,]+\.?\d*)',
+        ]},
+        {"key": "Transactions Count", "compute": "count"},
+        {"key": "Total Transactions", "compute": "count", "when": ["transactions"]},
+        {"key": "Total Amount", "compute": "sum", "when": ["transactions"]},
+    ],
+}
+
+# Detection priority order, matching statement_parser.detect_bank
+SPECS = [HDFC_SPEC, SBI_SPEC, ICICI_SPEC, AXIS_SPEC, AMEX_SPEC]
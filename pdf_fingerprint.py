@@ -0,0 +1,248 @@
+"""
+Structural PDF fingerprints for routing statements to a bank template without text extraction
+
+A fingerprint is a hash of cheap structural features read from the raw bytes: PDF
+version, Producer/Creator metadata, font names, page size and the layout (dictionary
+keys) of the first page object, plus whether the file uses compressed object
+streams. Only the head and tail of the file are read; object streams found there are
+inflated when the metadata is compressed.
+
+A FingerprintTable learns fingerprint -> bank from documents whose bank was detected
+from text. A fingerprint seen with more than one bank (e.g. two banks using the same
+statement generator) is marked ambiguous and never routed.
+
+Usage:
+    python pdf_fingerprint.py --table fingerprints.json --learn samples/*.pdf
+    python pdf_fingerprint.py --table fingerprints.json statement.pdf
+"""
+import hashlib
+import json
+import os
+import re
+import zlib
+from typing import Dict, Optional, Tuple
+
+# Bytes read from the start and the end of the file
+HEAD_BYTES = 64 * 1024
+TAIL_BYTES = 16 * 1024
+
+# Compressed object streams inflated when metadata or fonts are not visible in plain objects
+MAX_OBJECT_STREAMS = 4
+
+_VERSION = re.compile(rb"%PDF-(\d\.\d)")
+_PRODUCER = re.compile(rb"/Producer\s*(\((?:\\.|[^\\)])*\)|<[0-9A-Fa-f\s]*>)")
+_CREATOR = re.compile(rb"/Creator\s*(\((?:\\.|[^\\)])*\)|<[0-9A-Fa-f\s]*>)")
+_BASE_FONT = re.compile(rb"/BaseFont\s*/([^\s/<>\[\]()]+)")
+_MEDIA_BOX = re.compile(rb"/MediaBox\s*\[\s*([-\d.\s]+)\]")
+_PAGE = re.compile(rb"/Type\s*/Page(?![s\w])")
+_TOKEN = re.compile(rb"<<|>>|\[|\]|\((?:\\.|[^\\)])*\)|<[0-9A-Fa-f\s]*>|/[^\s/<>\[\]()]*|[^\s/<>\[\]()]+")
+_OBJECT_STREAM = re.compile(rb"/Type\s*/ObjStm\b[^>]*>>\s*stream\r?\n", re.S)
+_XREF_STREAM = re.compile(rb"/Type\s*/XRef\b")
+_SUBSET_PREFIX = re.compile(r"^[A-Z]{6}\+")
+
+
+def _pdf_string(raw: bytes) -> str:
+    """Decode a literal (...) or hex <...> PDF string"""
+    if raw.startswith(b"<"):
+        data = bytes.fromhex(re.sub(rb"\s", b"", raw[1:-1]).decode("ascii"))
+    else:
+        data = re.sub(rb"\\(.)", rb"\1", raw[1:-1])
+    if data.startswith(b"\xfe\xff"):
+        return data[2:].decode("utf-16-be", errors="ignore")
+    return data.decode("latin-1")
+
+
+def _page_keys(data: bytes) -> Tuple[str, ...]:
+    """Sorted top-level keys of the first /Type /Page dictionary"""
+    m = _PAGE.search(data)
+    if not m:
+        return ()
+    # Walk back to the << that opens the dictionary holding /Type /Page; nested
+    # dictionaries before it (Resources, Trans) are balanced on the way
+    depth, i = 0, m.start()
+    while i > 0:
+        i = max(data.rfind(b"<<", 0, i), data.rfind(b">>", 0, i))
+        if i < 0:
+            return ()
+        if data[i:i + 2] == b">>":
+            depth += 1
+        elif depth:
+            depth -= 1
+        else:
+            break
+
+    keys = set()
+    depth = arrays = 0
+    expect_key = True
+    for token in _TOKEN.finditer(data, i):
+        token = token.group()
+        if token == b"<<":
+            depth += 1
+            if depth > 1:
+                continue
+        elif token == b">>":
+            depth -= 1
+            if depth == 0:
+                break
+            if depth == 1 and not arrays:
+                expect_key = True
+        elif token == b"[":
+            arrays += 1
+        elif token == b"]":
+            arrays -= 1
+            if depth == 1 and not arrays:
+                expect_key = True
+        elif depth == 1 and not arrays:
+            if not expect_key:
+                expect_key = True
+            elif token.startswith(b"/"):
+                keys.add(token[1:].decode("latin-1"))
+                expect_key = False
+            # Anything else in key position is the "0 R" tail of an indirect reference
+    return tuple(sorted(keys - {"Type"}))
+
+
+def read_structure(path: str) -> Dict:
+    """Structural features of a PDF, read without parsing its content streams"""
+    with open(path, "rb") as f:
+        head = f.read(HEAD_BYTES)
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        tail = b""
+        if size > HEAD_BYTES:
+            f.seek(max(HEAD_BYTES, size - TAIL_BYTES))
+            tail = f.read()
+
+    data = head + tail
+    object_streams = 0
+    if b"/ObjStm" in data:
+        # Metadata, fonts and page objects may live in compressed object streams
+        inflated = []
+        for m in _OBJECT_STREAM.finditer(data):
+            if object_streams >= MAX_OBJECT_STREAMS:
+                break
+            end = data.find(b"endstream", m.end())
+            if end < 0:
+                break
+            try:
+                inflated.append(zlib.decompressobj().decompress(data[m.end():end], HEAD_BYTES))
+            except zlib.error:
+                continue
+            object_streams += 1
+        data += b"".join(inflated)
+
+    version = _VERSION.search(head)
+    producer = _PRODUCER.search(data)
+    creator = _CREATOR.search(data)
+    media_box = _MEDIA_BOX.search(data)
+    fonts = sorted({_SUBSET_PREFIX.sub("", f.decode("latin-1")) for f in _BASE_FONT.findall(data)})
+    return {
+        "version": version.group(1).decode("ascii") if version else None,
+        "producer": _pdf_string(producer.group(1)) if producer else None,
+        "creator": _pdf_string(creator.group(1)) if creator else None,
+        "fonts": fonts,
+        "media_box": [round(float(v)) for v in media_box.group(1).split()] if media_box else None,
+        "page_keys": list(_page_keys(data)),
+        "xref_stream": bool(_XREF_STREAM.search(data)),
+        "object_streams": object_streams > 0,
+    }
+
+
+def structure_fingerprint(features: Dict) -> str:
+    return hashlib.sha256(json.dumps(features, sort_keys=True).encode("utf-8")).hexdigest()[:24]
+
+
+def pdf_fingerprint(path: str) -> Tuple[str, Dict]:
+    """(fingerprint, features) for a PDF file"""
+    features = read_structure(path)
+    return structure_fingerprint(features), features
+
+
+class FingerprintTable:
+    """
+    Learned fingerprint -> bank/template table, stored as JSON
+
+    Each entry counts the banks its fingerprint was seen with; lookup only returns
+    entries seen with a single bank.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.entries = {}
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self.entries = json.load(f).get("entries", {})
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, fingerprint: str) -> Optional[Dict]:
+        """Entry with 'bank' and 'template' for a fingerprint, or None if unknown or ambiguous"""
+        entry = self.entries.get(fingerprint)
+        if entry is None or len(entry["seen"]) != 1:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def learn(self, fingerprint: str, bank: str, features: Optional[Dict] = None) -> Dict:
+        """Record that a document with this fingerprint was detected as bank"""
+        entry = self.entries.setdefault(fingerprint, {"bank": bank, "template": None, "seen": {},
+                                                      "features": features})
+        entry["seen"][bank] = entry["seen"].get(bank, 0) + 1
+        if len(entry["seen"]) == 1:
+            entry["bank"] = bank
+            entry["template"] = f"{bank.lower()}-{fingerprint[:8]}"
+        else:
+            entry["bank"] = None
+            entry["template"] = None
+        return entry
+
+    def route(self, path: str) -> Tuple[Optional[str], Optional[str], str]:
+        """(bank, template, fingerprint) for a PDF; bank and template are None on a miss"""
+        fingerprint, _ = pdf_fingerprint(path)
+        entry = self.lookup(fingerprint)
+        if entry is None:
+            return None, None, fingerprint
+        return entry["bank"], entry["template"], fingerprint
+
+    def save(self, path: Optional[str] = None) -> None:
+        path = path or self.path
+        if not path:
+            raise Exception("No path to save the fingerprint table to")
+        with open(path, "w") as f:
+            json.dump({"version": 1, "entries": self.entries}, f, indent=1, sort_keys=True)
+            f.write("\n")
+
+    def stats(self) -> Dict:
+        ambiguous = sum(1 for e in self.entries.values() if len(e["seen"]) > 1)
+        return {"entries": len(self.entries), "ambiguous": ambiguous, "hits": self.hits, "misses": self.misses}
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Fingerprint statement PDFs and route them to a bank template")
+    parser.add_argument("pdfs", nargs="+", help="statement pdfs")
+    parser.add_argument("--table", default="fingerprints.json", help="fingerprint table (default: fingerprints.json)")
+    parser.add_argument("--learn", action="store_true",
+                        help="detect each PDF's bank from its text and add it to the table")
+    args = parser.parse_args()
+
+    table = FingerprintTable(args.table)
+    for pdf in args.pdfs:
+        start = time.perf_counter()
+        fingerprint, features = pdf_fingerprint(pdf)
+        entry = table.lookup(fingerprint)
+        ms = (time.perf_counter() - start) * 1000
+        if args.learn:
+            from statement_parser import detect_bank, extract_text_from_pdf
+            bank = detect_bank(extract_text_from_pdf(pdf))
+            if bank != "UNKNOWN":
+                entry = table.learn(fingerprint, bank, features)
+        print(json.dumps({"file": pdf, "fingerprint": fingerprint, "ms": round(ms, 3),
+                          "bank": entry["bank"] if entry else None,
+                          "template": entry["template"] if entry else None}))
+    if args.learn:
+        table.save()
+    print(json.dumps(table.stats()))
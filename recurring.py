@@ -0,0 +1,223 @@
+"""
+Recurring charge and subscription detection over parsed transactions
+
+Transactions are hashed into buckets by (account, merchant key) and split
+into amount clusters within a relative tolerance, so a merchant's Rs 199 plan and
+its Rs 649 plan become separate candidates. Each bucket's dates are then checked
+for a regular interval (weekly, monthly, yearly, ...). Every transaction is
+touched a constant number of times plus one sort per bucket, so the work grows
+near-linearly with history length instead of comparing transaction pairs.
+
+Usage:
+    python recurring.py statement1.pdf statement2.pdf ...
+"""
+import calendar
+import statistics
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from categorizer import normalize_merchant
+from transaction_utils import amount_to_minor, date_ordinal, type_code, TYPE_DEBIT
+
+# Cadence name -> (nominal days, allowed deviation in days)
+CADENCES = {
+    "weekly": (7, 1),
+    "biweekly": (14, 2),
+    "monthly": (30.44, 4),
+    "quarterly": (91.31, 10),
+    "half-yearly": (182.62, 14),
+    "yearly": (365.25, 20),
+}
+
+# Cadences whose next date is computed by calendar months rather than days
+MONTH_STEPS = {"monthly": 1, "quarterly": 3, "half-yearly": 6, "yearly": 12}
+
+# Words mixing letters and digits from this length up are per-charge references
+# ("NETFLIX.COM AB12CD34"), not part of the merchant; shorter ones such as "1MG" are kept
+REFERENCE_MIN_LENGTH = 5
+
+
+def merchant_key(description: str) -> str:
+    """Bucket key for a description: its normalised merchant words without references"""
+    return " ".join(word for word in normalize_merchant(description).split()
+                    if word.isalpha() or len(word) < REFERENCE_MIN_LENGTH)
+
+
+def _add_months(d: date, months: int, day: int) -> date:
+    month_index = d.month - 1 + months
+    year, month = d.year + month_index // 12, month_index % 12 + 1
+    return date(year, month, min(day, calendar.monthrange(year, month)[1]))
+
+
+def _match_cadence(interval: float) -> Optional[str]:
+    for name, (days, deviation) in CADENCES.items():
+        if abs(interval - days) <= deviation:
+            return name
+    return None
+
+
+def _amount_clusters(items: List[Tuple[int, int, Dict]], tolerance: float) -> List[List[Tuple[int, int, Dict]]]:
+    """Split (ordinal, amount_minor, tx) items into runs of amounts within tolerance of each other"""
+    items.sort(key=lambda item: item[1])
+    clusters = [[items[0]]]
+    start = items[0][1]
+    for item in items[1:]:
+        if item[1] > start * (1 + tolerance):
+            clusters.append([])
+            start = item[1]
+        clusters[-1].append(item)
+    return clusters
+
+
+def _series(items: List[Tuple[int, int, Dict]], min_occurrences: int,
+            min_regularity: float) -> Optional[Dict]:
+    """Recurring series described by one amount cluster, or None if its dates are not periodic"""
+    items.sort(key=lambda item: item[0])
+    # Several charges on one day count as a single occurrence
+    days = sorted({ordinal for ordinal, _, _ in items})
+    if len(days) < min_occurrences:
+        return None
+
+    intervals = [b - a for a, b in zip(days, days[1:])]
+    median = statistics.median(intervals)
+    cadence = _match_cadence(median)
+    if cadence is None:
+        return None
+    nominal, deviation = CADENCES[cadence]
+    regular = sum(1 for i in intervals if abs(i - nominal) <= deviation)
+    if regular / len(intervals) < min_regularity:
+        return None
+
+    amounts = [amount for _, amount, _ in items]
+    first, last = date.fromordinal(days[0]), date.fromordinal(days[-1])
+    if cadence in MONTH_STEPS:
+        # Keep the billing day of the month (clamped for short months)
+        billing_day = round(statistics.median(date.fromordinal(d).day for d in days))
+        next_date = _add_months(last, MONTH_STEPS[cadence], billing_day)
+    else:
+        next_date = last + timedelta(days=round(median))
+
+    latest = items[-1][2]
+    return {
+        "Description": latest.get("Description"),
+        "Cadence": cadence,
+        "Interval Days": median,
+        "Occurrences": len(days),
+        "First Date": first.isoformat(),
+        "Last Date": last.isoformat(),
+        "Next Expected Date": next_date.isoformat(),
+        "Average Amount": round(sum(amounts) / len(amounts) / 100, 2),
+        "Min Amount": min(amounts) / 100,
+        "Max Amount": max(amounts) / 100,
+        "Regularity": round(regular / len(intervals), 2),
+    }
+
+
+def find_recurring(transactions: Iterable[Dict], min_occurrences: int = 3, amount_tolerance: float = 0.1,
+                   min_regularity: float = 0.75, debits_only: bool = True,
+                   as_of: Optional[date] = None) -> List[Dict]:
+    """
+    Find recurring charges in a transaction history
+
+    Args:
+        transactions: Transaction dicts from one or more statements. Rows carrying an
+            'Account' key (TransactionStore.search, recurring_from_statements) are
+            grouped per account. Overlapping statements should be merged first
+            (statement_merge.merge_statements) so duplicates are not counted twice.
+        min_occurrences: Distinct charge dates needed to call a series recurring
+        amount_tolerance: Relative amount difference allowed within one series (0.1 = 10%)
+        min_regularity: Share of gaps between charges that must match the cadence
+        debits_only: Ignore credits (salary and refunds can be periodic too)
+        as_of: Date the 'Active' flag is computed against (defaults to the latest
+            transaction date seen)
+
+    Returns:
+        List of series dicts (Account, Merchant, Description, Cadence, Interval Days,
+        Occurrences, First/Last/Next Expected Date, Average/Min/Max Amount,
+        Regularity, Active), most frequent first
+    """
+    buckets = defaultdict(list)
+    # Types, dates and descriptions repeat heavily across a history; convert each distinct value once
+    skip_types = {}
+    ordinals = {}
+    merchants = {}
+    latest = 0
+    for tx in transactions:
+        if debits_only:
+            txn_type = tx.get("Type")
+            skip = skip_types.get(txn_type)
+            if skip is None:
+                skip = skip_types[txn_type] = type_code(txn_type) not in (TYPE_DEBIT, None)
+            if skip:
+                continue
+        date_text = tx.get("Date")
+        ordinal = ordinals.get(date_text)
+        if ordinal is None:
+            ordinal = ordinals[date_text] = date_ordinal(date_text) or 0
+        amount = tx.get("Amount")
+        amount = round(amount * 100) if type(amount) is float else amount_to_minor(amount)
+        if not ordinal or not amount:
+            continue
+        description = tx.get("Description") or ""
+        merchant = merchants.get(description)
+        if merchant is None:
+            merchant = merchants[description] = merchant_key(description)
+        if not merchant:
+            continue
+        buckets[tx.get("Account"), merchant].append((ordinal, abs(amount), tx))
+        if ordinal > latest:
+            latest = ordinal
+
+    as_of_ordinal = as_of.toordinal() if as_of is not None else latest
+    found = []
+    for (account, merchant), items in buckets.items():
+        if len(items) < min_occurrences:
+            continue
+        for cluster in _amount_clusters(items, amount_tolerance):
+            series = _series(cluster, min_occurrences, min_regularity)
+            if series is None:
+                continue
+            nominal, deviation = CADENCES[series["Cadence"]]
+            overdue = as_of_ordinal - date.fromisoformat(series["Last Date"]).toordinal()
+            series["Active"] = overdue <= nominal + deviation
+            found.append({"Account": account, "Merchant": merchant, **series})
+
+    found.sort(key=lambda s: (-s["Occurrences"], s["Merchant"], s["Account"] or ""))
+    return found
+
+
+def recurring_from_statements(parsed: Iterable[Tuple[Dict, Iterable[Dict]]], **kwargs) -> List[Dict]:
+    """
+    find_recurring over parse_statement_file results, merged per account
+
+    Args:
+        parsed: (result, transactions) pairs as returned by parse_statement_file
+        **kwargs: Passed to find_recurring
+    """
+    from statement_merge import merge_statements
+
+    def tagged():
+        for account, timeline in merge_statements(parsed).items():
+            for tx in timeline:
+                yield dict(tx, Account=account)
+
+    return find_recurring(tagged(), **kwargs)
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    from statement_parser import parse_statement_file
+
+    parser = argparse.ArgumentParser(description="List recurring charges found in bank statements")
+    parser.add_argument("pdfs", nargs="+", help="statement pdfs")
+    parser.add_argument("--min-occurrences", type=int, default=3, help="charges needed per series (default: 3)")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="relative amount tolerance (default: 0.1)")
+    args = parser.parse_args()
+
+    parsed = [parse_statement_file(pdf, export_csv=False) for pdf in args.pdfs]
+    for series in recurring_from_statements(parsed, min_occurrences=args.min_occurrences,
+                                            amount_tolerance=args.tolerance):
+        print(json.dumps(series, ensure_ascii=False))
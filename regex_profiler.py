@@ -0,0 +1,250 @@
+"""
+Per-pattern regex profiling for the bank parsers
+
+The parsers call the module-level re functions (re.search, re.match, re.sub, ...) and
+compiled patterns. While profiling, the `re` name inside each parser module is replaced
+by a proxy that forwards every call to the real re module and records, per
+(pattern, flags): calls, matches, total time and the number of bytes (UTF-8) handed to
+the regex engine. Patterns a module compiled before profiling started (module-level
+constants, the spec engine's compiled parsers) are wrapped or recompiled for the
+duration, so the spec engine is profiled too.
+
+Usage:
+    python regex_profiler.py samples/*.pdf --top 25
+"""
+import re
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
+
+PARSER_MODULES = [
+    "parsers.hdfc_parser",
+    "parsers.sbi_parser",
+    "parsers.credit_card_parser",
+    "parsers.amex_parser",
+    "parsers.spec_parser",
+]
+
+# Module attribute holding parsers compiled on first use (parsers.spec_parser); emptied
+# while profiling so they are compiled again through the proxy
+PARSER_CACHE = "_compiled"
+
+
+class PatternStats:
+    __slots__ = ("pattern", "flags", "calls", "matches", "seconds", "bytes", "sites")
+
+    def __init__(self, pattern: str, flags: int):
+        self.pattern = pattern
+        self.flags = flags
+        self.calls = 0
+        self.matches = 0
+        self.seconds = 0.0
+        self.bytes = 0
+        self.sites = set()
+
+    def as_dict(self) -> Dict:
+        return {
+            "pattern": self.pattern,
+            "flags": self.flags,
+            "calls": self.calls,
+            "matches": self.matches,
+            "seconds": self.seconds,
+            "bytes_scanned": self.bytes,
+            "sites": sorted(self.sites),
+        }
+
+
+class RegexProfiler:
+    """Collects PatternStats for every pattern used through the proxies"""
+
+    def __init__(self):
+        self.stats: Dict = {}
+
+    def run(self, compiled: re.Pattern, method: str, string, *args):
+        """Run compiled.<method>(string, *args), recording the call against the pattern"""
+        start = time.perf_counter()
+        if method == "sub":
+            result, matches = compiled.subn(args[0], string, *args[1:])
+        else:
+            result = getattr(compiled, method)(string, *args)
+            if method == "finditer":
+                result = list(result)
+            if method == "split":
+                matches = len(result) - 1
+            elif isinstance(result, list):
+                matches = len(result)
+            else:
+                matches = 0 if result is None else 1
+        elapsed = time.perf_counter() - start
+
+        key = (compiled.pattern, compiled.flags & ~re.UNICODE)
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = PatternStats(*key)
+        stats.calls += 1
+        stats.matches += matches
+        stats.seconds += elapsed
+        stats.bytes += len(string) if not isinstance(string, str) or string.isascii() else len(string.encode("utf-8"))
+
+        # Call site in the parser: run <- proxy method <- caller
+        frame = sys._getframe(2)
+        stats.sites.add(f"{frame.f_code.co_filename.rsplit('/', 1)[-1]}:{frame.f_lineno}")
+        return iter(result) if method == "finditer" else result
+
+    def report(self) -> List[Dict]:
+        """Pattern stats ranked by total time"""
+        return [s.as_dict() for s in sorted(self.stats.values(), key=lambda s: s.seconds, reverse=True)]
+
+    def dead_patterns(self) -> List[Dict]:
+        """Patterns that ran but never matched"""
+        return [s for s in self.report() if s["calls"] and not s["matches"]]
+
+
+class ProfiledPattern:
+    """Stand-in for a compiled pattern that records each call"""
+
+    def __init__(self, profiler: RegexProfiler, compiled: re.Pattern):
+        self._profiler = profiler
+        self._compiled = compiled
+
+    def __getattr__(self, name):
+        return getattr(self._compiled, name)
+
+    def search(self, string, *args):
+        return self._profiler.run(self._compiled, "search", string, *args)
+
+    def match(self, string, *args):
+        return self._profiler.run(self._compiled, "match", string, *args)
+
+    def fullmatch(self, string, *args):
+        return self._profiler.run(self._compiled, "fullmatch", string, *args)
+
+    def findall(self, string, *args):
+        return self._profiler.run(self._compiled, "findall", string, *args)
+
+    def finditer(self, string, *args):
+        return self._profiler.run(self._compiled, "finditer", string, *args)
+
+    def split(self, string, maxsplit=0):
+        return self._profiler.run(self._compiled, "split", string, maxsplit)
+
+    def sub(self, repl, string, count=0):
+        return self._profiler.run(self._compiled, "sub", string, repl, count)
+
+
+class ProfiledRe:
+    """Drop-in replacement for the re module that records every pattern call"""
+
+    def __init__(self, profiler: RegexProfiler):
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        # Flags, error, escape and anything else not wrapped below
+        return getattr(re, name)
+
+    def compile(self, pattern, flags=0):
+        return ProfiledPattern(self._profiler, re.compile(pattern, flags))
+
+    def search(self, pattern, string, flags=0):
+        return self._profiler.run(re.compile(pattern, flags), "search", string)
+
+    def match(self, pattern, string, flags=0):
+        return self._profiler.run(re.compile(pattern, flags), "match", string)
+
+    def fullmatch(self, pattern, string, flags=0):
+        return self._profiler.run(re.compile(pattern, flags), "fullmatch", string)
+
+    def findall(self, pattern, string, flags=0):
+        return self._profiler.run(re.compile(pattern, flags), "findall", string)
+
+    def finditer(self, pattern, string, flags=0):
+        return self._profiler.run(re.compile(pattern, flags), "finditer", string)
+
+    def split(self, pattern, string, maxsplit=0, flags=0):
+        return self._profiler.run(re.compile(pattern, flags), "split", string, maxsplit)
+
+    def sub(self, pattern, repl, string, count=0, flags=0):
+        return self._profiler.run(re.compile(pattern, flags), "sub", string, repl, count)
+
+
+@contextmanager
+def profile_regexes(modules: Optional[Iterable[str]] = None):
+    """
+    Profile every regex used by the parser modules inside the with block
+
+    Yields:
+        RegexProfiler whose report() ranks the patterns by total time
+    """
+    import importlib
+
+    profiler = RegexProfiler()
+    proxy = ProfiledRe(profiler)
+    restore = []    # (module, attribute, original value)
+    try:
+        for name in modules or PARSER_MODULES:
+            module = importlib.import_module(name)
+            if getattr(module, "re", None) is not re:
+                continue
+            restore.append((module, "re", re))
+            module.re = proxy
+            for attr, value in list(vars(module).items()):
+                if isinstance(value, re.Pattern):
+                    restore.append((module, attr, value))
+                    setattr(module, attr, ProfiledPattern(profiler, value))
+            cache = getattr(module, PARSER_CACHE, None)
+            if isinstance(cache, dict):
+                restore.append((module, PARSER_CACHE, dict(cache)))
+                cache.clear()
+        yield profiler
+    finally:
+        for module, attr, value in reversed(restore):
+            if attr == PARSER_CACHE:
+                cache = getattr(module, attr)
+                cache.clear()
+                cache.update(value)
+            else:
+                setattr(module, attr, value)
+
+
+def format_report(rows: List[Dict], top: Optional[int] = None, width: int = 60) -> str:
+    total = sum(r["seconds"] for r in rows) or 1.0
+    lines = [f"{'seconds':>9} {'share':>6} {'calls':>8} {'matches':>8} {'bytes':>12}  pattern (sites)"]
+    for r in rows[:top] if top else rows:
+        pattern = r["pattern"] if len(r["pattern"]) <= width else r["pattern"][:width - 3] + "..."
+        dead = "  [never matched]" if r["calls"] and not r["matches"] else ""
+        lines.append(f"{r['seconds']:9.4f} {100 * r['seconds'] / total:5.1f}% {r['calls']:8} {r['matches']:8} "
+                     f"{r['bytes_scanned']:12}  {pattern!r} ({', '.join(r['sites'])}){dead}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    from statement_parser import parse_statement_file
+
+    parser = argparse.ArgumentParser(description="Rank the parsers' regexes by cost over a corpus of statements")
+    parser.add_argument("pdfs", nargs="+", help="statement pdfs")
+    parser.add_argument("--top", type=int, default=None, help="show only the N most expensive patterns")
+    parser.add_argument("--json", default=None, help="write the full report to this JSON file")
+    args = parser.parse_args()
+
+    with profile_regexes() as profiler:
+        for pdf in args.pdfs:
+            try:
+                result, transactions = parse_statement_file(pdf, export_csv=False)
+                print(f"{pdf}: {result.get('bank')} {len(transactions)} transactions")
+            except Exception as e:
+                print(f"FAILED {pdf}: {e}")
+
+    rows = profiler.report()
+    print()
+    print(format_report(rows, args.top))
+    dead = profiler.dead_patterns()
+    print(f"\n{len(rows)} patterns, {len(dead)} never matched, "
+          f"{sum(r['seconds'] for r in dead):.4f}s spent in patterns that never matched")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rows, f, indent=2)
@@ -0,0 +1,250 @@
+import hashlib
+import inspect
+import json
+import re
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+# Bump when the stored layout or the parse_statement_file result format changes
+CACHE_FORMAT = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    pdf_hash TEXT NOT NULL,
+    bank TEXT NOT NULL,
+    engine TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL,
+    data BLOB NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_results_last_used ON results(last_used);
+CREATE INDEX IF NOT EXISTS idx_results_bank ON results(bank);
+"""
+
+
+def _source_digest(obj) -> str:
+    """Hash of the source file that defines a module, class or function"""
+    module = obj if inspect.ismodule(obj) else sys.modules[obj.__module__]
+    try:
+        with open(inspect.getsourcefile(module), "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except (OSError, TypeError):
+        # No source on disk (frozen or interactive); fall back to the compiled code
+        return hashlib.sha256(repr(getattr(obj, "__dict__", obj)).encode("utf-8")).hexdigest()
+
+
+def _function_digest(func) -> str:
+    """Hash of one function's source, so edits elsewhere in its module do not change it"""
+    try:
+        source = inspect.getsource(func)
+    except (OSError, TypeError):
+        source = repr((func.__code__.co_code, func.__code__.co_consts))
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+def _pattern_table(value):
+    """JSON-able view of a parser's pattern table, compiled regexes as (pattern, flags)"""
+    if isinstance(value, re.Pattern):
+        return [value.pattern, value.flags]
+    if isinstance(value, dict):
+        return {str(k): _pattern_table(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_pattern_table(v) for v in value]
+    return value
+
+
+# Modules outside the bank parsers whose code shapes every bank's results: header/footer
+# stripping, date/amount helpers and the categorizer with its DEFAULT_RULES
+SHARED_MODULES = ("boilerplate", "transaction_utils", "categorizer")
+
+_fingerprints = {}
+
+
+def parser_fingerprint(bank: str, engine: Optional[str] = None) -> str:
+    """
+    Fingerprint of the code that parses one bank's statements
+
+    Classic engine: the source of every module in the parser class's MRO, its
+    pattern table and the source of the detect_bank function. Spec engine: the
+    bank's spec and the source of parsers/spec_parser.py. Both include the source of
+    parse_statement_file and iter_pdf_pages, which assemble pages and the result
+    (not the rest of statement_parser.py), and the SHARED_MODULES. Changing one
+    bank's parser changes only that bank's fingerprint. Fingerprints are computed
+    once per process.
+    """
+    import importlib
+
+    from statement_parser import PARSER_ENGINE, PARSERS, detect_bank, iter_pdf_pages, parse_statement_file
+
+    engine = engine or PARSER_ENGINE
+    cache_key = (bank, engine)
+    if cache_key in _fingerprints:
+        return _fingerprints[cache_key]
+
+    h = hashlib.sha256(f"{CACHE_FORMAT}\x00{engine}\x00{bank}".encode("utf-8"))
+    if engine == "spec":
+        from parsers import spec_parser
+        h.update(_source_digest(spec_parser).encode("ascii"))
+        h.update(json.dumps(spec_parser.get_spec(bank), sort_keys=True, default=str).encode("utf-8"))
+    else:
+        parser_cls = PARSERS.get(bank)
+        if parser_cls is not None:
+            for cls in parser_cls.__mro__[:-1]:
+                h.update(_source_digest(cls).encode("ascii"))
+            patterns = _pattern_table(getattr(parser_cls(), "patterns", None))
+            h.update(json.dumps(patterns, sort_keys=True, default=str).encode("utf-8"))
+        h.update(_function_digest(detect_bank).encode("ascii"))
+    for func in (parse_statement_file, iter_pdf_pages):
+        h.update(_function_digest(func).encode("ascii"))
+    for name in SHARED_MODULES:
+        h.update(_source_digest(importlib.import_module(name)).encode("ascii"))
+
+    fingerprint = h.hexdigest()[:32]
+    _fingerprints[cache_key] = fingerprint
+    return fingerprint
+
+
+def encode_result(result: Dict, transactions: List[Dict]) -> bytes:
+    """
+    Compact binary form of a parse result: zlib-compressed JSON with the transactions
+    stored as rows of values plus one shared key list per distinct row shape
+    """
+    shapes = {}
+    rows = []
+    for tx in transactions:
+        shape = tuple(tx)
+        index = shapes.get(shape)
+        if index is None:
+            index = shapes[shape] = len(shapes)
+        rows.append([index, *tx.values()])
+    payload = {"result": result, "shapes": [list(s) for s in shapes], "rows": rows}
+    return zlib.compress(json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8"), 6)
+
+
+def decode_result(data: bytes) -> Tuple[Dict, List[Dict]]:
+    payload = json.loads(zlib.decompress(data))
+    shapes = payload["shapes"]
+    transactions = [dict(zip(shapes[row[0]], row[1:])) for row in payload["rows"]]
+    return payload["result"], transactions
+
+
+class ResultCache:
+    """
+    On-disk LRU cache of final parse results keyed by PDF content and parser version
+
+    Each entry records the bank it was parsed as and that bank's parser_fingerprint.
+    A lookup whose stored fingerprint no longer matches the current parser is a
+    miss and the entry is dropped, so a fix to SBIParser invalidates only SBI results.
+    Entries are evicted least-recently-used once max_entries or max_bytes is exceeded.
+    """
+
+    def __init__(self, path: str = "parse_results.db", max_entries: int = 1000,
+                 max_bytes: Optional[int] = 256 * 1024 * 1024):
+        """
+        Args:
+            path: SQLite database file
+            max_entries: Maximum cached results before least-recently-used eviction
+            max_bytes: Maximum total size of stored results (None for no limit)
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+
+    @staticmethod
+    def entry_key(pdf_hash: str, engine: Optional[str] = None, **options) -> str:
+        """Cache key for a PDF hash and the parse options that change the result"""
+        from statement_parser import PARSER_ENGINE
+
+        flags = ",".join(f"{k}={options[k]!r}" for k in sorted(options))
+        return f"{pdf_hash}:{engine or PARSER_ENGINE}:{flags}"
+
+    def get(self, key: str) -> Optional[Tuple[Dict, List[Dict]]]:
+        """Return (result, transactions) if cached and the bank's parser is unchanged"""
+        with self._lock:
+            row = self.conn.execute("SELECT bank, engine, fingerprint, data FROM results WHERE key = ?",
+                                    (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            bank, engine, fingerprint, data = row
+            if fingerprint != parser_fingerprint(bank, engine):
+                self.conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                self.conn.commit()
+                self.stale += 1
+                self.misses += 1
+                return None
+            self.conn.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+            self.conn.commit()
+            self.hits += 1
+        return decode_result(data)
+
+    def put(self, key: str, pdf_hash: str, result: Dict, transactions: List[Dict],
+            engine: Optional[str] = None) -> None:
+        from statement_parser import PARSER_ENGINE
+
+        engine = engine or PARSER_ENGINE
+        bank = result.get("bank", "UNKNOWN")
+        data = encode_result(result, transactions)
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO results (key, pdf_hash, bank, engine, fingerprint, size, last_used, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, pdf_hash, bank, engine, parser_fingerprint(bank, engine), len(data), time.time(), data))
+            self._evict()
+            self.conn.commit()
+
+    def _evict(self) -> None:
+        count, size = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        if count <= self.max_entries and (self.max_bytes is None or size <= self.max_bytes):
+            return
+        doomed = []
+        for key, entry_size in self.conn.execute("SELECT key, size FROM results ORDER BY last_used"):
+            if count <= self.max_entries and (self.max_bytes is None or size <= self.max_bytes):
+                break
+            doomed.append((key,))
+            count -= 1
+            size -= entry_size
+        self.conn.executemany("DELETE FROM results WHERE key = ?", doomed)
+
+    def prune(self) -> int:
+        """Delete every entry whose bank's parser has changed; returns the number removed"""
+        with self._lock:
+            rows = self.conn.execute("SELECT DISTINCT bank, engine, fingerprint FROM results").fetchall()
+            removed = 0
+            for bank, engine, fingerprint in rows:
+                if fingerprint != parser_fingerprint(bank, engine):
+                    removed += self.conn.execute(
+                        "DELETE FROM results WHERE bank = ? AND engine = ? AND fingerprint = ?",
+                        (bank, engine, fingerprint)).rowcount
+            self.conn.commit()
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self.conn.execute("DELETE FROM results")
+            self.conn.commit()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            count, size = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+            banks = dict(self.conn.execute("SELECT bank, COUNT(*) FROM results GROUP BY bank").fetchall())
+        return {"entries": count, "bytes": size, "banks": banks,
+                "hits": self.hits, "misses": self.misses, "stale": self.stale}
+
+    def close(self) -> None:
+        self.conn.close()
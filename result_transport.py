@@ -0,0 +1,287 @@
+"""
+Columnar shared-memory transport for transactions parsed in worker processes
+
+A pool worker that returns a list of transaction dicts pickles every dict, and the
+parent unpickles them one by one. run_shared packs the transactions column by column
+(floats and ints as packed arrays, strings as one UTF-8 block) into a
+multiprocessing.shared_memory segment and returns only a small descriptor. The
+parent copies the segment out once, unlinks it, and gets a ColumnarTransactions
+sequence that builds dicts on access or hands out whole columns.
+
+Usage with any executor built on parse_statement_file:
+    future = executor.submit(run_shared, parse_source, path)
+    result, transactions, seconds = receive_shared(future.result())
+"""
+import pickle
+from array import array
+from collections.abc import Sequence
+from itertools import accumulate
+from multiprocessing import resource_tracker, shared_memory
+from typing import Callable, Dict, List, Optional, Tuple
+
+TRANSPORTS = ("pickle", "shm")
+
+# Column encodings: packed float64, packed int64, NUL-separated strings, strings with
+# an offset array (when a value contains NUL) and pickled values for anything else
+FLOAT, INT, TEXT, TEXT_OFFSETS, PICKLED = "f", "i", "s", "o", "p"
+
+ALIGN = 8
+
+
+def _encode_column(values: List) -> Tuple[str, bytes, Optional[bytes]]:
+    """Return (kind, data, offsets) for one column"""
+    types = set(map(type, values))
+    if types == {float}:
+        return FLOAT, array("d", values).tobytes(), None
+    if types == {int}:
+        try:
+            return INT, array("q", values).tobytes(), None
+        except OverflowError:
+            pass
+    if types == {str}:
+        joined = "\x00".join(values)
+        if joined.count("\x00") == len(values) - 1:
+            return TEXT, joined.encode("utf-8"), None
+        # Offsets are in code points, so the parent slices the decoded string
+        offsets = array("q", accumulate(map(len, values), initial=0))
+        return TEXT_OFFSETS, "".join(values).encode("utf-8"), offsets.tobytes()
+    return PICKLED, pickle.dumps(values, protocol=pickle.HIGHEST_PROTOCOL), None
+
+
+def _decode_column(kind: str, data: memoryview, offsets: Optional[memoryview], count: int) -> List:
+    if kind == FLOAT:
+        return data.cast("d").tolist()
+    if kind == INT:
+        return data.cast("q").tolist()
+    if kind == TEXT:
+        return str(data, "utf-8").split("\x00") if count else []
+    if kind == TEXT_OFFSETS:
+        text = str(data, "utf-8")
+        bounds = offsets.cast("q").tolist()
+        return [text[a:b] for a, b in zip(bounds, bounds[1:])]
+    return pickle.loads(data)
+
+
+def pack_transactions(transactions: List[Dict]) -> Tuple[Dict, bytes]:
+    """
+    Pack transactions into (layout, buffer)
+
+    Rows sharing the same keys in the same order form a shape; each column holds
+    the values of the rows whose shape has that key, so dict key order and missing
+    keys survive the round trip.
+    """
+    shapes = {}
+    shape_ids = []
+    keys = {}
+    for tx in transactions:
+        shape = tuple(tx)
+        index = shapes.get(shape)
+        if index is None:
+            index = shapes[shape] = len(shapes)
+            for key in shape:
+                keys.setdefault(key, None)
+        shape_ids.append(index)
+
+    uniform = len(shapes) <= 1
+    chunks = []
+    size = 0
+
+    def add(data: bytes) -> List[int]:
+        nonlocal size
+        start = size
+        chunks.append(data)
+        size += len(data)
+        padding = -size % ALIGN
+        if padding:
+            chunks.append(b"\x00" * padding)
+            size += padding
+        return [start, len(data)]
+
+    columns = []
+    for key in keys:
+        if uniform:
+            values = [tx[key] for tx in transactions]
+        else:
+            values = [tx[key] for tx in transactions if key in tx]
+        kind, data, offsets = _encode_column(values)
+        columns.append({"key": key, "kind": kind, "count": len(values), "data": add(data),
+                        "offsets": add(offsets) if offsets is not None else None})
+
+    layout = {
+        "rows": len(transactions),
+        "shapes": [list(shape) for shape in shapes],
+        "shape_ids": None if uniform else add(array("I", shape_ids).tobytes()),
+        "columns": columns,
+    }
+    return layout, b"".join(chunks)
+
+
+class ColumnarTransactions(Sequence):
+    """
+    Read-only sequence of transaction dicts backed by decoded columns
+
+    Dicts are built on access; column(key) and values(key) return a whole column
+    without building any dicts. to_list() materialises every row once.
+    """
+
+    def __init__(self, layout: Dict, data: bytes):
+        self.layout = layout
+        self._data = memoryview(data)
+        self._columns = {}
+        self._rows = None
+        shape_ids = layout["shape_ids"]
+        self._shape_ids = self._slice(shape_ids).cast("I").tolist() if shape_ids else None
+
+    def _slice(self, span: List[int]) -> memoryview:
+        start, length = span
+        return self._data[start:start + length]
+
+    def column(self, key: str) -> List:
+        """Values of one key, in row order, for the rows that have it"""
+        values = self._columns.get(key)
+        if values is None:
+            for col in self.layout["columns"]:
+                if col["key"] == key:
+                    offsets = self._slice(col["offsets"]) if col["offsets"] else None
+                    values = _decode_column(col["kind"], self._slice(col["data"]), offsets, col["count"])
+                    break
+            else:
+                raise KeyError(key)
+            self._columns[key] = values
+        return values
+
+    def keys(self) -> List[str]:
+        return [col["key"] for col in self.layout["columns"]]
+
+    def values(self, key: str, default=None) -> List:
+        """Value of key for every row, default for rows that do not have it"""
+        if key not in self.keys():
+            return [default] * len(self)
+        if self._shape_ids is None:
+            return self.column(key)
+        has_key = [key in shape for shape in self.layout["shapes"]]
+        found = iter(self.column(key))
+        return [next(found) if has_key[index] else default for index in self._shape_ids]
+
+    def to_list(self) -> List[Dict]:
+        if self._rows is None:
+            shapes = self.layout["shapes"]
+            if self._shape_ids is None:
+                keys = shapes[0] if shapes else []
+                if keys:
+                    self._rows = [dict(zip(keys, row)) for row in zip(*[self.column(k) for k in keys])]
+                else:
+                    self._rows = [{} for _ in range(len(self))]
+            else:
+                iters = {key: iter(self.column(key)) for key in self.keys()}
+                self._rows = [{key: next(iters[key]) for key in shapes[index]} for index in self._shape_ids]
+        return self._rows
+
+    def __len__(self) -> int:
+        return self.layout["rows"]
+
+    def __getitem__(self, index):
+        if self._rows is not None or self._shape_ids is not None:
+            return self.to_list()[index]
+        # Uniform rows: build only the requested ones, e.g. one page of a table
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("ColumnarTransactions index out of range")
+        return {key: self.column(key)[index] for key in self.layout["shapes"][0]}
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, ColumnarTransactions):
+            other = other.to_list()
+        return self.to_list() == other
+
+    def __repr__(self) -> str:
+        return f"ColumnarTransactions(rows={len(self)}, columns={self.keys()})"
+
+
+def column_values(transactions, key: str, default=None) -> List:
+    """Value of key for every transaction, read from the columns when they are columnar"""
+    if isinstance(transactions, ColumnarTransactions):
+        return transactions.values(key, default)
+    return [tx.get(key, default) for tx in transactions]
+
+
+def share_transactions(transactions: List[Dict]) -> Dict:
+    """
+    Pack transactions into a new shared memory segment and return its descriptor
+
+    The segment is handed off to whoever calls attach_transactions, which unlinks it.
+    """
+    layout, data = pack_transactions(transactions)
+    descriptor = {"layout": layout, "name": None, "size": len(data)}
+    if data:
+        shm = shared_memory.SharedMemory(create=True, size=len(data))
+        shm.buf[:len(data)] = data
+        descriptor["name"] = shm.name
+        shm.close()
+        # SharedMemory registers the segment with this process's resource tracker, and
+        # attaching registers it again in the receiver's. The receiver unlinks it, so the
+        # creator's registration is dropped here; otherwise the worker's tracker reports
+        # it as leaked at exit and fails to unlink it a second time.
+        resource_tracker.unregister(shm._name, "shared_memory")
+    return descriptor
+
+
+def attach_transactions(descriptor: Dict) -> ColumnarTransactions:
+    """Copy a shared segment out, unlink it, and wrap it as ColumnarTransactions"""
+    data = b""
+    if descriptor["name"] is not None:
+        shm = shared_memory.SharedMemory(name=descriptor["name"])
+        try:
+            data = bytes(shm.buf[:descriptor["size"]])
+        finally:
+            shm.close()
+            shm.unlink()
+    return ColumnarTransactions(descriptor["layout"], data)
+
+
+def discard_transactions(descriptor: Dict) -> None:
+    """Unlink a shared segment that will never be attached (the receiver gave up on it)"""
+    if descriptor["name"] is not None:
+        shm = shared_memory.SharedMemory(name=descriptor["name"])
+        shm.close()
+        shm.unlink()
+
+
+def run_shared(func: Callable, *args, **kwargs) -> Tuple:
+    """
+    Worker side: call func, which returns (result, transactions, ...), and replace the
+    transactions with a shared memory descriptor. Submit this to the executor in
+    place of func.
+    """
+    value = func(*args, **kwargs)
+    return (value[0], share_transactions(value[1])) + tuple(value[2:])
+
+
+def receive_shared(value: Tuple, materialize: bool = True) -> Tuple:
+    """
+    Parent side: turn run_shared's return value back into (result, transactions, ...)
+
+    Args:
+        value: The tuple returned by run_shared
+        materialize: Return transactions as a list of dicts; False returns the
+            ColumnarTransactions view, which decodes columns only when used
+    """
+    transactions = attach_transactions(value[1])
+    return (value[0], transactions.to_list() if materialize else transactions) + tuple(value[2:])
+
+
+def discard_shared(future) -> None:
+    """
+    Done-callback for a run_shared future whose value will not be received: unlinks
+    its segment, which the worker has already handed off. Failed and cancelled
+    futures have no segment.
+    """
+    if not future.cancelled() and future.exception() is None:
+        discard_transactions(future.result()[1])
+
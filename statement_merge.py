@@ -0,0 +1,129 @@
+import hashlib
+import heapq
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from transaction_utils import (account_key, amount_to_minor, date_ordinal,
+                               normalize_description, type_code)
+
+
+def transaction_key(tx: Dict) -> bytes:
+    """
+    Hash identifying a transaction across overlapping statements
+
+    Built from (normalized date, amount, type, normalized description). When the
+    transaction carries a running balance (SBI) it is included too, so two identical
+    same-day debits with different balances are kept as separate transactions.
+    """
+    ordinal = date_ordinal(tx.get("Date"))
+    parts = (
+        ordinal if ordinal is not None else str(tx.get("Date")),
+        amount_to_minor(tx.get("Amount")),
+        type_code(tx.get("Type")),
+        normalize_description(tx.get("Description")),
+        amount_to_minor(tx.get("Balance")),
+    )
+    return hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=16).digest()
+
+
+def sort_transactions(transactions: Iterable[Dict]) -> List[Dict]:
+    """Stable sort by normalized date, keeping statement order within a day"""
+    return sorted(transactions, key=lambda tx: date_ordinal(tx.get("Date")) or 0)
+
+
+def merge_transaction_streams(streams: List[Iterable[Dict]],
+                              stats: Optional[Dict] = None) -> Iterator[Dict]:
+    """
+    Sort-merge date-sorted transaction streams for one account, dropping duplicates
+
+    Only one day of transactions is held in memory at a time. A transaction repeated
+    within a single statement (two identical coffees on the same day) is kept as many
+    times as the statement that lists it most often, so genuine repeats survive while
+    the copies from overlapping statements are dropped.
+
+    Args:
+        streams: Iterables of transaction dicts, each sorted by date
+        stats: Optional dict updated with 'merged' and 'duplicates' counts
+
+    Yields:
+        Transactions in date order
+    """
+    def keyed(index: int, stream: Iterable[Dict]):
+        for seq, tx in enumerate(stream):
+            yield date_ordinal(tx.get("Date")) or 0, index, seq, tx
+
+    merged = heapq.merge(*(keyed(i, s) for i, s in enumerate(streams)),
+                         key=lambda item: item[:3])
+
+    current_day = None
+    emitted = defaultdict(int)      # key -> times emitted today
+    seen = defaultdict(int)         # (stream, key) -> times seen today in that stream
+    merged_count = 0
+    duplicates = 0
+
+    for ordinal, index, _, tx in merged:
+        if ordinal != current_day:
+            current_day = ordinal
+            emitted.clear()
+            seen.clear()
+
+        key = transaction_key(tx)
+        seen[index, key] += 1
+        if seen[index, key] > emitted[key]:
+            emitted[key] += 1
+            merged_count += 1
+            yield tx
+        else:
+            duplicates += 1
+
+    if stats is not None:
+        stats["merged"] = stats.get("merged", 0) + merged_count
+        stats["duplicates"] = stats.get("duplicates", 0) + duplicates
+
+
+def merge_statements(parsed: Iterable[Tuple[Dict, Iterable[Dict]]], presorted: bool = False,
+                     stats: Optional[Dict] = None) -> Dict[str, Iterator[Dict]]:
+    """
+    Combine many parse_statement_file results into one timeline per account
+
+    Args:
+        parsed: (result, transactions) pairs as returned by parse_statement_file
+        presorted: Set when every transactions iterable is already date-sorted, so
+            they are consumed lazily instead of being sorted up front
+        stats: Optional dict updated with 'merged' and 'duplicates' counts
+
+    Returns:
+        Dict of account key ("HDFC:3458") -> iterator of merged transactions
+    """
+    by_account = defaultdict(list)
+    for result, transactions in parsed:
+        by_account[account_key(result)].append(
+            transactions if presorted else sort_transactions(transactions))
+
+    return {account: merge_transaction_streams(streams, stats)
+            for account, streams in by_account.items()}
+
+
+if __name__ == "__main__":
+    import argparse
+    import csv
+    import sys
+
+    from statement_parser import parse_statement_file
+
+    parser = argparse.ArgumentParser(description="Merge overlapping statements into one timeline per account")
+    parser.add_argument("pdfs", nargs="+", help="statement pdfs")
+    args = parser.parse_args()
+
+    stats = {}
+    timelines = merge_statements((parse_statement_file(p, export_csv=False) for p in args.pdfs), stats=stats)
+
+    writer = csv.writer(sys.stdout)
+    writer.writerow(["Account", "Date", "Description", "Type", "Amount", "Balance"])
+    for account, transactions in timelines.items():
+        for tx in transactions:
+            writer.writerow([account, tx.get("Date"), tx.get("Description"), tx.get("Type"),
+                             tx.get("Amount"), tx.get("Balance", "")])
+
+    print(f"\n{stats.get('merged', 0)} transactions kept, {stats.get('duplicates', 0)} duplicates dropped",
+          file=sys.stderr)
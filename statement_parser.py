@@ -1,6 +1,6 @@
 import os
-import csv
-from typing import List, Dict, Tuple
+import tempfile
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 # Import bank-specific parsers
 from parsers.hdfc_parser import HDFCParser
@@ -8,40 +8,109 @@ from parsers.sbi_parser import SBIParser
 from parsers.credit_card_parser import CreditCardParser
 from parsers.amex_parser import AMEXParser
 
+from boilerplate import BoilerplateStripper, transaction_line_check
+from categorizer import CATEGORY_FIELD, get_categorizer
+from exporters import get_exporter, get_exporter_class, EXPORTERS
+from instrumentation import NULL_TIMER, StageTimer, emit_timings, format_timings, timing_hooks
+from pdf_fingerprint import FingerprintTable, pdf_fingerprint
+from transaction_utils import file_sha256
+
+# Parser engine: "classic" uses the parser classes below, "spec" the declarative
+# layouts in parsers/specs.py compiled by parsers/spec_parser.py
+PARSER_ENGINE = os.environ.get("STATEMENT_PARSER_ENGINE", "classic")
+ENGINES = ("classic", "spec")
+
+# Parser class for each bank code returned by detect_bank
+PARSERS = {
+    "HDFC": HDFCParser,
+    "SBI": SBIParser,
+    "ICICI": CreditCardParser,
+    "AXIS": CreditCardParser,
+    "AMEX": AMEXParser,
+}
+
+# Summary keys printed in the statement header of each card layout. In summary_only
+# mode pages stop being read as soon as all of them have been found. SBI is absent:
+# its closing balance and totals come from the transactions, so it needs every page.
+SUMMARY_FIELDS = {
+    "HDFC": ("Statement Date", "Payment Due Date", "Total Amount Due", "Minimum Amount Due"),
+    "ICICI": ("Statement Date", "Payment Due Date", "Total Amount Due", "Minimum Amount Due"),
+    "AXIS": ("Statement Date", "Payment Due Date", "Total Amount Due", "Minimum Amount Due"),
+    "AMEX": ("Due Date", "Amount Due"),
+}
+
+# Pages searched for the summary block before summary_only reads the whole statement
+SUMMARY_SCAN_PAGES = 3
+
+# Summary keys computed from the transactions, left out of summary-only results
+TRANSACTION_SUMMARY_KEYS = ("Transactions Count", "Transaction Count", "Total Debits", "Total Credits",
+                            "Total Transactions", "Total Amount", "Net Change", "Closing Balance")
+
+# Result keys set from the fingerprints table, which are not stored in the result cache
+ROUTING_KEYS = ("routed_by", "template")
+
+
+def iter_pdf_pages(path: str) -> Iterator[Tuple[int, int, str]]:
+    """
+    Yield (page_number, page_count, text) for each page using multiple fallback methods
 
-def extract_text_from_pdf(path: str) -> str:
-    """Extract text from PDF using multiple fallback methods"""
-    text = ""
+    If a method fails part-way through, the next one resumes after the pages already yielded.
+    """
+    done = 0
     try:
         import pdfplumber
         with pdfplumber.open(path) as pdf:
+            count = len(pdf.pages)
             for page in pdf.pages:
-                ptext = page.extract_text()
-                if ptext:
-                    text += ptext + "\n"
+                ptext = page.extract_text() or ""
+                # pdf.pages keeps every page alive; drop its cached layout objects
+                # so memory stays flat instead of growing with the page count
+                if hasattr(page, "close"):
+                    page.close()
+                done += 1
+                yield done, count, ptext
+        return
     except Exception:
-        try:
-            from PyPDF2 import PdfReader
-            reader = PdfReader(path)
-            for p in reader.pages:
-                try:
-                    ptext = p.extract_text()
-                except Exception:
-                    ptext = ""
-                if ptext:
-                    text += ptext + "\n"
-        except Exception:
-            with open(path, "rb") as f:
-                raw = f.read()
+        pass
+
+    try:
+        from PyPDF2 import PdfReader
+        reader = PdfReader(path)
+        count = len(reader.pages)
+        for i, p in enumerate(reader.pages):
+            if i < done:
+                continue
             try:
-                text = raw.decode("utf-8", errors="ignore")
+                ptext = p.extract_text() or ""
             except Exception:
-                text = ""
-    return text
+                ptext = ""
+            done += 1
+            yield done, count, ptext
+        return
+    except Exception:
+        if done:
+            return
+
+    with open(path, "rb") as f:
+        raw = f.read()
+    try:
+        text = raw.decode("utf-8", errors="ignore")
+    except Exception:
+        text = ""
+    yield 1, 1, text
 
 
-def detect_bank(text: str) -> str:
+def extract_text_from_pdf(path: str) -> str:
+    """Extract text from PDF using multiple fallback methods"""
+    return "".join(ptext + "\n" for _, _, ptext in iter_pdf_pages(path) if ptext)
+
+
+def detect_bank(text: str, engine: Optional[str] = None) -> str:
     """Detect which bank the statement belongs to"""
+    if (engine or PARSER_ENGINE) == "spec":
+        from parsers.spec_parser import detect_bank_from_specs
+        return detect_bank_from_specs(text)
+
     t = text.upper()
 
     # HDFC - Credit Card
@@ -67,73 +136,432 @@ def detect_bank(text: str) -> str:
     return "UNKNOWN"
 
 
-def parse_statement_file(path: str, export_csv: bool = True, csv_path: str = None) -> Tuple[Dict, List[Dict]]:
+def get_parser(bank: str, engine: Optional[str] = None):
+    """Return a parser instance for a bank code returned by detect_bank"""
+    engine = engine or PARSER_ENGINE
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown parser engine: {engine}. Available: {', '.join(ENGINES)}")
+    if engine == "spec":
+        from parsers.spec_parser import get_spec_parser
+        parser = get_spec_parser(bank)
+        if parser is None:
+            raise Exception(f"Unsupported bank: {bank}. Please add a spec for this bank.")
+        return parser
+
+    parser_cls = PARSERS.get(bank)
+    if parser_cls is None:
+        raise Exception(f"Unsupported bank: {bank}. Please add parser for this bank.")
+    return parser_cls()
+
+
+def parse_statement_file(path: str, export_csv: bool = True, csv_path: str = None,
+                         export_format: str = "csv", store=None,
+                         on_event: Optional[Callable[[str, Dict], None]] = None,
+                         timings: bool = False, timer=None,
+                         engine: Optional[str] = None, summary_only: bool = False,
+                         strip_boilerplate: bool = False, result_cache=None,
+                         categorizer=None, fingerprints=None,
+                         pdf_hash: Optional[str] = None) -> Tuple[Dict, List[Dict]]:
     """
     Main parsing function that detects bank and routes to appropriate parser
 
+    Pages are parsed as they are extracted, so transactions are available (through
+    on_event and the exporter) long before the whole document has been read.
+
     Args:
         path: Path to PDF file
-        export_csv: Whether to export transactions to CSV
-        csv_path: Custom CSV path (optional)
+        export_csv: Whether to export transactions (streamed to the file as they are parsed)
+        csv_path: Custom export path (optional, defaults to <pdf name>_transactions.<ext>
+            next to the PDF)
+        export_format: Export format registered in exporters.EXPORTERS ("csv", "parquet", "arrow")
+        store: Optional transaction_store.TransactionStore to ingest the statement into,
+            keyed by the PDF's content hash
+        on_event: Optional callback receiving (event, data) progress events:
+            "page_extracted"  {"page", "pages"}
+            "bank_detected"   {"bank", "restarted"} - restarted=True means earlier
+                              transaction batches were discarded and will be re-sent
+            "transactions"    {"page", "transactions"} - batch parsed from one page
+            "summary_ready"   {"result"}
+        timings: Add a 'timings' block with wall/CPU time and item counts per stage
+            (result_cache, fingerprint, extract_text, detect_bank, strip_boilerplate, clean_text,
+            extract_transactions, categorize, export, join_text, extract_summary, store)
+            to the result. Export time is also included in
+            extract_transactions, which calls the exporter for each transaction.
+        timer: Optional instrumentation.StageTimer to record into (implies timings)
+        engine: "classic" or "spec" (defaults to PARSER_ENGINE, set from the
+            STATEMENT_PARSER_ENGINE environment variable)
+        summary_only: Skip transaction extraction and stop reading pages once the bank's
+            SUMMARY_FIELDS are found (searched in the first SUMMARY_SCAN_PAGES pages).
+            The result has 'summary_only': True and 'pages_read', no transaction-derived
+            keys, and the transactions list is empty. Nothing is exported or stored.
+            Banks without SUMMARY_FIELDS (SBI) get a normal full parse.
+        strip_boilerplate: Drop header/footer lines repeated from earlier pages before
+            parsing (see boilerplate.BoilerplateStripper); the lines and bytes dropped
+            are reported under 'boilerplate' in the result
+        result_cache: Optional result_cache.ResultCache. When it holds a result for this
+            PDF's content, engine and options, parsed by the current version of the bank's
+            parser, the parse is skipped: the cached transactions are still exported,
+            stored and sent as one "transactions" event (page None). Fresh results are
+            added to it.
+        categorizer: Optional categorizer.Categorizer; each page's transactions get a
+            'Category' from their Description (in one batch, before they are exported),
+            and the export gains a Category column
+        fingerprints: Optional pdf_fingerprint.FingerprintTable. When the PDF's structural
+            fingerprint maps to a single bank, that bank's parser is chosen before any
+            text is extracted and only the first page is checked against it (full-text
+            bank detection is skipped); otherwise the bank is detected from text as
+            usual and learned into the table (saving it is up to the caller). The result gains 'template' and 'routed_by'
+            ("fingerprint" or "text"; "cache" for a result_cache hit, whose template is
+            looked up in the table without learning).
+        pdf_hash: The PDF's SHA-256 when the caller has already computed it (see
+            transaction_utils.file_sha256); the store and result cache then do not hash
+            the file again
+
+    Instrumentation is also switched on while any hook registered with
+    instrumentation.add_timing_hook is present; the hooks receive (path, timings).
 
     Returns:
         Tuple of (result_dict, transactions_list)
     """
-    # Extract text from PDF
-    text = extract_text_from_pdf(path)
+    def emit(event: str, data: Dict) -> None:
+        if on_event:
+            on_event(event, data)
+
+    hooks = timing_hooks()
+    if timer is None:
+        timer = StageTimer() if timings or hooks else NULL_TIMER
+    else:
+        timings = True
+
+    bank = "UNKNOWN"
+    parser = None
+    summary_mode = False    # summary_only and the detected bank has a header summary block
+    summary = None
+    stripper = None
+    raw_pages = []          # (page_number, text) of every non-empty page
+    cleaned_pages = []      # parser.clean_text output of pages already parsed
+    transactions = []
 
-    # Detect bank
-    bank = detect_bank(text)
+    # Exporter is opened on the first transaction so empty statements write no file
+    exporter = None
+    if export_csv and not csv_path:
+        ext = get_exporter_class(export_format).extension
+        csv_path = os.path.splitext(path)[0] + "_transactions" + ext
+
+    def sink(tx: Dict) -> None:
+        nonlocal exporter
+        if exporter is None:
+            exporter = get_exporter(export_format, csv_path, bank,
+                                    extra_fields=[CATEGORY_FIELD] if categorizer is not None else None)
+        if timer.enabled:
+            with timer.stage("export"):
+                exporter.write(tx)
+            timer.count("export", rows=1)
+        else:
+            exporter.write(tx)
+
+    def parse_page(page_number: int, page_text: str) -> None:
+        # clean_text and the transaction patterns work line by line, so parsing
+        # page by page gives the same result as parsing the joined text
+        if stripper is not None:
+            with timer.stage("strip_boilerplate"):
+                page_text = stripper.strip(page_text)
+        with timer.stage("clean_text"):
+            cleaned = parser.clean_text(page_text)
+        cleaned_pages.append(cleaned)
+        if summary_mode:
+            timer.count("clean_text", chars=len(page_text))
+            return
+        # With a categorizer, transactions are exported after the page is categorised
+        stream = sink if export_csv and categorizer is None else None
+        with timer.stage("extract_transactions"):
+            batch = parser.extract_transactions(cleaned, stream)
+        if categorizer is not None and batch:
+            with timer.stage("categorize"):
+                categorizer.categorize_transactions(batch)
+            timer.count("categorize", transactions=len(batch))
+            if export_csv:
+                for tx in batch:
+                    sink(tx)
+        transactions.extend(batch)
+        if timer.enabled:
+            timer.count("clean_text", chars=len(page_text), lines=page_text.count("\n") + 1)
+            timer.count("extract_transactions", lines=cleaned.count("\n") + 1, transactions=len(batch))
+        if batch:
+            emit("transactions", {"page": page_number, "transactions": batch})
+
+    def start_parser(detected: str, restarted: bool = False) -> None:
+        nonlocal bank, parser, exporter, summary_mode, stripper
+        bank = detected
+        # Route to appropriate parser
+        parser = get_parser(bank, engine)
+        summary_mode = summary_only and bank in SUMMARY_FIELDS
+        if strip_boilerplate:
+            stripper = BoilerplateStripper(keep=transaction_line_check(parser))
+        if restarted:
+            cleaned_pages.clear()
+            transactions.clear()
+            if exporter is not None:
+                exporter.close()
+                exporter = None
+        emit("bank_detected", {"bank": bank, "restarted": restarted})
+        for page_number, page_text in raw_pages:
+            parse_page(page_number, page_text)
+
+    def summary_found() -> bool:
+        """Run the summary over the pages read so far; True once every SUMMARY_FIELDS key is present"""
+        nonlocal summary
+        cleaned_text = "".join(cleaned + "\n" for cleaned in cleaned_pages)
+        with timer.stage("extract_summary"):
+            summary = parser.extract_summary(cleaned_text, transactions)
+        timer.count("extract_summary", chars=len(cleaned_text))
+        return all(key in summary for key in SUMMARY_FIELDS[bank])
+
+    def finish(result: Dict) -> Tuple[Dict, List[Dict]]:
+        if exporter is not None:
+            result[f'transactions_{export_format.lower()}'] = os.path.abspath(csv_path)
+
+        if store is not None and not result.get('summary_only'):
+            with timer.stage("store"):
+                store.ingest(result, transactions, pdf_hash or file_sha256(path), source=os.path.abspath(path))
+            timer.count("store", transactions=len(transactions))
+
+        if timer.enabled:
+            report = timer.report()
+            if timings:
+                result['timings'] = report
+            emit_timings(path, report)
+
+        emit("summary_ready", {"result": result})
+
+        return result, transactions
+
+    if result_cache is not None:
+        with timer.stage("result_cache"):
+            pdf_hash = pdf_hash or file_sha256(path)
+            cache_key = result_cache.entry_key(
+                pdf_hash, engine, summary_only=summary_only, strip_boilerplate=strip_boilerplate,
+                categories=categorizer.fingerprint if categorizer is not None else None)
+            cached = result_cache.get(cache_key)
+        timer.count("result_cache", hits=int(cached is not None))
+        if cached is not None:
+            result, transactions = cached
+            bank = result["bank"]
+            if fingerprints is not None:
+                # Routing fields are not cached: they come from the table passed in, not the PDF
+                with timer.stage("fingerprint"):
+                    route = fingerprints.lookup(pdf_fingerprint(path)[0])
+                result['routed_by'] = "cache"
+                result['template'] = route["template"] if route is not None else None
+            emit("bank_detected", {"bank": bank, "restarted": False})
+            if transactions:
+                if export_csv:
+                    try:
+                        for tx in transactions:
+                            sink(tx)
+                    finally:
+                        if exporter is not None:
+                            with timer.stage("export"):
+                                exporter.close()
+                emit("transactions", {"page": None, "transactions": transactions})
+            return finish(result)
+
+    route = None
+    if fingerprints is not None:
+        with timer.stage("fingerprint"):
+            fingerprint, features = pdf_fingerprint(path)
+            route = fingerprints.lookup(fingerprint)
+        timer.count("fingerprint", hits=int(route is not None))
+        if route is not None:
+            start_parser(route["bank"])
+
+    pages = iter_pdf_pages(path)
+    stopped_early = False
+    try:
+        # Extract text page by page, detecting the bank from the first page with text
+        for page_number, page_count, page_text in timer.timed_iter("extract_text", pages):
+            emit("page_extracted", {"page": page_number, "pages": page_count})
+            timer.count("extract_text", pages=1, chars=len(page_text))
+            if not page_text:
+                continue
+            raw_pages.append((page_number, page_text))
+            if route is not None and len(raw_pages) == 1:
+                # Different banks can share a statement generator; the first page's
+                # text must not name another bank
+                with timer.stage("detect_bank"):
+                    detected = detect_bank(page_text + "\n", engine)
+                timer.count("detect_bank", chars=len(page_text) + 1)
+                if detected in ("UNKNOWN", bank):
+                    parse_page(page_number, page_text)
+                else:
+                    # Fall back to text detection; the fingerprint is learned for
+                    # this bank too below, which makes it ambiguous
+                    route = None
+                    start_parser(detected, restarted=True)
+            elif parser is not None:
+                parse_page(page_number, page_text)
+            elif len(raw_pages) == 1:
+                with timer.stage("detect_bank"):
+                    detected = detect_bank(page_text + "\n", engine)
+                timer.count("detect_bank", chars=len(page_text) + 1)
+                if detected != "UNKNOWN":
+                    start_parser(detected)
+
+            if summary_mode and len(cleaned_pages) <= SUMMARY_SCAN_PAGES and summary_found():
+                stopped_early = True
+                break
+
+        if not stopped_early:
+            if route is None:
+                # Detect bank on the full text, which decides when pages disagree
+                with timer.stage("join_text"):
+                    text = "".join(page_text + "\n" for _, page_text in raw_pages)
+                with timer.stage("detect_bank"):
+                    detected = detect_bank(text, engine)
+                timer.count("detect_bank", chars=len(text))
+                if parser is None:
+                    start_parser(detected)
+                elif detected != bank:
+                    start_parser(detected, restarted=True)
+
+            with timer.stage("join_text"):
+                cleaned_text = "".join(cleaned + "\n" for cleaned in cleaned_pages)
+            with timer.stage("extract_summary"):
+                summary = parser.extract_summary(cleaned_text, transactions)
+            timer.count("extract_summary", chars=len(cleaned_text))
+    finally:
+        # Closes the PDF when summary_only stopped before the last page
+        pages.close()
+        if exporter is not None:
+            with timer.stage("export"):
+                exporter.close()
 
     # Initialize result
     result = {"bank": bank}
-    transactions = []
+    result.update(summary)
 
-    # Route to appropriate parser
-    if bank == "HDFC":
-        parser = HDFCParser()
-        summary, transactions = parser.parse(text)
-        result.update(summary)
+    if summary_mode:
+        for key in TRANSACTION_SUMMARY_KEYS:
+            result.pop(key, None)
+        result['summary_only'] = True
+        result['pages_read'] = len(raw_pages)
+    else:
+        # Add transaction count
+        result['transactions_count'] = len(transactions)
 
-    elif bank == "SBI":
-        parser = SBIParser()
-        summary, transactions = parser.parse(text)
-        result.update(summary)
+    if stripper is not None:
+        result['boilerplate'] = stripper.stats()
 
-    elif bank in ["ICICI", "AXIS"]:
-        parser = CreditCardParser()
-        summary, transactions = parser.parse(text)
-        result.update(summary)
+    if fingerprints is not None:
+        result['routed_by'] = "fingerprint" if route is not None else "text"
+        if route is None and bank != "UNKNOWN":
+            route = fingerprints.learn(fingerprint, bank, features)
+        result['template'] = route["template"] if route is not None else None
 
-    elif bank == "AMEX":
-        parser = AMEXParser()
-        summary, transactions = parser.parse(text)
-        result.update(summary)
+    if result_cache is not None:
+        with timer.stage("result_cache"):
+            cacheable = {key: value for key, value in result.items() if key not in ROUTING_KEYS}
+            result_cache.put(cache_key, pdf_hash, cacheable, transactions, engine)
 
-    else:
-        raise Exception(f"Unsupported bank: {bank}. Please add parser for this bank.")
+    return finish(result)
 
-    # Add transaction count
-    result['transactions_count'] = len(transactions)
 
-    # Export transactions to CSV if requested
-    if export_csv and transactions:
-        if not csv_path:
-            base = os.path.splitext(os.path.basename(path))[0]
-            csv_path = base + "_transactions.csv"
+def parse_statement_bytes(data: bytes, **kwargs) -> Tuple[Dict, List[Dict]]:
+    """
+    Parse a PDF held in memory (e.g. an upload) through a temporary file that is removed afterwards
 
-        # Get field names from first transaction
-        fieldnames = list(transactions[0].keys()) if transactions else []
+    Args:
+        data: PDF file contents
+        **kwargs: Passed to parse_statement_file (export_csv defaults to False)
 
-        with open(csv_path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            for tx in transactions:
-                writer.writerow(tx)
+    Returns:
+        Tuple of (result_dict, transactions_list)
+    """
+    kwargs.setdefault("export_csv", False)
+    tf = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
+    try:
+        tf.write(data)
+        tf.close()
+        return parse_statement_file(tf.name, **kwargs)
+    finally:
+        os.unlink(tf.name)
+
+
+class LazyStatement:
+    """
+    Statement result that reads only the summary block up front
 
-        result['transactions_csv'] = os.path.abspath(csv_path)
+    The summary comes from a summary_only parse. Transactions, and the summary keys
+    derived from them, trigger a full parse the first time they are accessed; after
+    that the full result is used for every lookup.
 
-    return result, transactions
+        stmt = LazyStatement("statement.pdf")
+        stmt["Total Amount Due"]      # first pages only
+        stmt.transactions             # full parse, cached
+    """
+
+    def __init__(self, path: str, **parse_kwargs):
+        parse_kwargs.setdefault("export_csv", False)
+        parse_kwargs.pop("summary_only", None)
+        self.path = path
+        self._kwargs = parse_kwargs
+        self._summary = None
+        self._result = None
+        self._transactions = None
+
+    @property
+    def loaded(self) -> bool:
+        """Whether transactions have been parsed"""
+        return self._transactions is not None
+
+    def _load(self) -> None:
+        if self._transactions is None:
+            self._result, self._transactions = parse_statement_file(self.path, **self._kwargs)
+
+    @property
+    def summary(self) -> Dict:
+        """Summary fields; the full result once transactions are loaded"""
+        if self._result is not None:
+            return self._result
+        if self._summary is None:
+            summary, transactions = parse_statement_file(self.path, summary_only=True, **self._kwargs)
+            if not summary.get("summary_only"):
+                # The bank needs a full parse for its summary (SBI), so keep everything
+                self._result, self._transactions = summary, transactions
+                return summary
+            self._summary = summary
+        return self._summary
+
+    @property
+    def result(self) -> Dict:
+        self._load()
+        return self._result
+
+    @property
+    def transactions(self) -> List[Dict]:
+        self._load()
+        return self._transactions
+
+    def __getitem__(self, key: str):
+        summary = self.summary
+        if key in summary:
+            return summary[key]
+        if not self.loaded and (key in TRANSACTION_SUMMARY_KEYS or key.startswith("transactions_")):
+            return self.result[key]
+        raise KeyError(key)
+
+    def __contains__(self, key: str) -> bool:
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def get(self, key: str, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
 
 
 if __name__ == "__main__":
@@ -143,11 +571,55 @@ if __name__ == "__main__":
 
     parser = argparse.ArgumentParser(description="Parse bank statements and export CSV")
     parser.add_argument("pdf", help="path to statement pdf")
-    parser.add_argument("--csv", help="path to export csv (optional)", default=None)
+    parser.add_argument("--csv", help="path to export file (optional)", default=None)
+    parser.add_argument("--format", help="export format (default: csv)", default="csv",
+                        choices=sorted(EXPORTERS))
+    parser.add_argument("--progress", action="store_true", help="print progress events to stderr")
+    parser.add_argument("--timings", action="store_true", help="print per-stage timings")
+    parser.add_argument("--summary-only", action="store_true",
+                        help="print only the summary, reading as few pages as possible")
+    parser.add_argument("--engine", choices=ENGINES, default=None, help="parser engine (default: classic)")
+    parser.add_argument("--cache", default=None, help="result cache database, reused across runs (optional)")
+    parser.add_argument("--categorize", action="store_true", help="add a merchant Category to each transaction")
+    parser.add_argument("--fingerprints", default=None,
+                        help="fingerprint table routing PDFs to a bank by structure, learned across runs (optional)")
     args = parser.parse_args()
 
-    res, txs = parse_statement_file(args.pdf, export_csv=True, csv_path=args.csv)
+    def print_event(event: str, data: Dict) -> None:
+        import sys
+        if event == "page_extracted":
+            print(f"[page {data['page']}/{data['pages']}]", file=sys.stderr)
+        elif event == "bank_detected":
+            print(f"[bank {data['bank']}{' (restarted)' if data['restarted'] else ''}]", file=sys.stderr)
+        elif event == "transactions":
+            print(f"[{len(data['transactions'])} transactions from page {data['page']}]", file=sys.stderr)
+        elif event == "summary_ready":
+            print("[summary ready]", file=sys.stderr)
+
+    result_cache = None
+    if args.cache:
+        from result_cache import ResultCache
+        result_cache = ResultCache(args.cache)
+
+    fingerprints = None
+    if args.fingerprints:
+        fingerprints = FingerprintTable(args.fingerprints)
+
+    res, txs = parse_statement_file(args.pdf, export_csv=True, csv_path=args.csv,
+                                    export_format=args.format, timings=args.timings, engine=args.engine,
+                                    summary_only=args.summary_only, result_cache=result_cache,
+                                    categorizer=get_categorizer() if args.categorize else None,
+                                    fingerprints=fingerprints,
+                                    on_event=print_event if args.progress else None)
+    if fingerprints is not None:
+        fingerprints.save()
+    stage_timings = res.pop("timings", None)
     print(json.dumps(res, indent=4))
+    if args.timings:
+        print()
+        print(format_timings(stage_timings))
+    if not txs:
+        raise SystemExit(0)
     print(f"\nSample transactions (first 10):")
     import itertools
 
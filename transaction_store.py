@@ -0,0 +1,586 @@
+import json
+import sqlite3
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional
+
+from transaction_utils import (account_key, amount_to_minor, date_ordinal,
+                               file_sha256, type_code, TYPE_CREDIT, TYPE_DEBIT)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS accounts (
+    id INTEGER PRIMARY KEY,
+    account_key TEXT NOT NULL UNIQUE,
+    bank TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS statements (
+    id INTEGER PRIMARY KEY,
+    statement_hash TEXT NOT NULL UNIQUE,
+    account_id INTEGER NOT NULL REFERENCES accounts(id),
+    source TEXT,
+    summary TEXT NOT NULL,
+    transactions_count INTEGER NOT NULL,
+    ingested_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS transactions (
+    id INTEGER PRIMARY KEY,
+    statement_id INTEGER NOT NULL REFERENCES statements(id),
+    account_id INTEGER NOT NULL REFERENCES accounts(id),
+    seq INTEGER NOT NULL,
+    date_text TEXT,
+    date_ordinal INTEGER,
+    description TEXT,
+    type_code INTEGER,
+    amount_minor INTEGER,
+    balance_minor INTEGER
+);
+
+CREATE INDEX IF NOT EXISTS idx_transactions_account_date ON transactions(account_id, date_ordinal);
+CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions(date_ordinal);
+CREATE INDEX IF NOT EXISTS idx_transactions_amount ON transactions(amount_minor);
+CREATE INDEX IF NOT EXISTS idx_transactions_statement ON transactions(statement_id);
+"""
+
+# External-content FTS5 index over transaction descriptions, maintained explicitly
+# per statement so bulk inserts don't pay for a trigger on every row
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts USING fts5(
+    description, content='transactions', content_rowid='id'
+);
+"""
+
+# Monthly aggregates per account, transaction type and category. statement_rollups holds
+# each statement's own contribution so it can be taken out again when the statement is
+# replaced or removed; monthly_rollups is the running total dashboards read.
+# month is "YYYY-MM" ("" for unrecognised dates), type_code -1 for unrecognised types,
+# category "" for uncategorised transactions.
+ROLLUP_SCHEMA = """
+CREATE TABLE IF NOT EXISTS statement_rollups (
+    statement_id INTEGER NOT NULL REFERENCES statements(id),
+    month TEXT NOT NULL,
+    account_id INTEGER NOT NULL REFERENCES accounts(id),
+    type_code INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    total_minor INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    min_minor INTEGER NOT NULL,
+    max_minor INTEGER NOT NULL,
+    PRIMARY KEY (statement_id, month, type_code, category)
+);
+
+CREATE INDEX IF NOT EXISTS idx_statement_rollups_cell
+    ON statement_rollups(month, account_id, type_code, category);
+
+CREATE TABLE IF NOT EXISTS monthly_rollups (
+    month TEXT NOT NULL,
+    account_id INTEGER NOT NULL REFERENCES accounts(id),
+    type_code INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    total_minor INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    min_minor INTEGER NOT NULL,
+    max_minor INTEGER NOT NULL,
+    PRIMARY KEY (month, account_id, type_code, category)
+) WITHOUT ROWID;
+"""
+
+UPSERT_MONTHLY_ROLLUP = """
+INSERT INTO monthly_rollups (month, account_id, type_code, category, total_minor, count, min_minor, max_minor)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (month, account_id, type_code, category) DO UPDATE SET
+    total_minor = total_minor + excluded.total_minor,
+    count = count + excluded.count,
+    min_minor = MIN(min_minor, excluded.min_minor),
+    max_minor = MAX(max_minor, excluded.max_minor)
+"""
+
+# Rollup dimensions accepted by TransactionStore.monthly_rollups(group_by=...)
+ROLLUP_DIMENSIONS = {
+    "month": "r.month",
+    "account": "a.account_key",
+    "bank": "a.bank",
+    "type": "r.type_code",
+    "category": "r.category",
+}
+
+INSERT_TRANSACTION = """
+INSERT INTO transactions (statement_id, account_id, seq, date_text, date_ordinal,
+                          description, type_code, amount_minor, balance_minor)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _to_ordinal(value) -> Optional[int]:
+    """Accept a date, datetime or statement date string and return its ordinal"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date().toordinal()
+    if isinstance(value, date):
+        return value.toordinal()
+    return date_ordinal(value)
+
+
+def _type_code(txn_type: str) -> int:
+    code = type_code(txn_type)
+    if code is None:
+        raise ValueError(f"Unknown transaction type: {txn_type}. Expected DEBIT/DR or CREDIT/CR")
+    return code
+
+
+def _fts_query(text: str) -> str:
+    """Quote every word as an FTS5 phrase, so characters such as '-' or ':' are not query syntax"""
+    return " ".join('"' + word.replace('"', '""') + '"' for word in text.split())
+
+
+def _month(ordinal: Optional[int]) -> str:
+    if ordinal is None:
+        return ""
+    d = date.fromordinal(ordinal)
+    return f"{d.year:04d}-{d.month:02d}"
+
+
+def statement_rollups(rows: Iterable[tuple], categories: Iterable[Optional[str]]) -> Dict[tuple, List]:
+    """
+    One statement's contribution to the monthly rollups
+
+    Args:
+        rows: INSERT_TRANSACTION parameter tuples for the statement's transactions
+        categories: Category of each row (None when uncategorised)
+
+    Returns:
+        {(month, type_code, category): [total_minor, count, min_minor, max_minor]}
+    """
+    cells = {}
+    months = {}
+    for row, category in zip(rows, categories):
+        amount = row[7]
+        if amount is None:
+            continue
+        ordinal = row[4]
+        month = months.get(ordinal)
+        if month is None:
+            month = months[ordinal] = _month(ordinal)
+        key = (month, -1 if row[6] is None else row[6], category or "")
+        cell = cells.get(key)
+        if cell is None:
+            cells[key] = [amount, 1, amount, amount]
+        else:
+            cell[0] += amount
+            cell[1] += 1
+            if amount < cell[2]:
+                cell[2] = amount
+            elif amount > cell[3]:
+                cell[3] = amount
+    return cells
+
+
+class TransactionStore:
+    """SQLite store for parsed statements and their transactions"""
+
+    def __init__(self, path: str = "transactions.db"):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+
+        # WAL lets dashboards read while a batch ingest is writing
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute("PRAGMA cache_size=-65536")
+
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+            has_rollups = self.conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'monthly_rollups'").fetchone() is not None
+            self.conn.executescript(ROLLUP_SCHEMA)
+            if not has_rollups:
+                # Databases created before rollups existed are backfilled once
+                self._rebuild_rollups()
+            try:
+                self.conn.executescript(FTS_SCHEMA)
+                self.has_fts = True
+            except sqlite3.OperationalError:
+                # SQLite built without FTS5 - fall back to LIKE queries
+                self.has_fts = False
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def _account_id(self, result: Dict) -> int:
+        key = account_key(result)
+        bank = result.get("bank", result.get("Bank", "UNKNOWN"))
+        self.conn.execute("INSERT OR IGNORE INTO accounts (account_key, bank) VALUES (?, ?)", (key, bank))
+        row = self.conn.execute("SELECT id FROM accounts WHERE account_key = ?", (key,)).fetchone()
+        return row[0]
+
+    def _delete_statement_rows(self, statement_id: int) -> None:
+        if self.has_fts:
+            self.conn.execute(
+                "INSERT INTO transactions_fts (transactions_fts, rowid, description) "
+                "SELECT 'delete', id, description FROM transactions WHERE statement_id = ?",
+                (statement_id,))
+        self.conn.execute("DELETE FROM transactions WHERE statement_id = ?", (statement_id,))
+        self._remove_rollups(statement_id)
+
+    def _add_rollups(self, statement_id: int, account_id: int, cells: Dict[tuple, List]) -> None:
+        self.conn.executemany(
+            "INSERT INTO statement_rollups (statement_id, month, account_id, type_code, category, "
+            "total_minor, count, min_minor, max_minor) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            ((statement_id, month, account_id, code, category, *cell)
+             for (month, code, category), cell in cells.items()))
+        self.conn.executemany(UPSERT_MONTHLY_ROLLUP, (
+            (month, account_id, code, category, *cell) for (month, code, category), cell in cells.items()))
+
+    def _remove_rollups(self, statement_id: int) -> None:
+        """Take a statement's contribution out of monthly_rollups"""
+        cells = self.conn.execute(
+            "SELECT month, account_id, type_code, category FROM statement_rollups WHERE statement_id = ?",
+            (statement_id,)).fetchall()
+        if not cells:
+            return
+        self.conn.execute("DELETE FROM statement_rollups WHERE statement_id = ?", (statement_id,))
+        # Each touched cell is recomputed from the contributions of the statements still
+        # in it (min and max cannot be subtracted), never from the transactions
+        self.conn.executemany(
+            "DELETE FROM monthly_rollups WHERE month = ? AND account_id = ? AND type_code = ? AND category = ?",
+            cells)
+        self.conn.executemany(
+            "INSERT INTO monthly_rollups SELECT month, account_id, type_code, category, SUM(total_minor), "
+            "SUM(count), MIN(min_minor), MAX(max_minor) FROM statement_rollups "
+            "WHERE month = ? AND account_id = ? AND type_code = ? AND category = ? "
+            "GROUP BY month, account_id, type_code, category",
+            cells)
+
+    def _rebuild_rollups(self) -> None:
+        """Recompute every rollup from the stored transactions (categories are not stored)"""
+        self.conn.execute("DELETE FROM statement_rollups")
+        self.conn.execute("DELETE FROM monthly_rollups")
+        statements = self.conn.execute("SELECT id, account_id FROM statements").fetchall()
+        for statement_id, account_id in statements:
+            rows = self.conn.execute(
+                "SELECT statement_id, account_id, seq, date_text, date_ordinal, description, type_code, "
+                "amount_minor, balance_minor FROM transactions WHERE statement_id = ?",
+                (statement_id,)).fetchall()
+            self._add_rollups(statement_id, account_id, statement_rollups(rows, [None] * len(rows)))
+
+    def ingest(self, result: Dict, transactions: List[Dict], statement_hash: str,
+               source: Optional[str] = None) -> int:
+        """
+        Insert or replace one parsed statement
+
+        Re-ingesting a statement with the same hash replaces its rows, so the call is idempotent.
+        The statement's contribution to the monthly rollups is added (or replaced) in the
+        same transaction.
+
+        Args:
+            result: Result dict from parse_statement_file
+            transactions: Transactions list from parse_statement_file
+            statement_hash: Content hash of the source PDF (see transaction_utils.file_sha256)
+            source: Optional source path recorded with the statement
+
+        Returns:
+            Statement id
+        """
+        # Export file paths (transactions_csv, transactions_parquet, ...) are not part of the summary
+        summary = {k: v for k, v in result.items()
+                   if k == "transactions_count" or not k.startswith("transactions_")}
+
+        with self.conn:
+            account_id = self._account_id(result)
+            row = self.conn.execute("SELECT id FROM statements WHERE statement_hash = ?",
+                                    (statement_hash,)).fetchone()
+            values = (account_id, source, json.dumps(summary, default=str), len(transactions),
+                      datetime.now().isoformat(timespec="seconds"))
+
+            if row:
+                statement_id = row[0]
+                self._delete_statement_rows(statement_id)
+                self.conn.execute(
+                    "UPDATE statements SET account_id = ?, source = ?, summary = ?, "
+                    "transactions_count = ?, ingested_at = ? WHERE id = ?",
+                    values + (statement_id,))
+            else:
+                cur = self.conn.execute(
+                    "INSERT INTO statements (account_id, source, summary, transactions_count, "
+                    "ingested_at, statement_hash) VALUES (?, ?, ?, ?, ?, ?)",
+                    values + (statement_hash,))
+                statement_id = cur.lastrowid
+
+            rows = [
+                (statement_id, account_id, seq, tx.get("Date"), date_ordinal(tx.get("Date")),
+                 tx.get("Description"), type_code(tx.get("Type")),
+                 amount_to_minor(tx.get("Amount")), amount_to_minor(tx.get("Balance")))
+                for seq, tx in enumerate(transactions)
+            ]
+            self.conn.executemany(INSERT_TRANSACTION, rows)
+            self._add_rollups(statement_id, account_id,
+                              statement_rollups(rows, (tx.get("Category") for tx in transactions)))
+
+            if self.has_fts:
+                self.conn.execute(
+                    "INSERT INTO transactions_fts (rowid, description) "
+                    "SELECT id, description FROM transactions WHERE statement_id = ?",
+                    (statement_id,))
+
+        return statement_id
+
+    def remove_statement(self, statement_hash: str) -> bool:
+        """Delete a statement and its transactions. Returns False if it was not stored"""
+        with self.conn:
+            row = self.conn.execute("SELECT id FROM statements WHERE statement_hash = ?",
+                                    (statement_hash,)).fetchone()
+            if not row:
+                return False
+            self._delete_statement_rows(row[0])
+            self.conn.execute("DELETE FROM statements WHERE id = ?", (row[0],))
+        return True
+
+    def has_statement(self, statement_hash: str) -> bool:
+        row = self.conn.execute("SELECT 1 FROM statements WHERE statement_hash = ?",
+                                (statement_hash,)).fetchone()
+        return row is not None
+
+    def search(self, text: Optional[str] = None, account: Optional[str] = None,
+               start=None, end=None, min_amount: Optional[float] = None,
+               max_amount: Optional[float] = None, txn_type: Optional[str] = None,
+               limit: Optional[int] = 1000) -> List[Dict]:
+        """
+        Query transactions across all stored statements
+
+        Args:
+            text: Words that must all occur in the description (e.g. "swiggy", "7-eleven")
+            account: Account key such as "HDFC:3458"
+            start, end: Inclusive date bounds (date objects or statement date strings)
+            min_amount, max_amount: Inclusive amount bounds
+            txn_type: "DEBIT"/"DR"/"Debit" or "CREDIT"/"CR"/"Credit"
+            limit: Maximum rows to return (None for all)
+
+        Returns:
+            List of transaction dicts ordered by date
+        """
+        clauses = []
+        params = []
+
+        if text and text.strip():
+            if self.has_fts:
+                clauses.append("t.id IN (SELECT rowid FROM transactions_fts WHERE transactions_fts MATCH ?)")
+                params.append(_fts_query(text))
+            else:
+                clauses.append("t.description LIKE ?")
+                params.append(f"%{text}%")
+        if account:
+            clauses.append("a.account_key = ?")
+            params.append(account)
+        if start is not None:
+            clauses.append("t.date_ordinal >= ?")
+            params.append(_to_ordinal(start))
+        if end is not None:
+            clauses.append("t.date_ordinal <= ?")
+            params.append(_to_ordinal(end))
+        if min_amount is not None:
+            clauses.append("t.amount_minor >= ?")
+            params.append(amount_to_minor(min_amount))
+        if max_amount is not None:
+            clauses.append("t.amount_minor <= ?")
+            params.append(amount_to_minor(max_amount))
+        if txn_type:
+            clauses.append("t.type_code = ?")
+            params.append(_type_code(txn_type))
+
+        sql = ("SELECT a.account_key, a.bank, t.date_text, t.date_ordinal, t.description, "
+               "t.type_code, t.amount_minor, t.balance_minor "
+               "FROM transactions t JOIN accounts a ON a.id = t.account_id")
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY t.date_ordinal, t.statement_id, t.seq"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        rows = []
+        for r in self.conn.execute(sql, params):
+            tx = {
+                "Account": r["account_key"],
+                "Bank": r["bank"],
+                "Date": r["date_text"],
+                "Description": r["description"],
+                "Type": "CREDIT" if r["type_code"] == 1 else "DEBIT",
+                "Amount": r["amount_minor"] / 100 if r["amount_minor"] is not None else None,
+            }
+            if r["balance_minor"] is not None:
+                tx["Balance"] = r["balance_minor"] / 100
+            rows.append(tx)
+        return rows
+
+    def monthly_rollups(self, account: Optional[str] = None, bank: Optional[str] = None,
+                        txn_type: Optional[str] = None, category: Optional[str] = None,
+                        start_month: Optional[str] = None, end_month: Optional[str] = None,
+                        group_by: Iterable[str] = ("month", "account", "type", "category")) -> List[Dict]:
+        """
+        Monthly totals read from the incrementally maintained rollups
+
+        The cost depends on the number of rollup cells (months x accounts x types x
+        categories), not on the number of stored transactions.
+
+        Args:
+            account: Account key such as "HDFC:3458"
+            bank: Bank code such as "HDFC"
+            txn_type: "DEBIT"/"DR"/"Debit" or "CREDIT"/"CR"/"Credit"
+            category: Category set by categorizer.Categorizer ("" for uncategorised)
+            start_month, end_month: Inclusive "YYYY-MM" bounds
+            group_by: Dimensions to keep, from ROLLUP_DIMENSIONS; the others are summed over
+
+        Returns:
+            List of dicts with the group_by keys plus Total, Count, Min and Max, ordered by
+            the group_by keys
+        """
+        group_by = list(group_by)
+        unknown = [g for g in group_by if g not in ROLLUP_DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Unknown rollup dimension: {', '.join(unknown)}. "
+                             f"Available: {', '.join(ROLLUP_DIMENSIONS)}")
+
+        clauses = []
+        params = []
+        if account:
+            clauses.append("a.account_key = ?")
+            params.append(account)
+        if bank:
+            clauses.append("a.bank = ?")
+            params.append(bank)
+        if txn_type:
+            clauses.append("r.type_code = ?")
+            params.append(_type_code(txn_type))
+        if category is not None:
+            clauses.append("r.category = ?")
+            params.append(category)
+        if start_month:
+            clauses.append("r.month >= ?")
+            params.append(start_month)
+        if end_month:
+            clauses.append("r.month <= ?")
+            params.append(end_month)
+
+        columns = [f"{ROLLUP_DIMENSIONS[g]} AS {g}" for g in group_by]
+        columns += ["SUM(r.total_minor) AS total", "SUM(r.count) AS count",
+                    "MIN(r.min_minor) AS min", "MAX(r.max_minor) AS max"]
+        sql = f"SELECT {', '.join(columns)} FROM monthly_rollups r JOIN accounts a ON a.id = r.account_id"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        if group_by:
+            keys = ", ".join(ROLLUP_DIMENSIONS[g] for g in group_by)
+            sql += f" GROUP BY {keys} ORDER BY {keys}"
+
+        rollups = []
+        for r in self.conn.execute(sql, params):
+            if r["count"] is None:
+                continue
+            row = {}
+            for g in group_by:
+                value = r[g]
+                if g == "type":
+                    value = {TYPE_DEBIT: "DEBIT", TYPE_CREDIT: "CREDIT"}.get(value, "UNKNOWN")
+                row[g.capitalize()] = value
+            row.update({"Total": r["total"] / 100, "Count": r["count"],
+                        "Min": r["min"] / 100, "Max": r["max"] / 100})
+            rollups.append(row)
+        return rollups
+
+    def statements(self) -> List[Dict]:
+        """List stored statements with their summary dicts"""
+        rows = self.conn.execute(
+            "SELECT s.statement_hash, s.source, s.summary, s.transactions_count, s.ingested_at, "
+            "a.account_key FROM statements s JOIN accounts a ON a.id = s.account_id ORDER BY s.id")
+        return [{
+            "statement_hash": r["statement_hash"],
+            "account": r["account_key"],
+            "source": r["source"],
+            "summary": json.loads(r["summary"]),
+            "transactions_count": r["transactions_count"],
+            "ingested_at": r["ingested_at"],
+        } for r in rows]
+
+
+def ingest_files(paths: Iterable[str], store: TransactionStore, skip_existing: bool = True,
+                 duplicates=None, **parse_kwargs) -> List[Dict]:
+    """
+    Batch-ingest PDF statements into a store
+
+    Args:
+        paths: PDF paths
+        store: Target TransactionStore
+        skip_existing: Skip files whose content hash is already stored
+        duplicates: Optional near_duplicates.DuplicateIndex. Files whose first page is a
+            near-duplicate of an ingested statement (re-downloads, re-exports) are not
+            parsed; they are linked to the original in the index and reported with
+            status "duplicate". Ingested files are added to the index.
+        **parse_kwargs: Passed through to parse_statement_file
+
+    Returns:
+        One status dict per path
+    """
+    from statement_parser import parse_statement_file
+
+    parse_kwargs.setdefault("export_csv", False)
+    report = []
+    for path in paths:
+        statement_hash = file_sha256(path)
+        if skip_existing and store.has_statement(statement_hash):
+            report.append({"path": path, "status": "skipped"})
+            continue
+        try:
+            if duplicates is not None:
+                match, signature, bank = duplicates.check(path, statement_hash)
+                if match is not None and store.has_statement(match["key"]):
+                    duplicates.link(statement_hash, match["key"], match["similarity"], ref=path)
+                    report.append({"path": path, "status": "duplicate", "duplicate_of": match["key"],
+                                   "source": match["ref"], "similarity": match["similarity"]})
+                    continue
+            result, transactions = parse_statement_file(path, store=store, pdf_hash=statement_hash,
+                                                        **parse_kwargs)
+            if duplicates is not None:
+                duplicates.add(statement_hash, signature, ref=path, bank=bank)
+        except Exception as e:
+            report.append({"path": path, "status": "failed", "error": str(e)})
+            continue
+        report.append({"path": path, "status": "ingested", "bank": result.get("bank"),
+                       "transactions": len(transactions)})
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Ingest bank statements into a SQLite store")
+    parser.add_argument("db", help="path to SQLite database")
+    parser.add_argument("pdfs", nargs="*", help="statement pdfs to ingest")
+    parser.add_argument("--force", action="store_true", help="re-ingest statements already stored")
+    parser.add_argument("--search", help="full-text query over descriptions", default=None)
+    parser.add_argument("--rollups", action="store_true", help="print monthly totals per account and type")
+    parser.add_argument("--dedupe", action="store_true",
+                        help="skip near-duplicates of stored statements (index kept in the same database)")
+    args = parser.parse_args()
+
+    duplicates = None
+    if args.dedupe:
+        from near_duplicates import DuplicateIndex
+        duplicates = DuplicateIndex(args.db)
+
+    with TransactionStore(args.db) as store:
+        for status in ingest_files(args.pdfs, store, skip_existing=not args.force, duplicates=duplicates):
+            print(json.dumps(status))
+        if args.search:
+            for tx in store.search(args.search):
+                print(json.dumps(tx))
+        if args.rollups:
+            for row in store.monthly_rollups(group_by=("month", "account", "type")):
+                print(json.dumps(row))
@@ -0,0 +1,90 @@
+import hashlib
+import re
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Dict, Optional
+
+# Date formats produced by the bank parsers
+# HDFC: 26/02/2023, ICICI/Axis/AMEX: 03-Sep-2025, SBI: 3 May 2018
+DATE_FORMATS = [
+    "%d/%m/%Y",
+    "%d-%b-%Y",
+    "%d %b %Y",
+    "%d/%b/%Y",
+    "%d-%m-%Y",
+    "%d/%m/%y",
+    "%d-%m-%y",
+    "%d %B %Y",
+]
+
+# Transaction type codes shared by all exporters and stores
+TYPE_DEBIT = 0
+TYPE_CREDIT = 1
+
+TYPE_CODES = {
+    "DEBIT": TYPE_DEBIT,
+    "DR": TYPE_DEBIT,
+    "CREDIT": TYPE_CREDIT,
+    "CR": TYPE_CREDIT,
+}
+
+
+@lru_cache(maxsize=4096)
+def normalize_date(date_str: str) -> Optional[date]:
+    """Convert a statement date string to a date, or None if unrecognised"""
+    if not date_str:
+        return None
+    s = re.sub(r"\s+", " ", str(date_str)).strip()
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(s, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def date_ordinal(date_str: str) -> Optional[int]:
+    """Convert a statement date string to a proleptic Gregorian ordinal"""
+    d = normalize_date(date_str)
+    return d.toordinal() if d else None
+
+
+def amount_to_minor(amount) -> Optional[int]:
+    """Convert an amount (float or numeric string) to integer minor units (paise/cents)"""
+    if amount is None or amount == "":
+        return None
+    try:
+        return int(round(float(str(amount).replace(",", "")) * 100))
+    except ValueError:
+        return None
+
+
+def type_code(txn_type: str) -> Optional[int]:
+    """Map the parser-specific Type value ('DR', 'Debit', 'CREDIT', ...) to a type code"""
+    if not txn_type:
+        return None
+    return TYPE_CODES.get(str(txn_type).strip().upper())
+
+
+def normalize_description(description: str) -> str:
+    """Upper-case and collapse whitespace so descriptions compare equal across statements"""
+    return re.sub(r"\s+", " ", str(description or "")).strip().upper()
+
+
+def account_key(result: Dict) -> str:
+    """Build a stable account identifier (e.g. "HDFC:3458") from a parse_statement_file result"""
+    bank = result.get("bank", result.get("Bank", "UNKNOWN"))
+    account = (result.get("Card Last 4")
+               or result.get("Account Number")
+               or "UNKNOWN")
+    account = str(account).replace("*", "")
+    return f"{bank}:{account}"
+
+
+def file_sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 hex digest of a file's contents"""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
@@ -0,0 +1,148 @@
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from result_transport import column_values
+from transaction_utils import date_ordinal
+
+
+class TransactionIndex:
+    """
+    Sorted indexes over a transactions list for server-side filtering and paging
+
+    Built once per parsed statement. Date and amount ranges are answered with binary
+    search, types from a posting list, and description substrings from a small cache
+    that narrows previous matches when a query is extended. The most selective filter
+    drives the scan and the others are checked per candidate, so a filter never walks
+    the full list unless it matches most of it.
+
+    An index may be shared between sessions (app.get_transaction_index); the text
+    cache is guarded by a lock, the other indexes are read-only after construction.
+    """
+
+    def __init__(self, transactions: Sequence[Dict], text_cache_size: int = 64):
+        self.transactions = transactions
+        n = len(transactions)
+
+        # Read column by column, so ColumnarTransactions are indexed without building dicts
+        self.ordinals = [date_ordinal(d) for d in column_values(transactions, "Date")]
+        self.amounts = [float(a or 0) for a in column_values(transactions, "Amount")]
+        self.types = [str(t) for t in column_values(transactions, "Type", "")]
+        self.descriptions = [str(d).lower() for d in column_values(transactions, "Description", "")]
+
+        by_date = sorted((o, i) for i, o in enumerate(self.ordinals) if o is not None)
+        self._date_keys = [o for o, _ in by_date]
+        self._date_rows = [i for _, i in by_date]
+
+        by_amount = sorted((a, i) for i, a in enumerate(self.amounts))
+        self._amount_keys = [a for a, _ in by_amount]
+        self._amount_rows = [i for _, i in by_amount]
+
+        self._type_rows = {}
+        for i, t in enumerate(self.types):
+            self._type_rows.setdefault(t, []).append(i)
+
+        self._all_rows = list(range(n))
+        self._text_cache = OrderedDict()
+        self._text_cache_size = text_cache_size
+        self._text_lock = threading.Lock()
+
+    @property
+    def type_values(self) -> List[str]:
+        return sorted(self._type_rows)
+
+    @property
+    def date_bounds(self) -> Optional[Tuple[int, int]]:
+        if not self._date_keys:
+            return None
+        return self._date_keys[0], self._date_keys[-1]
+
+    @property
+    def amount_bounds(self) -> Tuple[float, float]:
+        if not self._amount_keys:
+            return 0.0, 0.0
+        return self._amount_keys[0], self._amount_keys[-1]
+
+    def _text_rows(self, text: str) -> Tuple[List[int], set]:
+        """Rows whose description contains text, narrowing a cached shorter query if possible"""
+        with self._text_lock:
+            cached = self._text_cache.get(text)
+            if cached is not None:
+                self._text_cache.move_to_end(text)
+                return cached
+            base = self._all_rows
+            for query, (rows, _) in reversed(self._text_cache.items()):
+                if query in text and len(rows) < len(base):
+                    base = rows
+
+        # Scanned outside the lock; a query racing with another session is computed twice
+        descriptions = self.descriptions
+        rows = [i for i in base if text in descriptions[i]]
+        cached = (rows, set(rows))
+
+        with self._text_lock:
+            self._text_cache[text] = cached
+            while len(self._text_cache) > self._text_cache_size:
+                self._text_cache.popitem(last=False)
+        return cached
+
+    def filter(self, start: Optional[int] = None, end: Optional[int] = None,
+               types: Optional[Iterable[str]] = None, min_amount: Optional[float] = None,
+               max_amount: Optional[float] = None, text: Optional[str] = None) -> List[int]:
+        """
+        Return row numbers matching every given filter, in statement order
+
+        Args:
+            start, end: Inclusive date ordinal bounds
+            types: Allowed Type values
+            min_amount, max_amount: Inclusive amount bounds
+            text: Case-insensitive description substring
+        """
+        candidates = []   # (size, rows) for each active filter
+        checks = []
+
+        if start is not None or end is not None:
+            lo = bisect_left(self._date_keys, start) if start is not None else 0
+            hi = bisect_right(self._date_keys, end) if end is not None else len(self._date_keys)
+            candidates.append((hi - lo, lambda: self._date_rows[lo:hi]))
+            ordinals = self.ordinals
+            checks.append(lambda i: ordinals[i] is not None
+                          and (start is None or ordinals[i] >= start)
+                          and (end is None or ordinals[i] <= end))
+
+        if min_amount is not None or max_amount is not None:
+            lo_a = bisect_left(self._amount_keys, min_amount) if min_amount is not None else 0
+            hi_a = bisect_right(self._amount_keys, max_amount) if max_amount is not None else len(self._amount_keys)
+            candidates.append((hi_a - lo_a, lambda: self._amount_rows[lo_a:hi_a]))
+            amounts = self.amounts
+            checks.append(lambda i: (min_amount is None or amounts[i] >= min_amount)
+                          and (max_amount is None or amounts[i] <= max_amount))
+
+        if types is not None:
+            allowed = set(types)
+            type_rows = [i for t in allowed for i in self._type_rows.get(t, [])]
+            candidates.append((len(type_rows), lambda: type_rows))
+            row_types = self.types
+            checks.append(lambda i: row_types[i] in allowed)
+
+        if text:
+            text_rows, text_set = self._text_rows(text.lower())
+            candidates.append((len(text_rows), lambda: text_rows))
+            checks.append(text_set.__contains__)
+
+        if not candidates:
+            return self._all_rows
+
+        # Drive from the smallest candidate list and verify the remaining filters per row
+        driver = min(range(len(candidates)), key=lambda k: candidates[k][0])
+        rows = candidates[driver][1]()
+        others = [check for k, check in enumerate(checks) if k != driver]
+        if others:
+            rows = [i for i in rows if all(check(i) for check in others)]
+        return sorted(rows)
+
+    def page(self, rows: List[int], page: int, page_size: int) -> List[Dict]:
+        """Materialize one page (1-based) of the given rows"""
+        begin = max(page - 1, 0) * page_size
+        return [self.transactions[i] for i in rows[begin:begin + page_size]]